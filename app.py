@@ -1,21 +1,59 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import (FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect,
+                     UploadFile, File)
+from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, NamedTuple
+from collections import OrderedDict, deque
+from statistics import NormalDist
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
 import base64
+import functools
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import uuid
 import numpy as np
-from reedsolo import RSCodec, ReedSolomonError
+from reedsolo import ReedSolomonError
+from rs_engine import (NumpyRSCodec, TabledRSCodec, WideRSCodec, WIDE_PRIM, interleave_encode,
+                       interleave_decode, interleave_check, load_tables, is_primitive, TABLES_FILE)
+from shard_store import ShardStore
+from starlette.background import BackgroundTask
+import contextlib
+import contextvars
 import time
 from datetime import datetime
 import json
 
 # ===== تطبيق FastAPI =====
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """دورة حياة الخادم: تهيئة المرمزات قبل أول طلب وإيقاف المهام ومجمع العمال عند الإغلاق
+
+    مُنظِّف المهام يحذف النتائج المنتهية ويلغي المتروكة حتى دون طلبات جديدة.
+    المهام تُلغى قبل إيقاف المجمع لأن أجزاءها الجارية تنتظر عماله.
+    """
+    preload_profiles()
+    reaper = asyncio.ensure_future(job_manager.reap_periodically())
+    try:
+        yield
+    finally:
+        reaper.cancel()
+        await job_manager.shutdown()
+        codec_pool.shutdown()
+
 app = FastAPI(
     title="Reed-Solomon Professional API",
     description="API متقدم لنظام تصحيح أخطاء الإرسال باستخدام خوارزمية Reed-Solomon",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # ===== إعدادات CORS =====
@@ -27,6 +65,329 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ===== قياس الأداء الحي =====
+LIVE_WINDOW = int(os.environ.get("RS_LIVE_WINDOW", "2048"))
+BENCHMARK_RESULTS = os.environ.get(
+    "RS_BENCHMARK_RESULTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results.json")
+)
+
+class LatencyTracker:
+    """نافذة منزلقة لأزمنة الطلبات الحية لكل نقطة نهاية"""
+
+    def __init__(self, window: int = LIVE_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, elapsed_ms: float, payload_bytes: int = 0):
+        with self._lock:
+            samples = self._samples.get(path)
+            if samples is None:
+                samples = self._samples[path] = deque(maxlen=self.window)
+            samples.append((elapsed_ms, payload_bytes))
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {path: list(samples) for path, samples in self._samples.items()}
+            counts = dict(self._counts)
+        summary = {}
+        for path, samples in snapshot.items():
+            times = np.array([t for t, _ in samples])
+            total_bytes = sum(b for _, b in samples)
+            summary[path] = {
+                "requests_total": counts[path],
+                "window": len(samples),
+                "mean_ms": round(float(times.mean()), 3),
+                "p50_ms": round(float(np.percentile(times, 50)), 3),
+                "p90_ms": round(float(np.percentile(times, 90)), 3),
+                "p99_ms": round(float(np.percentile(times, 99)), 3),
+                "throughput_mbps": round(total_bytes / (times.sum() / 1000) / 1e6, 3) if times.sum() > 0 else 0.0
+            }
+        return summary
+
+live_latency = LatencyTracker()
+
+# ===== مقاييس Prometheus =====
+# حدود المدرج بالثواني، من 50 ميكروثانية حتى 10 ثوانٍ
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_string(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+class Counter:
+    """عداد تراكمي بعناوين"""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name, self.help, self.labelnames = name, help_text, labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple((name, labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_string(key)} {value}")
+        return lines
+
+class Histogram:
+    """مدرج تراكمي بحدود ثابتة مع المجموع والعدد"""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple((name, labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_label_string(key + (('le', repr(bound)),))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_label_string(key + (('le', '+Inf'),))} {count}")
+                lines.append(f"{self.name}_sum{_label_string(key)} {total}")
+                lines.append(f"{self.name}_count{_label_string(key)} {count}")
+        return lines
+
+class Gauge:
+    """قيمة تُقرأ من دالة عند كل عرض (kind=counter للعدادات التي يحتفظ بها كائن آخر)"""
+
+    def __init__(self, name: str, help_text: str, read, kind: str = "gauge"):
+        self.name, self.help, self.read, self.kind = name, help_text, read, kind
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {self.read()}"]
+
+request_duration = Histogram(
+    "rs_request_duration_seconds", "إجمالي زمن طلبات نقاط الترميز", ("endpoint",)
+)
+stage_duration = Histogram(
+    "rs_stage_duration_seconds",
+    "زمن كل مرحلة: parse و codec_lookup و queue_wait و encode/decode و serialize و other",
+    ("endpoint", "stage")
+)
+codec_operations = Counter(
+    "rs_codec_operations_total",
+    "عمليات الترميز وفك الترميز والتحقق حسب nsym والنتيجة (clean/corrected/corrupted/uncorrectable/error)",
+    ("operation", "nsym", "outcome")
+)
+
+decode_paths = Counter(
+    "rs_decode_path_total",
+    "فك الترميز الناجح حسب المسار (errors_only/erasures_only/errors_and_erasures)",
+    ("path",)
+)
+
+def _metric_families() -> list:
+    return [
+        request_duration,
+        stage_duration,
+        codec_operations,
+        decode_paths,
+        Gauge("rs_pool_queue_depth", "المهام المنتظرة خلف العمال المشغولين", lambda: codec_pool.queue_depth),
+        Gauge("rs_pool_in_flight", "المهام قيد التنفيذ أو الانتظار", lambda: codec_pool.in_flight),
+        Gauge("rs_pool_workers", "عدد عمال المجمع", lambda: codec_pool.workers),
+        Gauge("rs_pool_rejected_total", "الطلبات المرفوضة بخطأ 503", lambda: codec_pool.rejected, "counter"),
+        Gauge("rs_codec_cache_size", "عدد المرمزات في السجل المشترك", lambda: len(codec_registry._codecs)),
+        Gauge("rs_codec_cache_hits_total", "إصابات سجل المرمزات", lambda: codec_registry.hits, "counter"),
+        Gauge("rs_codec_cache_misses_total", "إخفاقات سجل المرمزات", lambda: codec_registry.misses, "counter"),
+        Gauge("rs_result_cache_hits_total", "إصابات ذاكرة النتائج", lambda: result_cache.hits, "counter"),
+        Gauge("rs_result_cache_misses_total", "إخفاقات ذاكرة النتائج", lambda: result_cache.misses, "counter"),
+        Gauge("rs_result_cache_bytes", "البايتات المشغولة في ذاكرة النتائج", lambda: result_cache.bytes),
+        Gauge("rs_result_cache_entries", "عدد مدخلات ذاكرة النتائج", lambda: len(result_cache._entries)),
+        Gauge("rs_jobs", "المهام المحفوظة (جارية ومنتظرة ومنتهية)", lambda: len(job_manager._jobs)),
+        Gauge("rs_jobs_submitted_total", "المهام المرسلة", lambda: job_manager.counts["submitted"], "counter"),
+        Gauge("rs_jobs_abandoned_total", "المهام الملغاة لتوقف العميل عن متابعتها",
+              lambda: job_manager.counts["abandoned"], "counter")
+    ]
+
+def render_metrics() -> str:
+    """نص المقاييس بصيغة Prometheus"""
+    lines = []
+    for family in _metric_families():
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+# أزمنة مراحل الطلب الحالي؛ يضبطها الوسيط وتملؤها stage() في الخيط الرئيسي والعمال
+_request_stages = contextvars.ContextVar("rs_request_stages", default=None)
+
+@contextlib.contextmanager
+def stage(name: str):
+    """قياس زمن مرحلة وإضافته إلى أزمنة الطلب الحالي إن وُجد"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+def _run_instrumented(fn, *args):
+    """تشغيل مهمة داخل العامل مع جمع أزمنة مراحلها (قابلة للنقل بين العمليات)
+
+    عند الفشل تُرفق الأزمنة بالاستثناء حتى لا تضيع مراحل الطلبات غير القابلة للتصحيح.
+    """
+    stages = {}
+    token = _request_stages.set(stages)
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        e.rs_stages = (stages, time.perf_counter() - start)
+        raise
+    finally:
+        _request_stages.reset(token)
+    return result, stages, time.perf_counter() - start
+
+def _merge_worker_stages(worker_stages: dict, run_time: float, submitted: float):
+    """إضافة أزمنة العامل وزمن الانتظار في الطابور إلى أزمنة الطلب الحالي"""
+    stages = _request_stages.get()
+    if stages is None:
+        return
+    stages["queue_wait"] = stages.get("queue_wait", 0.0) + max(
+        0.0, time.perf_counter() - submitted - run_time
+    )
+    for name, seconds in worker_stages.items():
+        stages[name] = stages.get(name, 0.0) + seconds
+
+def record_outcome(operation: str, nsym: int, outcome: str, path: Optional[str] = None):
+    codec_operations.inc(operation=operation, nsym=nsym, outcome=outcome)
+    if path:
+        decode_paths.inc(path=path)
+
+# ===== ملف الاستجابة المختصر =====
+# orjson اختياري: أسرع بعدة مرات من json القياسي، والبديل يعطي JSON مكافئاً
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """استجابة JSON تُسلسل بـ orjson عند توفره"""
+
+    def render(self, content) -> bytes:
+        return _dumps(content)
+
+def wants_lean(http_request: Request) -> bool:
+    """ملف مختصر عبر ?profile=lean أو ترويسة X-RS-Profile: lean أو Prefer: return=minimal"""
+    profile = http_request.query_params.get("profile") or http_request.headers.get("x-rs-profile")
+    if profile:
+        return profile.lower() == "lean"
+    return "return=minimal" in http_request.headers.get("prefer", "").lower()
+
+# أجزاء ثابتة مبنية مسبقاً: base64 لا يحتاج تهريباً في JSON فيُلصق كما هو دون مُسلسل
+_LEAN_ENCODE = b'{"status":"success","encoded_base64":"%s","length_bytes":%d,"nsym":%d}'
+_LEAN_DECODE = b'{"status":"success","decoded_base64":"%s","length_bytes":%d,"errors_corrected":%d,"decode_path":"%s"}'
+
+@functools.lru_cache(maxsize=256)
+def _lean_uncorrectable(nsym: int) -> bytes:
+    return _dumps({"status": "uncorrectable", "code": "RS_UNCORRECTABLE", "max_correctable": nsym // 2})
+
+def _lean(body) -> Response:
+    """استجابة مختصرة: bytes جاهزة تُرسل كما هي، والقواميس تُسلسل مباشرة"""
+    with stage("serialize"):
+        if not isinstance(body, bytes):
+            body = _dumps(body)
+        return Response(content=body, media_type="application/json")
+
+def _json(payload: dict) -> JSONResponse:
+    """تسلسل الاستجابة داخل مرحلة serialize حتى يظهر زمن JSON في المقاييس"""
+    with stage("serialize"):
+        return FastJSONResponse(payload)
+
+@app.middleware("http")
+async def track_latency(request, call_next):
+    """تسجيل زمن كل طلب POST على نقاط /api/ في النافذة الحية ومقاييس المراحل"""
+    start = time.perf_counter()
+    stages = {}
+    cache = {}
+    token = _request_stages.set(stages)
+    cache_token = _request_cache.set(cache)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stages.reset(token)
+        _request_cache.reset(cache_token)
+    if "status" in cache:
+        response.headers["X-RS-Cache"] = cache["status"]
+    if request.method == "POST" and request.url.path.startswith("/api/"):
+        elapsed = time.perf_counter() - start
+        live_latency.record(
+            request.url.path,
+            elapsed * 1000,
+            int(request.headers.get("content-length") or 0)
+        )
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None)
+        if endpoint:
+            request_duration.observe(elapsed, endpoint=endpoint)
+            for name, seconds in stages.items():
+                stage_duration.observe(seconds, endpoint=endpoint, stage=name)
+            # الباقي: قراءة الجسم والتحقق من النموذج والتوجيه ومنطق نقطة النهاية
+            stage_duration.observe(max(0.0, elapsed - sum(stages.values())),
+                                   endpoint=endpoint, stage="other")
+    return response
+
+_benchmark_cache = {"mtime": None, "data": None}
+
+def load_benchmark_results() -> Optional[dict]:
+    """قراءة آخر نتائج benchmark.py (مع إعادة القراءة فقط عند تغير الملف)"""
+    try:
+        mtime = os.path.getmtime(BENCHMARK_RESULTS)
+    except OSError:
+        return None
+    if _benchmark_cache["mtime"] != mtime:
+        with open(BENCHMARK_RESULTS, encoding="utf-8") as f:
+            _benchmark_cache["data"] = json.load(f)
+        _benchmark_cache["mtime"] = mtime
+    return _benchmark_cache["data"]
+
+def summarize_benchmarks(document: dict) -> dict:
+    """أفضل إنتاجية وزمن p50 لكل (محرك، عملية) عبر الأحجام"""
+    summary = {}
+    for row in document.get("results", []):
+        entry = summary.setdefault(f"{row['backend']}/{row['operation']}", {
+            "best_throughput_mbps": 0.0,
+            "p50_ms_by_size": {}
+        })
+        entry["best_throughput_mbps"] = max(entry["best_throughput_mbps"], row["throughput_mbps"])
+        # أول صف لكل حجم هو الأنظف (حِمل أخطاء 0) لأن الأحمال مرتبة تصاعدياً
+        entry["p50_ms_by_size"].setdefault(str(row["size"]), row["p50_ms"])
+    return summary
+
 # ===== بيانات المطور =====
 DEVELOPER_INFO = {
     "name": "المهندس حسين فاهم الخزعلي",
@@ -42,26 +403,991 @@ DEVELOPER_INFO = {
     ]
 }
 
+# ===== سجل المرمزات المشترك =====
+CODEC_CACHE_SIZE = int(os.environ.get("RS_CODEC_CACHE_SIZE", "64"))
+
+# جداول GF(256) وكثيرات الحدود المولدة من ملف مربوط بالذاكرة (يُبنى عند أول تشغيل في
+# ~/.cache/rs-engine أو المسار في RS_GF_TABLES)؛ RS_GF_TABLES فارغ يعطّلها فتُحسب الجداول
+# في الذاكرة كما في السابق، وكذلك إن تعذرت كتابة الملف
+GF_TABLES_PATH = os.environ.get("RS_GF_TABLES", TABLES_FILE)
+gf_tables = load_tables(GF_TABLES_PATH) if GF_TABLES_PATH else None
+
+# المحركات المتاحة: reedsolo (المرجعي) و numpy (المتجه، مطابق بايتاً ببايت)
+CODEC_BACKENDS = {
+    "reedsolo": TabledRSCodec,
+    "numpy": NumpyRSCodec
+}
+DEFAULT_BACKEND = os.environ.get("RS_BACKEND", "reedsolo")
+# الدفعات تُحسب كعملية متجهة واحدة، لذا محركها الافتراضي numpy
+BATCH_BACKEND = os.environ.get("RS_BATCH_BACKEND", "numpy")
+MAX_BATCH_ITEMS = int(os.environ.get("RS_MAX_BATCH_ITEMS", "10000"))
+
+class CodecRegistry:
+    """سجل مشترك لكائنات المرمزات على مستوى العملية مع إخلاء LRU
+
+    يبني كل مجموعة معاملات (nsym, nsize, fcr, prim, generator, c_exp, backend) مرة واحدة فقط
+    ويعيد استخدامها بين الطلبات بدل إعادة بناء جداول GF(256) وكثير الحدود المولد.
+    """
+
+    def __init__(self, maxsize: int = CODEC_CACHE_SIZE):
+        self.maxsize = max(1, maxsize)
+        self._codecs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, nsym: int, nsize: int = 255, fcr: int = 0, prim: int = 0x11d,
+            generator: int = 2, c_exp: int = 8, backend: Optional[str] = None):
+        """إرجاع المرمز المطابق للمعاملات مع بنائه عند أول طلب"""
+        backend = backend or DEFAULT_BACKEND
+        if backend not in CODEC_BACKENDS:
+            raise ValueError(f"محرك غير معروف: {backend}")
+        key = (nsym, nsize, fcr, prim, generator, c_exp, backend)
+        with self._lock:
+            codec = self._codecs.get(key)
+            if codec is not None:
+                self._codecs.move_to_end(key)
+                self.hits += 1
+                return codec
+            self.misses += 1
+
+        # البناء خارج القفل حتى لا تنتظر الطلبات الأخرى. الرموز الواسعة لها تنفيذ
+        # متجه واحد بواجهة بايتات (reedsolo يعمل فيها على قوائم أعداد لا بايتات)
+        factory = WideRSCodec if c_exp > 8 else CODEC_BACKENDS[backend]
+        codec = factory(nsym, nsize=nsize, fcr=fcr, prim=prim, generator=generator, c_exp=c_exp)
+
+        with self._lock:
+            existing = self._codecs.get(key)
+            if existing is not None:
+                self._codecs.move_to_end(key)
+                return existing
+            self._codecs[key] = codec
+            while len(self._codecs) > self.maxsize:
+                self._codecs.popitem(last=False)
+                self.evictions += 1
+        return codec
+
+    def clear(self):
+        """تفريغ السجل وتصفير العدادات"""
+        with self._lock:
+            self._codecs.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """إحصائيات السجل: الإصابات والإخفاقات ونسبة الإصابة"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._codecs),
+                "max_size": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "keys": [
+                    {"nsym": k[0], "nsize": k[1], "fcr": k[2], "prim": k[3],
+                     "generator": k[4], "c_exp": k[5], "backend": k[6]}
+                    for k in self._codecs
+                ]
+            }
+
+codec_registry = CodecRegistry()
+
+class CodeSpec(NamedTuple):
+    """معاملات الكود الكاملة: RS(nsize, nsize - nsym) فوق GF(2^c_exp)
+
+    nsize < 2^c_exp - 1 كود مقصّر (مثل RS(204,188)): المحركان يعاملان الرموز
+    الناقصة كأصفار بادئة ضمنية، فلا يُحشى أي مخزن إلى الطول الكامل.
+    """
+    nsym: int = 10
+    nsize: int = 255
+    fcr: int = 0
+    prim: int = 0x11d
+    generator: int = 2
+    c_exp: int = 8
+
+def get_codec(code, **params):
+    """اختصار للحصول على مرمز من السجل المشترك؛ code إما nsym أو CodeSpec"""
+    if isinstance(code, CodeSpec):
+        return codec_registry.get(*code, **params)
+    return codec_registry.get(code, **params)
+
+# ===== ملفات تعريف الأكواد المسماة =====
+# معاملات أنظمة خارجية شائعة حتى تُرمَّز الرسائل بصيغتها مباشرة دون تحويل عند الحدود
+CODE_PROFILES = {
+    "dvb": {
+        "description": "DVB-S/DVB-T: RS(204,188) مقصّر من RS(255,239)",
+        "code": CodeSpec(nsym=16, nsize=204)
+    },
+    "ccsds": {
+        "description": "CCSDS RS(255,223): prim=0x187، fcr=112، الجذور قوى α^11 (التمثيل التقليدي لا الثنائي المزدوج)",
+        "code": CodeSpec(nsym=32, nsize=255, fcr=112, prim=0x187, generator=0xad)
+    },
+    "qr-v1-m": {
+        "description": "رمز QR الإصدار 1 بمستوى التصحيح M: RS(26,16)",
+        "code": CodeSpec(nsym=10, nsize=26)
+    },
+    "cd-c1": {
+        "description": "CIRC في الأقراص المدمجة، الطبقة C1: RS(32,28)",
+        "code": CodeSpec(nsym=4, nsize=32)
+    },
+    "cd-c2": {
+        "description": "CIRC في الأقراص المدمجة، الطبقة C2: RS(28,24)",
+        "code": CodeSpec(nsym=4, nsize=28)
+    },
+    "wide": {
+        "description": "GF(2^16) RS(65535,65471): رمز من بايتين وكلمة حوالي 128 كيلوبايت للرسائل الكبيرة",
+        "code": CodeSpec(nsym=64, nsize=65535, prim=WIDE_PRIM, c_exp=16)
+    }
+}
+
+# الحقول المدعومة: c_exp → كثير الحدود الأولي الافتراضي (بايت لكل رمز أو بايتان)
+FIELD_PRIMS = {8: 0x11d, 16: WIDE_PRIM}
+
+def validate_code(code: CodeSpec):
+    """رفض المعاملات التي لا تعرّف كوداً صالحاً بخطأ ValueError واضح"""
+    if code.c_exp not in FIELD_PRIMS:
+        raise ValueError(f"c_exp يجب أن يكون أحد: {', '.join(map(str, FIELD_PRIMS))}")
+    charac = (1 << code.c_exp) - 1
+    if not 0 < code.nsize <= charac:
+        raise ValueError(f"nsize يجب أن يكون بين 1 و {charac}")
+    if not 0 <= code.nsym < code.nsize:
+        raise ValueError("يجب أن يكون nsym أصغر من nsize")
+    if not 0 <= code.fcr < charac:
+        raise ValueError(f"fcr يجب أن يكون بين 0 و {charac - 1}")
+    if not is_primitive(code.prim, code.generator, code.c_exp):
+        raise ValueError(f"generator={code.generator} ليس عنصراً أولياً في الحقل prim={hex(code.prim)}")
+
+def resolve_code(profile: Optional[str] = None, nsym: Optional[int] = None, **overrides) -> CodeSpec:
+    """دمج ملف التعريف (إن وُجد) مع المعاملات الصريحة؛ القيم None تُتجاهل"""
+    code = CodeSpec()
+    if profile:
+        if profile not in CODE_PROFILES:
+            raise ValueError(f"ملف تعريف غير معروف: {profile} (المتاح: {', '.join(CODE_PROFILES)})")
+        code = CODE_PROFILES[profile]["code"]
+    if nsym is not None:
+        overrides["nsym"] = nsym
+    c_exp = overrides.get("c_exp")
+    if c_exp in FIELD_PRIMS and c_exp != code.c_exp:
+        # تغيير الحقل يغيّر الافتراضيات: الطول الكامل للكلمة وكثير الحدود الأولي للحقل الجديد
+        code = code._replace(nsize=(1 << c_exp) - 1, prim=FIELD_PRIMS[c_exp])
+    code = code._replace(**{name: value for name, value in overrides.items() if value is not None})
+    validate_code(code)
+    return code
+
+def describe_code(code: CodeSpec, profile: Optional[str] = None) -> dict:
+    """وصف الكود في الاستجابات"""
+    return {
+        "profile": profile,
+        **code._asdict(),
+        "k": code.nsize - code.nsym,
+        "symbol_bytes": code.c_exp // 8,
+        "shortened": code.nsize < (1 << code.c_exp) - 1
+    }
+
+# ===== مجمع العمال =====
+CODEC_EXECUTOR = os.environ.get("RS_EXECUTOR", "thread")  # thread | process
+CODEC_WORKERS = int(os.environ.get("RS_WORKERS", str(os.cpu_count() or 1)))
+CODEC_MAX_PENDING = int(os.environ.get("RS_MAX_PENDING", "64"))
+
+# TabledRSCodec يحمي جداول reedsolo العامة بقفل لكل كلمة رمزية، ومحرك numpy لا
+# يملك حالة عامة، فلا قفل على مستوى الرسالة هنا
+class CodecPool:
+    """مجمع عمال لتنفيذ الترميز وفك الترميز خارج حلقة الأحداث
+
+    الطابور محدود: عند امتلاء العمال والطابور يُرفض الطلب فوراً بخطأ 503
+    بدل تراكمه ورفع زمن الاستجابة لبقية الطلبات.
+    """
+
+    def __init__(self, kind: str = CODEC_EXECUTOR, workers: int = CODEC_WORKERS,
+                 max_pending: int = CODEC_MAX_PENDING):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"نوع مجمع غير معروف: {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self._executor = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="rs-codec"
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """عدد المهام المنتظرة خلف العمال المشغولين"""
+        return max(0, self.in_flight - self.workers)
+
+    def check_capacity(self):
+        """رفض الطلب بخطأ 503 إذا امتلأ العمال والطابور"""
+        if self.in_flight >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "status": "error",
+                    "message": "الخادم مشغول، حاول لاحقاً",
+                    "developer": DEVELOPER_INFO["name"]
+                },
+                headers={"Retry-After": "1"}
+            )
+
+    async def run(self, fn, *args):
+        """تنفيذ دالة متزامنة في المجمع مع تطبيق الضغط العكسي"""
+        self.check_capacity()
+        return await self.execute(fn, *args)
+
+    async def execute(self, fn, *args):
+        """تنفيذ دون فحص السعة، للتدفقات التي قُبلت مسبقاً ولا يمكن رفضها بعد إرسال الترويسات"""
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, worker_stages, run_time = await loop.run_in_executor(
+                self.executor, functools.partial(_run_instrumented, fn, *args)
+            )
+        except Exception as e:
+            if hasattr(e, "rs_stages"):
+                _merge_worker_stages(*e.rs_stages, submitted)
+            raise
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+        _merge_worker_stages(worker_stages, run_time, submitted)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+codec_pool = CodecPool()
+
+# ===== ذاكرة النتائج المؤقتة =====
+# حد الذاكرة بالبايتات ومدة صلاحية كل مدخل بالثواني. معطلة افتراضياً (0):
+# الطلبات المكررة نادرة في معظم النشر، والذاكرة تحجز RAM في كل عملية وتبصم كل
+# مدخل بـ SHA-256؛ تُفعّل بضبط RS_RESULT_CACHE_BYTES (مثلاً 67108864 لـ 64MB)
+RESULT_CACHE_BYTES = int(os.environ.get("RS_RESULT_CACHE_BYTES", "0"))
+RESULT_CACHE_TTL = float(os.environ.get("RS_RESULT_CACHE_TTL", "300"))
+# تقدير ثابت لحجم المدخل بجانب البايتات المخزنة (المفتاح والبنية والقاموس)
+_CACHE_ENTRY_OVERHEAD = 256
+
+_request_cache = contextvars.ContextVar("rs_request_cache", default=None)
+
+class _Uncorrectable:
+    """نتيجة فشل مخزنة؛ يُطلق منها استثناء جديد عند كل إصابة"""
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+class ResultCache:
+    """ذاكرة نتائج بعنوان المحتوى، محدودة بالبايتات مع إخلاء LRU وانتهاء صلاحية TTL
+
+    المفتاح بصمة SHA-256 للمدخلات الثنائية مع كل معامل يؤثر في النتيجة، لذا
+    تُخدم الطلبات المكررة (إعادة إرسال نفس الكلمات التالفة أو محاكاة ببذرة ثابتة)
+    ببصمة واحدة وبحث واحد. نتائج الفشل غير القابل للتصحيح تُخزن أيضاً.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES, ttl: float = RESULT_CACHE_TTL):
+        self.max_bytes = max(0, max_bytes)
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires, size, value)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(operation: str, payload: bytes, *params) -> tuple:
+        return (operation, hashlib.sha256(payload).digest(), params)
+
+    def get(self, key):
+        """القيمة المخزنة أو None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, size: int):
+        size += _CACHE_ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+result_cache = ResultCache()
+
+def _cache_bypassed(http_request: Request) -> bool:
+    """Cache-Control: no-cache أو no-store في الطلب يتجاوز الذاكرة"""
+    directives = http_request.headers.get("cache-control", "").lower()
+    return "no-cache" in directives or "no-store" in directives
+
+async def cached_run(key, size_of, fn, *args):
+    """تنفيذ مهمة في المجمع مع الذاكرة المؤقتة؛ key=None يعني التنفيذ دون ذاكرة
+
+    size_of(result) يقدّر حجم النتيجة بالبايتات. حالة الذاكرة (hit/miss) تُعاد
+    في ترويسة X-RS-Cache.
+    """
+    holder = _request_cache.get()
+    if key is None or not result_cache.enabled:
+        return await codec_pool.run(fn, *args)
+    with stage("cache"):
+        cached = result_cache.get(key)
+    if holder is not None:
+        holder["status"] = "miss" if cached is None else "hit"
+    if isinstance(cached, _Uncorrectable):
+        raise ReedSolomonError(cached.message)
+    if cached is not None:
+        return cached
+    try:
+        result = await codec_pool.run(fn, *args)
+    except ReedSolomonError as e:
+        result_cache.put(key, _Uncorrectable(str(e)), len(str(e)))
+        raise
+    result_cache.put(key, result, size_of(result))
+    return result
+
+def _decoded_size(result) -> int:
+    return len(result[0])
+
+def _simulation_size(result) -> int:
+    # القاموس صغير: عدادات وأول 20 موضعاً و10 تفاصيل على الأكثر
+    return 64 * (8 + len(result["error_positions"]) + 4 * len(result["error_details"]))
+
+def preload_profiles():
+    """بناء مرمزات ملفات التعريف المسماة مسبقاً في السجل المشترك (عند بدء الخادم)"""
+    for profile in CODE_PROFILES.values():
+        for backend in {DEFAULT_BACKEND, BATCH_BACKEND}:
+            get_codec(profile["code"], backend=backend)
+
 # ===== نماذج البيانات =====
-class EncodeRequest(BaseModel):
+class CodeParams(BaseModel):
+    """معاملات الكود الاختيارية: ملف تعريف مسمى ثم تجاوزات صريحة فوقه
+
+    nsym الصريح يتقدم على nsym ملف التعريف؛ إن لم يُرسل يُؤخذ من ملف التعريف.
+    """
+    profile: Optional[str] = None
+    nsize: Optional[int] = None
+    fcr: Optional[int] = None
+    prim: Optional[int] = None
+    generator: Optional[int] = None
+    c_exp: Optional[int] = None
+
+    def code(self, item: Optional[BaseModel] = None) -> CodeSpec:
+        """الكود الناتج للطلب، أو لعنصر دفعة يحمل nsym خاصاً به"""
+        item = item or self
+        explicit = "nsym" in item.model_fields_set or not self.profile
+        return self.code_with_nsym(item.nsym if explicit else None)
+
+    def code_with_nsym(self, nsym: Optional[int]) -> CodeSpec:
+        return resolve_code(self.profile, nsym, nsize=self.nsize, fcr=self.fcr, prim=self.prim,
+                            generator=self.generator, c_exp=self.c_exp)
+
+class EncodeRequest(CodeParams):
     """نموذج طلب الترميز"""
     data: str
     nsym: int = 10
     metadata: Optional[dict] = None
+    backend: Optional[str] = None
+    interleave: int = Field(1, ge=1)
 
-class SimulateRequest(BaseModel):
+class SimulateRequest(CodeParams):
     """نموذج طلب المحاكاة"""
     data: str
     nsym: int = 10
     error_rate: float = 0.15
     error_type: str = "random"
     channel_type: Optional[str] = "wireless"
+    backend: Optional[str] = None
+    seed: Optional[int] = None
+    interleave: int = Field(1, ge=1)
 
-class DecodeRequest(BaseModel):
+class DecodeRequest(CodeParams):
     """نموذج طلب فك الترميز"""
     encoded_data: str
     nsym: int = 10
     erasures: Optional[List[int]] = None
+    backend: Optional[str] = None
+    interleave: int = Field(1, ge=1)
+
+class VerifyRequest(CodeParams):
+    """نموذج طلب التحقق السريع (المتلازمات فقط)"""
+    encoded_data: str
+    nsym: int = 10
+    interleave: int = Field(1, ge=1)
+
+class SweepRequest(CodeParams):
+    """نموذج طلب مسح مونت كارلو على شبكة من المعاملات"""
+    data: str
+    nsym_values: List[int] = [10]
+    error_rates: List[float] = [0.01, 0.02, 0.05]
+    error_types: List[str] = ["random"]
+    trials: int = 1000
+    seed: Optional[int] = None
+    confidence: float = 0.95
+    backend: Optional[str] = None
+
+class BatchEncodeItem(BaseModel):
+    """عنصر واحد في دفعة الترميز"""
+    data: str
+    nsym: int = 10
+
+class BatchEncodeRequest(CodeParams):
+    """نموذج طلب ترميز دفعة"""
+    items: List[BatchEncodeItem]
+    backend: Optional[str] = None
+
+class BatchDecodeItem(BaseModel):
+    """عنصر واحد في دفعة فك الترميز"""
+    encoded_data: str
+    nsym: int = 10
+    erasures: Optional[List[int]] = None
+
+class BatchDecodeRequest(CodeParams):
+    """نموذج طلب فك ترميز دفعة"""
+    items: List[BatchDecodeItem]
+    backend: Optional[str] = None
+
+# ===== مهام الترميز (تُنفذ داخل مجمع العمال) =====
+def _encode_job(data_bytes: bytes, code, backend: Optional[str] = None,
+                interleave: int = 1) -> bytes:
+    """ترميز متزامن يُستدعى من مجمع العمال (مع تشابك كتلي إن كان interleave > 1)
+
+    code في كل المهام إما nsym (بقية المعاملات افتراضية) أو CodeSpec.
+    """
+    _check_depth(interleave)
+    with stage("codec_lookup"):
+        rsc = get_codec(code, backend=backend)
+    with stage("encode"):
+        if interleave > 1:
+            return interleave_encode(rsc, data_bytes, interleave)
+        return bytes(rsc.encode(data_bytes))
+
+def _decode_job(encoded_bytes: bytes, code, erasures: Optional[List[int]] = None,
+                backend: Optional[str] = None, interleave: int = 1):
+    """فك ترميز متزامن يُرجع (البيانات، عدد الأخطاء المصححة، مسار فك الترميز)"""
+    _check_depth(interleave)
+    with stage("codec_lookup"):
+        rsc = get_codec(code, backend=backend)
+    if interleave > 1:
+        return _interleave_decode_job(rsc, encoded_bytes, interleave, erasures)
+    result = _decode_group(rsc, [(encoded_bytes, erasures)])[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def _verify_job(encoded_bytes: bytes, code, interleave: int = 1) -> np.ndarray:
+    """فحص المتلازمات وحده: مصفوفة منطقية بسلامة كل كلمة رمزية"""
+    with stage("codec_lookup"):
+        checker = get_codec(code, backend="numpy")
+    with stage("verify"):
+        if interleave > 1:
+            return interleave_check(checker, encoded_bytes, interleave)
+        return checker.check_batch([encoded_bytes])[0]
+
+def _check_depth(interleave: int):
+    if interleave < 1:
+        raise ValueError("عمق التشابك interleave يجب أن يكون 1 على الأقل")
+
+# أقصى عمق تشابك يُجرب عند البحث عن العمق الصحيح لتدفق غير قابل للتصحيح
+INTERLEAVE_PROBE_DEPTH = int(os.environ.get("RS_INTERLEAVE_PROBE_DEPTH", "16"))
+
+def _interleave_hint(encoded_bytes: bytes, code, interleave: int = 1) -> Optional[int]:
+    """عمق تشابك آخر يطابق تدفقاً فشل فك ترميزه، أو None
+
+    عمق خاطئ يخلط بايتات الكلمات فلا تسلم أي كلمة، بينما التلف الحقيقي يترك
+    عادة كلمات سليمة. لذا لا يُبحث إلا إن لم تسلم أي كلمة بالعمق المطلوب، ويُعاد
+    أول عمق تسلم به كلمة واحدة على الأقل (احتمال ذلك صدفةً 2^-8nsym لكل كلمة).
+    """
+    def has_clean(depth: int) -> bool:
+        try:
+            return bool(_verify_job(encoded_bytes, code, depth).any())
+        except ValueError:
+            # الطول لا يطابق هذا العمق، أو الكود لا يدعم التشابك
+            return False
+
+    if not encoded_bytes or has_clean(interleave):
+        return None
+    for depth in range(1, INTERLEAVE_PROBE_DEPTH + 1):
+        if depth != interleave and has_clean(depth):
+            return depth
+    return None
+
+def _interleave_mismatch(interleave: int, hint: int) -> str:
+    return f"عمق التشابك {interleave} لا يطابق التدفق؛ يبدو مرمزاً بـ interleave={hint}"
+
+def _interleave_decode_job(rsc, encoded_bytes: bytes, depth: int, erasures: Optional[List[int]] = None):
+    """فك ترميز مشابك بنفس ترتيب المسارات: فحص المتلازمات، ثم المحو فقط، ثم المسار الكامل"""
+    if not erasures:
+        checker = _syndrome_checker(rsc)
+        with stage("verify"):
+            clean = interleave_check(checker, encoded_bytes, depth).all()
+        if clean:
+            with stage("decode"):
+                return (*interleave_decode(checker, encoded_bytes, depth), "syndrome_clean")
+    with stage("decode"):
+        if not erasures:
+            return (*interleave_decode(rsc, encoded_bytes, depth), "errors_only")
+        try:
+            return (*interleave_decode(rsc, encoded_bytes, depth, erasures, only_erasures=True),
+                    "erasures_only")
+        except ReedSolomonError:
+            return (*interleave_decode(rsc, encoded_bytes, depth, erasures), "errors_and_erasures")
+
+def _group_by_code(codes: list) -> dict:
+    """تجميع فهارس العناصر حسب الكود حتى يُشارك كل كود مرمزاً واحداً"""
+    groups = {}
+    for index, code in enumerate(codes):
+        groups.setdefault(code, []).append(index)
+    return groups
+
+def _encode_batch_job(messages: List[bytes], codes: list, backend: Optional[str] = None) -> list:
+    """ترميز دفعة؛ كل مجموعة بنفس الكود تُرمَّز بعملية متجهة واحدة إن أمكن
+
+    تُرجع لكل عنصر إما البايتات المرمزة أو رسالة الخطأ.
+    """
+    results = [None] * len(messages)
+    for code, indices in _group_by_code(codes).items():
+        try:
+            with stage("codec_lookup"):
+                rsc = get_codec(code, backend=backend)
+        except ValueError as e:
+            for i in indices:
+                results[i] = str(e)
+            continue
+        group = [messages[i] for i in indices]
+        with stage("encode"):
+            if hasattr(rsc, "encode_batch"):
+                encoded = rsc.encode_batch(group)
+            else:
+                encoded = [rsc.encode(m) for m in group]
+        for i, enc in zip(indices, encoded):
+            results[i] = bytes(enc)
+    return results
+
+# مسارات فك الترميز: syndrome_clean (كل المتلازمات صفرية، لا تصحيح)، errors_only
+# (Berlekamp-Massey + Chien)، erasures_only (Forney مباشرة على مواضع المحو المعروفة)،
+# errors_and_erasures (المسار الكامل بعد فشل المحو فقط)
+DECODE_PATHS = ("syndrome_clean", "errors_only", "erasures_only", "errors_and_erasures")
+
+def _syndrome_checker(rsc):
+    """مرمز numpy بمعاملات rsc نفسها لفحص المتلازمات؛ الفحص لا يعتمد على المحرك"""
+    if hasattr(rsc, "check_batch"):
+        return rsc
+    return get_codec(CodeSpec(rsc.nsym, rsc.nsize, rsc.fcr, rsc.prim, rsc.generator, rsc.c_exp),
+                     backend="numpy")
+
+def _decode_dirty_chunks(rsc, data: bytes, clean: np.ndarray):
+    """فك ترميز الكلمات التالفة فقط بالمرمز المرجعي ونسخ بيانات السليمة كما هي"""
+    n, nsym = rsc.nsize, rsc.nsym
+    out = bytearray()
+    errata = 0
+    for c, ok in enumerate(clean.tolist()):
+        chunk = data[c * n:(c + 1) * n]
+        if ok:
+            out += chunk[:-nsym]
+        else:
+            dec, _, errata_pos = rsc.decode(chunk)
+            out += dec
+            errata += len(errata_pos)
+    return bytes(out), errata
+
+def _decode_group(rsc, group: list) -> list:
+    """فك ترميز مجموعة (البايتات، المحو) بمرمز واحد
+
+    العناصر دون محو تمر أولاً بفحص متلازمات متجه واحد: السليمة تُعاد فوراً دون
+    تصحيح، ولا يُشغَّل المصحح إلا على الكلمات التالفة. العناصر ذات مواضع المحو
+    تُفك بمسار المحو فقط (دون تحديد مواقع الأخطاء) كدفعة واحدة، وما يفشل منها
+    يُعاد بالمسار الكامل. النتيجة لكل عنصر (البيانات، الأخطاء، المسار) أو استثناء.
+    """
+    results = [None] * len(group)
+    hinted = [i for i, (_, erasures) in enumerate(group) if erasures]
+    plain = [i for i, (_, erasures) in enumerate(group) if not erasures]
+
+    dirty = []
+    if plain:
+        checker = _syndrome_checker(rsc)
+        with stage("verify"):
+            masks = checker.check_batch([group[i][0] for i in plain])
+            for i, clean in zip(plain, masks):
+                if clean.all():
+                    results[i] = (bytes(checker.strip_parity(group[i][0])), 0, "syndrome_clean")
+                else:
+                    dirty.append((i, clean))
+
+    with stage("decode"):
+        if dirty and not hasattr(rsc, "decode_batch"):
+            # المرمز المرجعي: تصحيح الكلمات التالفة وحدها بدل إعادة فحص الرسالة كاملة
+            for i, clean in dirty:
+                try:
+                    results[i] = (*_decode_dirty_chunks(rsc, group[i][0], clean), "errors_only")
+                except (ReedSolomonError, ValueError, IndexError) as e:
+                    results[i] = e
+            dirty = []
+
+        for indices, only_erasures, path in (([i for i, _ in dirty], False, "errors_only"),
+                                             (hinted, True, "erasures_only")):
+            if not indices:
+                continue
+            items = [group[i] for i in indices]
+            if hasattr(rsc, "decode_batch"):
+                decoded = rsc.decode_batch(items, only_erasures=only_erasures)
+            else:
+                decoded = []
+                for data, erasures in items:
+                    try:
+                        decoded.append(rsc.decode(data, erase_pos=erasures or None, only_erasures=only_erasures))
+                    except (ReedSolomonError, ValueError, IndexError) as e:
+                        decoded.append(e)
+            for i, res in zip(indices, decoded):
+                results[i] = res if isinstance(res, Exception) else (bytes(res[0]), len(res[2]), path)
+
+        # المحو فقط لا يكفي إن وُجدت أخطاء مجهولة إضافية: إعادة المحاولة بالمسار الكامل
+        for i in hinted:
+            if isinstance(results[i], ReedSolomonError):
+                data, erasures = group[i]
+                try:
+                    res = rsc.decode(data, erase_pos=erasures)
+                    results[i] = (bytes(res[0]), len(res[2]), "errors_and_erasures")
+                except (ReedSolomonError, ValueError, IndexError) as e:
+                    results[i] = e
+    return results
+
+def _decode_batch_job(items: list, codes: list, backend: Optional[str] = None) -> list:
+    """فك ترميز دفعة من (البايتات، المحو)؛ النتيجة لكل عنصر (البيانات، الأخطاء، المسار) أو استثناء"""
+    results = [None] * len(items)
+    for code, indices in _group_by_code(codes).items():
+        try:
+            with stage("codec_lookup"):
+                rsc = get_codec(code, backend=backend)
+        except ValueError as e:
+            for i in indices:
+                results[i] = e
+            continue
+        decoded = _decode_group(rsc, [items[i] for i in indices])
+        for i, res in zip(indices, decoded):
+            results[i] = res
+    return results
+
+# أنواع القناة التي يحاكيها simulate_channel_batch
+ERROR_TYPES = ("random", "burst", "erasures")
+
+def simulate_channel_batch(encoded: bytes, error_type: str, error_rate: float,
+                           rng: np.random.Generator, trials: int = 1):
+    """نموذج القناة المتجه لعدة محاولات: مصفوفة (محاولات × بايتات) بعملية واحدة
+
+    يُرجع (البايتات بعد القناة، قناع مواضع الأخطاء، بدايات الانفجار أو None).
+    """
+    symbols = np.frombuffer(encoded, dtype=np.uint8)
+    n = len(symbols)
+    corrupted = np.repeat(symbols[None, :], trials, axis=0)
+    burst_starts = None
+
+    if error_type in ("random", "erasures"):
+        # أخطاء عشوائية أو حذف بيانات
+        mask = rng.random((trials, n)) < error_rate
+        if error_type == "random":
+            corrupted[mask] = rng.integers(0, 256, size=int(mask.sum()), dtype=np.uint8)
+        else:
+            corrupted[mask] = 0
+    elif error_type == "burst":
+        # أخطاء متتالية
+        burst_length = int(n * error_rate)
+        mask = np.zeros((trials, n), dtype=bool)
+        if burst_length > 0:
+            burst_starts = rng.integers(0, max(1, n - burst_length), size=trials)
+            index = np.arange(n)[None, :]
+            mask = (index >= burst_starts[:, None]) & (index < burst_starts[:, None] + burst_length)
+            corrupted[mask] = rng.integers(0, 256, size=int(mask.sum()), dtype=np.uint8)
+    else:
+        mask = np.zeros((trials, n), dtype=bool)
+
+    return corrupted, mask, burst_starts
+
+def simulate_channel(encoded: bytes, error_type: str, error_rate: float,
+                     rng: np.random.Generator):
+    """محاولة واحدة عبر القناة
+
+    يُرجع (البايتات بعد القناة، مواضع الأخطاء، بداية الانفجار أو None).
+    """
+    corrupted, mask, burst_starts = simulate_channel_batch(encoded, error_type, error_rate, rng, 1)
+    burst_start = int(burst_starts[0]) if burst_starts is not None else None
+    return corrupted[0], np.flatnonzero(mask[0]), burst_start
+
+def _error_details(encoded: bytes, corrupted: np.ndarray, positions: np.ndarray,
+                   error_type: str, burst_start: Optional[int] = None) -> list:
+    """بناء تفاصيل الأخطاء للمواضع المطلوبة فقط"""
+    details = []
+    for i in positions.tolist():
+        if error_type == "burst":
+            details.append({
+                "position": i,
+                "original": format(encoded[i], '02x'),
+                "corrupted": format(int(corrupted[i]), '02x'),
+                "type": "burst_error",
+                "burst_index": i - burst_start
+            })
+        elif error_type == "erasures":
+            details.append({
+                "position": i,
+                "original": format(encoded[i], '02x'),
+                "corrupted": "00",
+                "type": "erasure"
+            })
+        else:
+            details.append({
+                "position": i,
+                "original": format(encoded[i], '02x'),
+                "corrupted": format(int(corrupted[i]), '02x'),
+                "type": "bit_flip"
+            })
+    return details
+
+class SimulatedChannel(NamedTuple):
+    """التدفق المرمز قبل القناة وبعدها مع مواضع الأخطاء"""
+    encoded: bytes
+    corrupted: np.ndarray
+    error_positions: np.ndarray
+    burst_start: Optional[int]
+    error_count: int
+
+def _channel_job(encoded: bytes, code, error_rate: float, error_type: str,
+                 backend: Optional[str] = None, seed: Optional[int] = None) -> SimulatedChannel:
+    """تمرير التدفق المرمز عبر القناة حسب النوع وعد الأخطاء كما يعدها المصحح"""
+    rng = np.random.default_rng(seed)
+    corrupted, error_positions, burst_start = simulate_channel(encoded, error_type, error_rate, rng)
+    error_count = len(error_positions)
+    rsc = get_codec(code, backend=backend)
+    if getattr(rsc, "symbol_bytes", 1) > 1:
+        # الأخطاء تُعد بالرموز كما يعدها المصحح: بايتان تالفان في رمز واحد خطأ واحد
+        error_count = len(rsc.symbol_positions(error_positions.tolist(), len(encoded)))
+    return SimulatedChannel(encoded, corrupted, error_positions, burst_start, error_count)
+
+def _simulate_decode_job(corrupted: bytes, code, erasures: Optional[List[int]] = None,
+                         backend: Optional[str] = None, interleave: int = 1):
+    """محاولة تصحيح التدفق بعد القناة (أو جزء منه بحدود الكلمات)؛ None إن تعذر التصحيح"""
+    try:
+        return _decode_job(corrupted, code, erasures, backend, interleave)
+    except ReedSolomonError:
+        return None
+
+def _simulation_result(channel: SimulatedChannel, decoded, data_bytes: bytes,
+                       error_type: str, detailed: bool = True) -> dict:
+    """نتيجة المحاكاة من القناة ومن (البيانات، الأخطاء المصححة، المسار) أو None عند الفشل"""
+    error_count = channel.error_count
+    if decoded is not None:
+        decoded_bytes, errors_corrected, decode_path = decoded
+        was_successful = True
+        success_rate = (errors_corrected / max(1, error_count)) * 100
+        
+        # التحقق من صحة النتيجة
+        is_correct = decoded_bytes == data_bytes
+        
+    else:
+        was_successful = False
+        errors_corrected = 0
+        success_rate = 0
+        is_correct = False
+        decode_path = None
+
+    # التقرير التفصيلي يُبنى فقط للمداخل المعادة فعلاً في الاستجابة
+    return {
+        "encoded_size": len(channel.encoded),
+        "error_count": error_count,
+        "error_positions": channel.error_positions[:20].tolist() if detailed else [],
+        "error_details": _error_details(
+            channel.encoded, channel.corrupted, channel.error_positions[:10], error_type,
+            channel.burst_start
+        ) if detailed else [],
+        "was_successful": was_successful,
+        "errors_corrected": errors_corrected,
+        "success_rate": success_rate,
+        "is_correct": is_correct,
+        "decode_path": decode_path
+    }
+
+def _simulate_job(data_bytes: bytes, code, error_rate: float, error_type: str,
+                  backend: Optional[str] = None, seed: Optional[int] = None,
+                  interleave: int = 1, detailed: bool = True) -> dict:
+    """تشغيل محاكاة كاملة: ترميز، قناة، ثم محاولة تصحيح (دون تقرير المواضع إن لم يكن detailed)"""
+    # 1. ترميز البيانات
+    encoded = _encode_job(data_bytes, code, backend, interleave)
+
+    # 2. محاكاة القناة حسب النوع
+    channel = _channel_job(encoded, code, error_rate, error_type, backend, seed)
+
+    # 3. محاولة التصحيح؛ مواقع المحو معروفة للمستقبل في قناة المحو فتُمرر للمفكك
+    erasures = channel.error_positions.tolist() if error_type == "erasures" else None
+    decoded = _simulate_decode_job(channel.corrupted.tobytes(), code, erasures, backend, interleave)
+    return _simulation_result(channel, decoded, data_bytes, error_type, detailed)
+
+# ===== مسح مونت كارلو =====
+# عدد المحاولات في كل مهمة فرعية تُرسل إلى مجمع العمال
+SWEEP_TRIALS_PER_TASK = int(os.environ.get("RS_SWEEP_TRIALS_PER_TASK", "256"))
+MAX_SWEEP_TRIALS = int(os.environ.get("RS_MAX_SWEEP_TRIALS", "1000000"))
+
+def _codeword_bytes(rsc) -> tuple:
+    """(طول الكلمة، بايتات التكافؤ فيها) بالبايتات في التدفق المرسل"""
+    width = getattr(rsc, "symbol_bytes", 1)
+    return rsc.nsize * width, rsc.nsym * width
+
+def _data_index(encoded_size: int, nsize: int, nsym: int) -> np.ndarray:
+    """مواضع بايتات البيانات (دون التكافؤ) داخل التدفق المرمز المقطّع (nsize و nsym بالبايتات)"""
+    index = np.arange(encoded_size)
+    offset = index % nsize
+    last_start = (encoded_size - 1) // nsize * nsize if encoded_size else 0
+    chunk_len = np.where(index >= last_start, encoded_size - last_start, nsize)
+    return index[offset < chunk_len - nsym]
+
+def _sweep_trials_job(data_bytes: bytes, code, error_type: str, error_rate: float,
+                      trials: int, seed: int, backend: Optional[str] = None) -> dict:
+    """تشغيل عدد من المحاولات لنقطة واحدة من الشبكة وإرجاع عدادات تجميعية"""
+    encoded = _encode_job(data_bytes, code, backend)
+    rng = np.random.default_rng(seed)
+    corrupted, mask, _ = simulate_channel_batch(encoded, error_type, error_rate, rng, trials)
+
+    # فك ترميز كل المحاولات كدفعة واحدة (مع مواضع المحو في قناة المحو)
+    if error_type == "erasures":
+        items = [(row.tobytes(), np.flatnonzero(row_mask).tolist()) for row, row_mask in zip(corrupted, mask)]
+    else:
+        items = [(row.tobytes(), None) for row in corrupted]
+    decoded = _decode_batch_job(items, [code] * trials, backend)
+
+    original = np.frombuffer(data_bytes, dtype=np.uint8)
+    encoded_arr = np.frombuffer(encoded, dtype=np.uint8)
+    rsc = get_codec(code, backend=backend)
+    data_index = _data_index(len(encoded), *_codeword_bytes(rsc))
+
+    decode_success = recovered = errors_corrected = residual_bits = 0
+    for row, res in zip(corrupted, decoded):
+        if isinstance(res, ReedSolomonError):
+            # عند الفشل تبقى بايتات البيانات التالفة كما وصلت
+            residual_bits += int(np.unpackbits(row[data_index] ^ original).sum())
+            continue
+        if isinstance(res, Exception):
+            raise res
+        decoded_bytes, corrected, _ = res
+        decode_success += 1
+        errors_corrected += corrected
+        if decoded_bytes == data_bytes:
+            recovered += 1
+        else:
+            residual_bits += int(np.unpackbits(np.frombuffer(decoded_bytes, dtype=np.uint8) ^ original).sum())
+
+    return {
+        "trials": trials,
+        "decode_success": decode_success,
+        "recovered": recovered,
+        "errors_introduced": int(mask.sum()),
+        "errors_corrected": errors_corrected,
+        "channel_bits": int(np.unpackbits(corrupted ^ encoded_arr[None, :]).sum()),
+        "residual_bits": residual_bits,
+        "encoded_bits": len(encoded) * 8 * trials,
+        "data_bits": len(data_bytes) * 8 * trials
+    }
+
+def _wilson_interval(successes: int, trials: int, z: float) -> list:
+    """فترة ثقة ويلسون لنسبة ثنائية"""
+    if trials == 0:
+        return [0.0, 1.0]
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * ((p * (1 - p) / trials + z * z / (4 * trials * trials)) ** 0.5) / denom
+    return [round(max(0.0, center - half), 6), round(min(1.0, center + half), 6)]
+
+def _aggregate_sweep(code, error_type: str, error_rate: float, parts: List[dict], z: float) -> dict:
+    """دمج عدادات المهام الفرعية لنقطة واحدة في إحصائيات مع فترات ثقة"""
+    total = {key: sum(p[key] for p in parts) for key in parts[0]}
+    trials = total["trials"]
+    failures = trials - total["recovered"]
+    miscorrections = total["decode_success"] - total["recovered"]
+
+    def rate(count):
+        return {"rate": round(count / trials, 6), "ci": _wilson_interval(count, trials, z)}
+
+    return {
+        "nsym": code.nsym,
+        "nsize": code.nsize,
+        "error_type": error_type,
+        "error_rate": error_rate,
+        "trials": trials,
+        "decode_success": rate(total["decode_success"]),
+        "frame_error_rate": rate(failures),
+        "miscorrection_rate": rate(miscorrections),
+        "mean_errors_introduced": round(total["errors_introduced"] / trials, 4),
+        "mean_errors_corrected": round(total["errors_corrected"] / max(1, total["decode_success"]), 4),
+        "bit_error_rate": {
+            "channel": total["channel_bits"] / total["encoded_bits"] if total["encoded_bits"] else 0.0,
+            "after_decoding": total["residual_bits"] / total["data_bits"] if total["data_bits"] else 0.0
+        }
+    }
 
 # ===== نقاط النهاية الرئيسية =====
 @app.get("/")
@@ -75,10 +1401,29 @@ async def root():
         "endpoints": {
             "/api/encode": "ترميز البيانات",
             "/api/simulate": "محاكاة قناة الإرسال",
+            "/api/simulate/sweep": "مسح مونت كارلو لمعدلات الخطأ",
             "/api/decode": "فك الترميز وتصحيح الأخطاء",
+            "/api/verify": "تحقق سريع من سلامة الكلمات (المتلازمات فقط)",
+            "/api/encode/batch": "ترميز دفعة من الرسائل",
+            "/api/decode/batch": "فك ترميز دفعة من الرسائل",
+            "/api/encode/raw": "ترميز بيانات ثنائية خام",
+            "/api/decode/raw": "فك ترميز بيانات ثنائية خام",
+            "/api/encode/stream": "ترميز تدفقي للملفات الكبيرة",
+            "/api/decode/stream": "فك ترميز تدفقي للملفات الكبيرة",
+            "/api/encode/file": "ترميز ملف مرفوع (multipart) وإرجاعه للتنزيل",
+            "/api/decode/file": "فك ترميز ملف مرفوع (multipart) وإرجاع الأصل للتنزيل",
+            "/api/storage/objects": "تخزين كائن بترميز المحو (k شظية بيانات + m تكافؤ)",
+            "/api/storage/objects/{object_id}": "استعادة كائن من أي k شظايا سليمة",
+            "/api/jobs/encode": "ترميز طويل كمهمة خلفية مع التقدم والإلغاء",
+            "/api/jobs/simulate": "محاكاة كمهمة خلفية",
+            "/api/jobs/sweep": "مسح مونت كارلو كمهمة خلفية مع النقاط المكتملة جزئياً",
+            "/api/jobs/{job_id}": "حالة المهمة وتقدمها ونتيجتها (DELETE للإلغاء)",
+            "/api/profiles": "ملفات تعريف الأكواد المسماة (DVB و CCSDS و QR و CD)",
+            "/ws/stream": "جلسة WebSocket للترميز أو فك الترميز المستمر لإطارات ثنائية",
             "/api/info": "معلومات النظام والمطور",
             "/api/health": "حالة النظام",
-            "/api/capabilities": "قدرات النظام"
+            "/api/capabilities": "قدرات النظام",
+            "/metrics": "مقاييس Prometheus"
         }
     }
 
@@ -111,304 +1456,1890 @@ async def system_info():
                 "1.0.0 - الإصدار الأولي للنظام"
             ]
         }
-    }
+    }
+
+@app.get("/api/health")
+async def health_check():
+    """فحص حالة النظام"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "service": "reed-solomon-api",
+        "version": "2.0.0",
+        "checks": {
+            "api": "operational",
+            "encoding": "ready",
+            "decoding": "ready",
+            "simulation": "ready"
+        },
+        "worker_pool": codec_pool.stats()
+    }
+
+# ===== نقطة نهاية الترميز =====
+def _encode_report(request: EncodeRequest, code, data_bytes: bytes, encoded: bytes,
+                   processing_time: float) -> dict:
+    """الاستجابة الكاملة للترميز (تُستخدم في /api/encode ومهام encode)"""
+    with stage("serialize"):
+        encoded_b64 = base64.b64encode(encoded).decode('utf-8')
+    overhead = ((len(encoded) - len(data_bytes)) / len(data_bytes)) * 100
+    
+    return {
+        "status": "success",
+        "data": {
+            "original": {
+                "text": request.data,
+                "length_bytes": len(data_bytes),
+                "length_bits": len(data_bytes) * 8
+            },
+            "encoded": {
+                "base64": encoded_b64,
+                "length_bytes": len(encoded),
+                "length_bits": len(encoded) * 8
+            },
+            "correction": {
+                "nsym": code.nsym,
+                "interleave": request.interleave,
+                "parity_bytes": code.nsym * (code.c_exp // 8),
+                "max_errors_correctable": code.nsym // 2,
+                "max_erasures_correctable": code.nsym,
+                "code": describe_code(code, request.profile)
+            },
+            "efficiency": {
+                "overhead_percentage": round(overhead, 2),
+                "overhead_bytes": len(encoded) - len(data_bytes),
+                "coding_rate": len(data_bytes) / len(encoded)
+            }
+        },
+        "metadata": {
+            "processing_time_ms": round(processing_time, 2),
+            "timestamp": datetime.now().isoformat(),
+            "algorithm": "Reed-Solomon",
+            "field": "GF(256)",
+            "backend": request.backend or DEFAULT_BACKEND
+        },
+        "developer": DEVELOPER_INFO["name"]
+    }
+
+@app.post("/api/encode")
+async def encode_data(request: EncodeRequest, http_request: Request):
+    """ترميز البيانات مع إرجاع معلومات إضافية (أو الحمولة فقط في الملف المختصر)"""
+    try:
+        start_time = time.time()
+        
+        # تحويل النص إلى بايتات
+        with stage("parse"):
+            data_bytes = request.data.encode('utf-8')
+            code = request.code()
+        
+        # الترميز داخل مجمع العمال حتى لا تُحجب حلقة الأحداث
+        encoded = await codec_pool.run(
+            _encode_job, data_bytes, code, request.backend, request.interleave
+        )
+        record_outcome("encode", code.nsym, "success")
+        
+        if wants_lean(http_request):
+            with stage("serialize"):
+                body = _LEAN_ENCODE % (base64.b64encode(encoded), len(encoded), code.nsym)
+            return _lean(body)
+        
+        processing_time = (time.time() - start_time) * 1000  # ملي ثانية
+        return _json(_encode_report(request, code, data_bytes, encoded, processing_time))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        record_outcome("encode", request.nsym, "error")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": f"فشل الترميز: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+# ===== نقطة نهاية المحاكاة =====
+def _codeword_count(code, data_length: int, interleave: int = 1) -> int:
+    """عدد الكلمات الرمزية في ترميز رسالة طولها data_length (كل صف مشابك يُقطّع وحده)"""
+    width = code.c_exp // 8
+    k = (code.nsize - code.nsym) * width
+    rows = [-(-(data_length - r) // interleave) for r in range(min(interleave, data_length))] or [0]
+    # الرسالة الفردية في الحقل الواسع تُحشى ببايت ضمني في كلمتها الأخيرة
+    return sum(-(-(row + row % width) // k) for row in rows)
+
+def _simulation_report(request: SimulateRequest, code, data_bytes: bytes, result: dict,
+                       processing_time: float) -> dict:
+    """الاستجابة الكاملة لمحاكاة من نتيجة _simulate_job (تُستخدم في /api/simulate ومهام simulate)"""
+    encoded_size = result["encoded_size"]
+    error_count = result["error_count"]
+    error_positions = result["error_positions"]
+    error_details = result["error_details"]
+    was_successful = result["was_successful"]
+    errors_corrected = result["errors_corrected"]
+    success_rate = result["success_rate"]
+    is_correct = result["is_correct"]
+    # المحو المعروف الموقع يكلف رمز تكافؤ واحداً بدل اثنين للخطأ المجهول؛ القدرة
+    # لكل كلمة، وقدرة الرسالة مجموعها على كل الكلمات (في كل صفوف التشابك)
+    per_codeword = code.nsym if request.error_type == "erasures" else code.nsym // 2
+    codewords = _codeword_count(code, len(data_bytes), request.interleave)
+    max_correctable = per_codeword * codewords
+    
+    # تحليل القناة
+    channel_analysis = {
+        "type": request.channel_type,
+        "error_rate_actual": error_count / encoded_size,
+        "error_distribution": {
+            "total": error_count,
+            "density": error_count / encoded_size,
+            "positions": error_positions  # أول 20 موقع فقط
+        },
+        "noise_level": request.error_rate * 100
+    }
+    
+    return {
+        "status": "success" if was_successful else "partial",
+        "simulation": {
+            "summary": {
+                "was_successful": was_successful,
+                "data_recovered": is_correct,
+                "success_rate": round(success_rate, 2),
+                "errors_introduced": error_count,
+                "errors_corrected": errors_corrected,
+                "errors_remaining": error_count - errors_corrected,
+                "max_correctable": max_correctable,
+                "max_correctable_per_codeword": per_codeword,
+                "codewords": codewords,
+                "decode_path": result["decode_path"]
+            },
+            "transmission": {
+                "original_size": len(data_bytes),
+                "encoded_size": encoded_size,
+                "channel_type": request.channel_type,
+                "error_type": request.error_type,
+                "error_rate_requested": request.error_rate,
+                "error_rate_actual": error_count / encoded_size
+            },
+            "performance": {
+                "processing_time_ms": round(processing_time, 2),
+                "bytes_processed": encoded_size,
+                "throughput_bps": encoded_size * 8 / (processing_time / 1000) if processing_time > 0 else 0
+            }
+        },
+        "analysis": {
+            "channel": channel_analysis,
+            "correction": {
+                "capacity_utilization": errors_corrected / max(1, max_correctable),
+                "efficiency": errors_corrected / max(1, error_count)
+            },
+            "errors": error_details  # أول 10 أخطاء فقط
+        },
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "algorithm": "Reed-Solomon",
+            "parameters": {
+                "nsym": code.nsym,
+                "block_size": encoded_size,
+                "code": describe_code(code, request.profile),
+                "backend": request.backend or DEFAULT_BACKEND,
+                "seed": request.seed,
+                "interleave": request.interleave
+            }
+        },
+        "developer": DEVELOPER_INFO["name"]
+    }
+
+@app.post("/api/simulate")
+async def simulate_transmission(request: SimulateRequest, http_request: Request):
+    """محاكاة متقدمة لقناة الإرسال (أو الملخص فقط في الملف المختصر)"""
+    try:
+        start_time = time.time()
+        lean = wants_lean(http_request)
+        
+        # 1. تحويل النص إلى بايتات
+        with stage("parse"):
+            data_bytes = request.data.encode('utf-8')
+            code = request.code()
+        
+        # 2. تشغيل المحاكاة داخل مجمع العمال؛ مع بذرة ثابتة النتيجة حتمية فتُخزن
+        key = None
+        if request.seed is not None and not _cache_bypassed(http_request):
+            key = ResultCache.key("simulate", data_bytes, code, request.error_rate, request.error_type,
+                                  request.seed, request.interleave, not lean)
+        result = await cached_run(
+            key, _simulation_size, _simulate_job, data_bytes, code, request.error_rate,
+            request.error_type, request.backend, request.seed, request.interleave, not lean
+        )
+        if lean:
+            return _lean({
+                "status": "success" if result["was_successful"] else "partial",
+                "data_recovered": result["is_correct"],
+                "errors_introduced": result["error_count"],
+                "errors_corrected": result["errors_corrected"],
+                "encoded_size": result["encoded_size"],
+                "decode_path": result["decode_path"]
+            })
+        processing_time = (time.time() - start_time) * 1000
+        return _json(_simulation_report(request, code, data_bytes, result, processing_time))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"فشل المحاكاة: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+class SweepPlan(NamedTuple):
+    """شبكة المسح ومهامها الفرعية: (النقطة، وسائط _sweep_trials_job) لكل مهمة"""
+    data_bytes: bytes
+    backend: str
+    codes: list
+    grid: list
+    subtasks: list
+    z: float
+
+def _plan_sweep(request: SweepRequest) -> SweepPlan:
+    """التحقق من طلب المسح وتقسيم كل نقطة إلى مهام فرعية ببذور مستقلة"""
+    data_bytes = request.data.encode('utf-8')
+    backend = request.backend or BATCH_BACKEND
+    # nsym_values غير المرسلة مع ملف تعريف تعني nsym ملف التعريف وحده
+    nsym_values = request.nsym_values
+    if request.profile and "nsym_values" not in request.model_fields_set:
+        nsym_values = [None]
+    codes = [request.code_with_nsym(nsym) for nsym in nsym_values]
+    grid = [
+        (code, error_type, error_rate)
+        for code in codes
+        for error_type in request.error_types
+        for error_rate in request.error_rates
+    ]
+    if not grid or request.trials < 1:
+        raise ValueError("الشبكة فارغة أو عدد المحاولات غير صالح")
+    unknown = sorted(set(request.error_types) - set(ERROR_TYPES))
+    if unknown:
+        # نوع غير معروف يمر بقناة بلا أخطاء فيبدو الكود مثالياً
+        raise ValueError(f"أنواع أخطاء غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(ERROR_TYPES)})")
+    if len(grid) * request.trials > MAX_SWEEP_TRIALS:
+        raise ValueError(f"إجمالي المحاولات يتجاوز الحد الأقصى ({MAX_SWEEP_TRIALS})")
+    if not 0 < request.confidence < 1:
+        raise ValueError("مستوى الثقة يجب أن يكون بين 0 و 1")
+    for code in codes:
+        get_codec(code, backend=backend)
+    z = NormalDist().inv_cdf((1 + request.confidence) / 2)
+
+    # بذرة مستقلة لكل مهمة فرعية حتى تكون النتائج قابلة للتكرار
+    seeds = np.random.SeedSequence(request.seed)
+    subtasks = []
+    for point, child in zip(grid, seeds.spawn(len(grid))):
+        code, error_type, error_rate = point
+        remaining = request.trials
+        for sub in child.spawn(-(-request.trials // SWEEP_TRIALS_PER_TASK)):
+            count = min(SWEEP_TRIALS_PER_TASK, remaining)
+            remaining -= count
+            subtasks.append((point, (data_bytes, code, error_type, error_rate,
+                                     count, int(sub.generate_state(1)[0]), backend)))
+    return SweepPlan(data_bytes, backend, codes, grid, subtasks, z)
+
+def _sweep_report(request: SweepRequest, plan: SweepPlan, points: list, processing_time: float) -> dict:
+    return {
+        "status": "success",
+        "sweep": {
+            "points": points,
+            "total_trials": len(plan.grid) * request.trials,
+            "grid_size": len(plan.grid)
+        },
+        "metadata": {
+            "processing_time_ms": round(processing_time, 2),
+            "timestamp": datetime.now().isoformat(),
+            "seed": request.seed,
+            "confidence": request.confidence,
+            "backend": plan.backend,
+            "data_length": len(plan.data_bytes),
+            "code": describe_code(plan.codes[0], request.profile) if len(plan.codes) == 1 else None
+        },
+        "developer": DEVELOPER_INFO["name"]
+    }
+
+@app.post("/api/simulate/sweep")
+async def simulate_sweep(request: SweepRequest):
+    """مسح مونت كارلو: معدل فشل الإطارات وسوء التصحيح عبر شبكة nsym × error_rate × error_type
+
+    كل نقطة تُقسم إلى مهام فرعية ببذور مستقلة مشتقة من seed، وتُوزع على مجمع
+    العمال بالتوازي، وتُفك ترميز محاولات كل مهمة كدفعة واحدة.
+    """
+    try:
+        start_time = time.time()
+        plan = _plan_sweep(request)
+        codec_pool.check_capacity()
+        parts = await asyncio.gather(*(
+            codec_pool.execute(_sweep_trials_job, *args) for _, args in plan.subtasks
+        ))
+
+        by_point = {}
+        for (point, _), part in zip(plan.subtasks, parts):
+            by_point.setdefault(point, []).append(part)
+        points = [_aggregate_sweep(*point, by_point[point], plan.z) for point in plan.grid]
+
+        processing_time = (time.time() - start_time) * 1000
+        return _sweep_report(request, plan, points, processing_time)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "code": "RS_BAD_REQUEST",
+                "message": f"فشل المسح: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+# ===== نقطة نهاية فك الترميز =====
+@app.post("/api/decode")
+async def decode_data(request: DecodeRequest, http_request: Request):
+    """فك الترميز مع خيارات متقدمة (أو الحمولة وعدادات التصحيح فقط في الملف المختصر)"""
+    try:
+        start_time = time.time()
+        
+        # تحويل base64 إلى بايتات
+        with stage("parse"):
+            encoded_bytes = base64.b64decode(request.encoded_data)
+            code = request.code()
+        
+        # فك الترميز داخل مجمع العمال؛ النتيجة لا تعتمد على المحرك فلا يدخل في المفتاح
+        key = None if _cache_bypassed(http_request) else ResultCache.key(
+            "decode", encoded_bytes, code, tuple(request.erasures or ()), request.interleave
+        )
+        decoded_bytes, errors_corrected, decode_path = await cached_run(
+            key, _decoded_size, _decode_job, encoded_bytes, code, request.erasures,
+            request.backend, request.interleave
+        )
+        
+        record_outcome("decode", code.nsym, "corrected" if errors_corrected else "clean", decode_path)
+        
+        if wants_lean(http_request):
+            with stage("serialize"):
+                body = _LEAN_DECODE % (base64.b64encode(decoded_bytes), len(decoded_bytes),
+                                       errors_corrected, decode_path.encode())
+            return _lean(body)
+        
+        # تحويل البايتات إلى نص
+        with stage("serialize"):
+            decoded_text = decoded_bytes.decode('utf-8', errors='ignore')
+            decoded_b64 = base64.b64encode(decoded_bytes).decode('utf-8')
+        
+        processing_time = (time.time() - start_time) * 1000
+        
+        return _json({
+            "status": "success",
+            "data": {
+                "decoded": {
+                    "text": decoded_text,
+                    "bytes_base64": decoded_b64,
+                    "length": len(decoded_bytes)
+                },
+                "correction": {
+                    "errors_corrected": errors_corrected,
+                    "was_corrupted": errors_corrected > 0,
+                    "erasures_provided": len(request.erasures) if request.erasures else 0,
+                    "decode_path": decode_path
+                }
+            },
+            "metadata": {
+                "processing_time_ms": round(processing_time, 2),
+                "timestamp": datetime.now().isoformat(),
+                "code": describe_code(code, request.profile)
+            },
+            "developer": DEVELOPER_INFO["name"]
+        })
+        
+    except ReedSolomonError as e:
+        hint = await codec_pool.execute(_interleave_hint, encoded_bytes, code, request.interleave)
+        if hint is not None:
+            record_outcome("decode", code.nsym, "error")
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "status": "error",
+                    "code": "RS_BAD_REQUEST",
+                    "message": f"فشل فك الترميز: {_interleave_mismatch(request.interleave, hint)}",
+                    "interleave_hint": hint,
+                    "developer": DEVELOPER_INFO["name"]
+                }
+            )
+        record_outcome("decode", code.nsym, "uncorrectable")
+        if wants_lean(http_request):
+            return _lean(_lean_uncorrectable(code.nsym))
+        return _json({
+            "status": "uncorrectable",
+            "error": {
+                "code": "RS_UNCORRECTABLE",
+                "message": "عدد الأخطاء يتجاوز قدرة التصحيح",
+                "max_correctable": code.nsym // 2
+            },
+            "developer": DEVELOPER_INFO["name"]
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        record_outcome("decode", request.nsym, "error")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": f"فشل فك الترميز: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+# ===== نقطة نهاية التحقق السريع =====
+@app.post("/api/verify")
+async def verify_data(request: VerifyRequest, http_request: Request):
+    """التحقق من سلامة الكلمات الرمزية بحساب المتلازمات فقط دون فك الترميز"""
+    try:
+        start_time = time.time()
+        
+        with stage("parse"):
+            encoded_bytes = base64.b64decode(request.encoded_data)
+            code = request.code()
+        
+        clean = await codec_pool.run(_verify_job, encoded_bytes, code, request.interleave)
+        valid = bool(clean.all())
+        record_outcome("verify", code.nsym, "clean" if valid else "corrupted")
+        corrupted = np.flatnonzero(~clean)
+        
+        if wants_lean(http_request):
+            return _lean({"status": "success", "valid": valid, "corrupted": len(corrupted)})
+        
+        processing_time = (time.time() - start_time) * 1000
+        
+        return _json({
+            "status": "success",
+            "valid": valid,
+            "codewords": {
+                "total": len(clean),
+                "clean": len(clean) - len(corrupted),
+                "corrupted": len(corrupted),
+                "corrupted_indices": corrupted[:100].tolist()  # أول 100 فقط
+            },
+            "metadata": {
+                "processing_time_ms": round(processing_time, 2),
+                "timestamp": datetime.now().isoformat(),
+                "method": "syndromes"
+            },
+            "developer": DEVELOPER_INFO["name"]
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": f"فشل التحقق: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+# ===== نقاط نهاية الدفعات =====
+@app.post("/api/encode/batch")
+async def encode_batch(request: BatchEncodeRequest):
+    """ترميز عدة رسائل في طلب واحد مع الحفاظ على ترتيب المدخلات"""
+    try:
+        start_time = time.time()
+        if len(request.items) > MAX_BATCH_ITEMS:
+            raise ValueError(f"حجم الدفعة يتجاوز الحد الأقصى ({MAX_BATCH_ITEMS})")
+        backend = request.backend or BATCH_BACKEND
+
+        # معاملات الكود غير الصالحة لعنصر تُبلّغ كخطأ له وحده دون إفشال الدفعة
+        with stage("parse"):
+            messages = [item.data.encode('utf-8') for item in request.items]
+            codes = []
+            for item in request.items:
+                try:
+                    codes.append(request.code(item))
+                except ValueError as e:
+                    codes.append(str(e))
+        valid = [i for i, code in enumerate(codes) if isinstance(code, CodeSpec)]
+        encoded = list(codes)
+        done = await codec_pool.run(
+            _encode_batch_job, [messages[i] for i in valid], [codes[i] for i in valid], backend
+        )
+        for i, enc in zip(valid, done):
+            encoded[i] = enc
+
+        results = []
+        for index, (item, code, data_bytes, enc) in enumerate(zip(request.items, codes, messages, encoded)):
+            if isinstance(enc, str):
+                record_outcome("encode", item.nsym, "error")
+                results.append({"index": index, "status": "error", "message": enc})
+                continue
+            record_outcome("encode", code.nsym, "success")
+            results.append({
+                "index": index,
+                "status": "success",
+                "encoded_base64": base64.b64encode(enc).decode('utf-8'),
+                "length_bytes": len(enc),
+                "original_length_bytes": len(data_bytes),
+                "nsym": code.nsym
+            })
+
+        processing_time = (time.time() - start_time) * 1000
+        succeeded = sum(1 for r in results if r["status"] == "success")
+        return _json({
+            "status": "success" if succeeded == len(results) else "partial",
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded
+            },
+            "metadata": {
+                "processing_time_ms": round(processing_time, 2),
+                "timestamp": datetime.now().isoformat(),
+                "backend": backend
+            },
+            "developer": DEVELOPER_INFO["name"]
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": f"فشل ترميز الدفعة: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+@app.post("/api/decode/batch")
+async def decode_batch(request: BatchDecodeRequest):
+    """فك ترميز عدة رسائل في طلب واحد مع تقرير الأخطاء لكل عنصر"""
+    try:
+        start_time = time.time()
+        if len(request.items) > MAX_BATCH_ITEMS:
+            raise ValueError(f"حجم الدفعة يتجاوز الحد الأقصى ({MAX_BATCH_ITEMS})")
+        backend = request.backend or BATCH_BACKEND
+
+        # فك base64 لكل عنصر؛ العناصر غير الصالحة تُستبعد من الدفعة وتُبلّغ كخطأ
+        results = [None] * len(request.items)
+        items, codes, positions = [], [], []
+        with stage("parse"):
+            for index, item in enumerate(request.items):
+                try:
+                    code = request.code(item)
+                    items.append((base64.b64decode(item.encoded_data), item.erasures))
+                    codes.append(code)
+                    positions.append(index)
+                except Exception as e:
+                    record_outcome("decode", item.nsym, "error")
+                    results[index] = {"index": index, "status": "error", "message": f"عنصر غير صالح: {str(e)}"}
+
+        decoded = await codec_pool.run(_decode_batch_job, items, codes, backend)
+
+        for index, code, res in zip(positions, codes, decoded):
+            if isinstance(res, ReedSolomonError):
+                record_outcome("decode", code.nsym, "uncorrectable")
+                results[index] = {
+                    "index": index,
+                    "status": "uncorrectable",
+                    "error": {
+                        "code": "RS_UNCORRECTABLE",
+                        "message": "عدد الأخطاء يتجاوز قدرة التصحيح",
+                        "max_correctable": code.nsym // 2
+                    }
+                }
+            elif isinstance(res, Exception):
+                record_outcome("decode", code.nsym, "error")
+                results[index] = {"index": index, "status": "error", "message": str(res)}
+            else:
+                decoded_bytes, errors_corrected, decode_path = res
+                record_outcome("decode", code.nsym, "corrected" if errors_corrected else "clean", decode_path)
+                results[index] = {
+                    "index": index,
+                    "status": "success",
+                    "decoded_text": decoded_bytes.decode('utf-8', errors='ignore'),
+                    "decoded_base64": base64.b64encode(decoded_bytes).decode('utf-8'),
+                    "errors_corrected": errors_corrected,
+                    "was_corrupted": errors_corrected > 0,
+                    "decode_path": decode_path
+                }
+
+        processing_time = (time.time() - start_time) * 1000
+        succeeded = sum(1 for r in results if r["status"] == "success")
+        return _json({
+            "status": "success" if succeeded == len(results) else "partial",
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "succeeded": succeeded,
+                "uncorrectable": sum(1 for r in results if r["status"] == "uncorrectable"),
+                "failed": sum(1 for r in results if r["status"] == "error")
+            },
+            "metadata": {
+                "processing_time_ms": round(processing_time, 2),
+                "timestamp": datetime.now().isoformat(),
+                "backend": backend
+            },
+            "developer": DEVELOPER_INFO["name"]
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": f"فشل فك ترميز الدفعة: {str(e)}",
+                "developer": DEVELOPER_INFO["name"]
+            }
+        )
+
+# ===== نقاط النهاية الثنائية (بدون base64 أو JSON) =====
+def _raw_param(request: Request, name: str, default: Optional[str] = None) -> Optional[str]:
+    """قراءة معامل من سلسلة الاستعلام أولاً ثم من ترويسة X-RS-<name>"""
+    value = request.query_params.get(name)
+    if value is None:
+        value = request.headers.get(f"x-rs-{name.replace('_', '-')}")
+    return value if value not in (None, "") else default
+
+def _raw_error(status_code: int, message: str, code: str = "RS_BAD_REQUEST", **extra) -> JSONResponse:
+    """خطأ للنقاط الثنائية: الجسم JSON صغير والحالة في الترويسة أيضاً"""
+    return JSONResponse(
+        status_code=status_code,
+        content={"status": "error", "error": {"code": code, "message": message, **extra}},
+        headers={"X-RS-Status": code}
+    )
+
+def _raw_code(request: Request) -> CodeSpec:
+    """معاملات الكود من الاستعلام أو الترويسات؛ prim و generator تقبلان الصيغة 0x..."""
+    values = {}
+    for name in ("nsym", "nsize", "fcr", "prim", "generator", "c_exp"):
+        value = _raw_param(request, name)
+        if value is not None:
+            value = int(value, 16) if value.lower().startswith("0x") else int(value)
+        values[name] = value
+    return resolve_code(_raw_param(request, "profile"), **values)
+
+@app.post("/api/encode/raw")
+async def encode_raw(request: Request):
+    """ترميز جسم الطلب الخام وإرجاع البايتات المرمزة مباشرة
+
+    المعاملات: nsym و backend و interleave ومعاملات الكود (profile و nsize و fcr
+    و prim و generator و c_exp) في الاستعلام أو ترويسات X-RS-*.
+    """
+    start_time = time.time()
+    try:
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend")
+        interleave = int(_raw_param(request, "interleave", "1"))
+        _check_depth(interleave)
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+
+    with stage("parse"):
+        data_bytes = await request.body()
+    try:
+        encoded = await codec_pool.run(_encode_job, data_bytes, code, backend, interleave)
+    except HTTPException:
+        raise
+    except Exception as e:
+        record_outcome("encode", nsym, "error")
+        return _raw_error(400, f"فشل الترميز: {str(e)}")
+    record_outcome("encode", nsym, "success")
+
+    processing_time = (time.time() - start_time) * 1000
+    return Response(
+        content=encoded,
+        media_type="application/octet-stream",
+        headers={
+            "X-RS-Status": "success",
+            "X-RS-Nsym": str(nsym),
+            "X-RS-Original-Length": str(len(data_bytes)),
+            "X-RS-Encoded-Length": str(len(encoded)),
+            "X-RS-Processing-Time-Ms": f"{processing_time:.2f}"
+        }
+    )
+
+@app.post("/api/decode/raw")
+async def decode_raw(request: Request):
+    """فك ترميز جسم الطلب الخام وإرجاع البيانات الأصلية مباشرة
+
+    المحو اختياري كقائمة مفصولة بفواصل: erasures=3,17,40 أو ترويسة X-RS-Erasures.
+    إحصائيات التصحيح تُعاد في الترويسات.
+    """
+    start_time = time.time()
+    try:
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend")
+        interleave = int(_raw_param(request, "interleave", "1"))
+        _check_depth(interleave)
+        erasures_param = _raw_param(request, "erasures")
+        erasures = [int(p) for p in erasures_param.split(",")] if erasures_param else None
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+
+    with stage("parse"):
+        encoded_bytes = await request.body()
+    key = None if _cache_bypassed(request) else ResultCache.key(
+        "decode", encoded_bytes, code, tuple(erasures or ()), interleave
+    )
+    try:
+        decoded_bytes, errors_corrected, decode_path = await cached_run(
+            key, _decoded_size, _decode_job, encoded_bytes, code, erasures, backend, interleave
+        )
+    except HTTPException:
+        raise
+    except ReedSolomonError:
+        hint = await codec_pool.execute(_interleave_hint, encoded_bytes, code, interleave)
+        if hint is not None:
+            record_outcome("decode", nsym, "error")
+            return _raw_error(400, _interleave_mismatch(interleave, hint), interleave_hint=hint)
+        record_outcome("decode", nsym, "uncorrectable")
+        return _raw_error(
+            422, "عدد الأخطاء يتجاوز قدرة التصحيح", code="RS_UNCORRECTABLE",
+            max_correctable=nsym // 2
+        )
+    except Exception as e:
+        record_outcome("decode", nsym, "error")
+        return _raw_error(400, f"فشل فك الترميز: {str(e)}")
+    record_outcome("decode", nsym, "corrected" if errors_corrected else "clean", decode_path)
+
+    processing_time = (time.time() - start_time) * 1000
+    return Response(
+        content=decoded_bytes,
+        media_type="application/octet-stream",
+        headers={
+            "X-RS-Status": "success",
+            "X-RS-Nsym": str(nsym),
+            "X-RS-Errors-Corrected": str(errors_corrected),
+            "X-RS-Was-Corrupted": "true" if errors_corrected > 0 else "false",
+            "X-RS-Erasures-Provided": str(len(erasures) if erasures else 0),
+            "X-RS-Decode-Path": decode_path,
+            "X-RS-Decoded-Length": str(len(decoded_bytes)),
+            "X-RS-Processing-Time-Ms": f"{processing_time:.2f}"
+        }
+    )
+
+# ===== نقاط نهاية التدفق =====
+# عدد الكلمات الرمزية في كل كتلة تُعالج دفعة واحدة أثناء التدفق (يحدد الذاكرة المستخدمة)
+STREAM_BLOCK_CODEWORDS = int(os.environ.get("RS_STREAM_BLOCK_CODEWORDS", "256"))
+# إطار الحالة الختامي (status_frame=1): المعرّف، الحالة، 3 بايتات محجوزة، القيمة (big-endian)
+STATUS_FRAME = struct.Struct(">4sB3xQ")
+STATUS_FRAME_MAGIC = b"RSST"
+STATUS_OK, STATUS_UNCORRECTABLE, STATUS_ERROR = 0, 1, 2
+
+class DuplexStreamingResponse(StreamingResponse):
+    """استجابة متدفقة تقرأ جسم الطلب أثناء الإرسال
+
+    StreamingResponse تستهلك receive() للاستماع لانقطاع الاتصال فتسرق رسائل
+    الجسم؛ هنا يكتشف مولّد الجسم نفسه الانقطاع عبر request.stream().
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+def _locate_uncorrectable(encoded_bytes: bytes, code, backend: Optional[str] = None) -> int:
+    """رقم أول كلمة غير قابلة للتصحيح في كتلة فشل فك ترميزها
+
+    فحص المتلازمات يستبعد الكلمات السليمة، ثم تُفك الكلمات التالفة وحدها بالترتيب.
+    """
+    size = _codeword_bytes(get_codec(code, backend=backend))[0]
+    clean = _verify_job(encoded_bytes, code)
+    for index in np.flatnonzero(~clean).tolist():
+        try:
+            _decode_job(encoded_bytes[index * size:(index + 1) * size], code, None, backend)
+        except ReedSolomonError:
+            return index
+    return len(clean)
+
+def _block_decode_job(encoded_bytes: bytes, code, backend: Optional[str] = None):
+    """فك ترميز كتلة من كلمات كاملة؛ عند الفشل يحمل الاستثناء رقم الكلمة الفاشلة
+    داخل الكتلة في rs_codeword"""
+    try:
+        return _decode_job(encoded_bytes, code, None, backend)
+    except ReedSolomonError as e:
+        e.rs_codeword = _locate_uncorrectable(encoded_bytes, code, backend)
+        raise
+
+def _stream_decode_job(encoded_bytes: bytes, code, backend: Optional[str] = None) -> bytes:
+    """فك ترميز كتلة من كلمات كاملة وإرجاع البيانات فقط
+
+    إن فشلت الكتلة يحمل الاستثناء بيانات الكلمات السليمة قبل الكلمة الفاشلة في
+    rs_prefix لتُرسل قبل إنهاء التدفق.
+    """
+    try:
+        return _block_decode_job(encoded_bytes, code, backend)[0]
+    except ReedSolomonError as e:
+        size = _codeword_bytes(get_codec(code, backend=backend))[0]
+        prefix = encoded_bytes[:e.rs_codeword * size]
+        e.rs_prefix = _decode_job(prefix, code, None, backend)[0] if prefix else b""
+        raise
+
+async def _stream_blocks(request: Request, block_size: int, job, *args):
+    """قراءة الجسم تدريجياً وتمرير كتل بحجم ثابت إلى المجمع بالترتيب
+
+    لا يُحتفظ في الذاكرة إلا بكتلة واحدة وما وصل بعدها من الشبكة. عند فشل كتلة
+    يُرسل ما سبق الكلمة الفاشلة منها (rs_prefix) ثم يُطلق الاستثناء حاملاً إزاحة
+    الكتلة في المدخلات (rs_offset).
+    """
+    async def blocks():
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer.extend(chunk)
+            while len(buffer) >= block_size:
+                block = bytes(buffer[:block_size])
+                del buffer[:block_size]
+                yield block
+        if buffer:
+            yield bytes(buffer)
+
+    offset = 0
+    async for block in blocks():
+        try:
+            result = await codec_pool.execute(job, block, *args)
+        except Exception as e:
+            e.rs_offset = offset
+            prefix = getattr(e, "rs_prefix", b"")
+            if prefix:
+                yield prefix
+            raise
+        offset += len(block)
+        yield result
+
+def _wants_status_frame(request: Request) -> bool:
+    return _raw_param(request, "status_frame", "false").lower() in ("1", "true", "yes")
+
+async def _status_framed(chunks, codeword_size: int):
+    """إنهاء التدفق بإطار حالة ثابت الطول بدل قطعه عند الفشل
+
+    القيمة عند النجاح أو الخطأ عدد البايتات المرسلة قبل الإطار، وعند كلمة غير
+    قابلة للتصحيح رقمها من بداية التدفق. غياب الإطار يعني انقطاع الاتصال.
+    """
+    sent = 0
+    try:
+        async for chunk in chunks:
+            sent += len(chunk)
+            yield chunk
+    except ReedSolomonError as e:
+        yield STATUS_FRAME.pack(STATUS_FRAME_MAGIC, STATUS_UNCORRECTABLE,
+                                e.rs_offset // codeword_size + getattr(e, "rs_codeword", 0))
+        return
+    except Exception:
+        yield STATUS_FRAME.pack(STATUS_FRAME_MAGIC, STATUS_ERROR, sent)
+        return
+    yield STATUS_FRAME.pack(STATUS_FRAME_MAGIC, STATUS_OK, sent)
+
+def _block_codewords(rsc, codewords: int) -> int:
+    """عدد الكلمات في كتلة المعالجة: كلمات الحقول الواسعة تُحسب بحجمها بالبايتات
+    حتى تبقى الكتلة بحجم codewords كلمة من 255 بايتاً"""
+    size = _codeword_bytes(rsc)[0]
+    return codewords if size <= 255 else max(1, codewords * 255 // size)
+
+def _stream_headers(rsc) -> dict:
+    """ترويسات تصف تأطير الكلمات الرمزية حتى يستطيع الطرف الآخر المزامنة (الأطوال بالبايتات)"""
+    size, parity = _codeword_bytes(rsc)
+    return {
+        "X-RS-Framing": "rs-codewords-v1",
+        "X-RS-Nsym": str(rsc.nsym),
+        "X-RS-Symbol-Bytes": str(getattr(rsc, "symbol_bytes", 1)),
+        "X-RS-Codeword-Size": str(size),
+        "X-RS-Data-Per-Codeword": str(size - parity)
+    }
+
+def _stream_response(request: Request, rsc, chunks) -> DuplexStreamingResponse:
+    headers = _stream_headers(rsc)
+    if _wants_status_frame(request):
+        chunks = _status_framed(chunks, _codeword_bytes(rsc)[0])
+        headers["X-RS-Status-Frame"] = str(STATUS_FRAME.size)
+    return DuplexStreamingResponse(chunks, media_type="application/octet-stream", headers=headers)
+
+@app.post("/api/encode/stream")
+async def encode_stream(request: Request):
+    """ترميز جسم طلب بأي حجم تدفقياً بذاكرة محدودة
+
+    التأطير: المخرجات سلسلة كلمات رمزية طول كل منها nsize رمزاً (k رمز بيانات ثم
+    nsym رمز تكافؤ، والرمز بايت أو بايتان حسب c_exp)، والأخيرة أقصر إن لم تمتلئ.
+    الناتج مطابق تماماً لترميز الملف كاملاً بـ /api/encode/raw.
+    """
+    try:
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend")
+        rsc = get_codec(code, backend=backend)
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+    codec_pool.check_capacity()
+
+    size, parity = _codeword_bytes(rsc)
+    block_size = (size - parity) * _block_codewords(rsc, STREAM_BLOCK_CODEWORDS)
+    return _stream_response(request, rsc, _stream_blocks(request, block_size, _encode_job, code, backend))
+
+@app.post("/api/decode/stream")
+async def decode_stream(request: Request):
+    """فك ترميز تدفق كلمات رمزية بنفس تأطير /api/encode/stream
+
+    تُقرأ الكلمات بوحدات nsize من بداية التدفق. عند كلمة غير قابلة للتصحيح
+    تُرسل بيانات كل الكلمات السابقة لها ثم يُقطع التدفق، فالبايتات المستلمة
+    مقسومة على k هي رقم الكلمة الفاشلة بالضبط. مع status_frame=1 ينتهي التدفق
+    دائماً بإطار حالة (STATUS_FRAME) بدل القطع، فيُميَّز الفشل من انقطاع الاتصال.
+    """
+    try:
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend")
+        rsc = get_codec(code, backend=backend)
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+    codec_pool.check_capacity()
+
+    block_size = _codeword_bytes(rsc)[0] * _block_codewords(rsc, STREAM_BLOCK_CODEWORDS)
+    return _stream_response(
+        request, rsc, _stream_blocks(request, block_size, _stream_decode_job, code, backend)
+    )
+
+# ===== قناة WebSocket للتدفق المستمر =====
+# حد الإطارات المنتظرة في الجلسة: عند امتلائه يتوقف الخادم عن القراءة فيعمل ضغط TCP العكسي
+WS_MAX_QUEUE = int(os.environ.get("RS_WS_MAX_QUEUE", "256"))
+# أقصى عدد إطارات تُعالج كدفعة متجهة واحدة
+WS_MAX_BATCH = int(os.environ.get("RS_WS_MAX_BATCH", "256"))
+# الدفعات الصغيرة بمحرك numpy تُعالج داخل حلقة الأحداث: الانتقال إلى المجمع أغلى منها
+WS_INLINE_BYTES = int(os.environ.get("RS_WS_INLINE_BYTES", "4096"))
+WS_MAX_FRAME_BYTES = int(os.environ.get("RS_WS_MAX_FRAME_BYTES", str(1 << 20)))
+
+class StreamSessionConfig(CodeParams):
+    """رسالة التفاوض الأولى في جلسة /ws/stream"""
+    mode: str = "encode"  # encode | decode
+    nsym: int = 10
+    backend: Optional[str] = None
+
+class _StreamSession:
+    """جلسة تدفق واحدة: كود ومرمز ثابتان، وإطارات تُعالج دفعات بترتيب وصولها
+
+    حلقة الاستقبال تضع الإطارات في طابور محدود، والعامل يسحب كل ما تراكم منها
+    ويعالجه كدفعة واحدة بينما تستمر الحلقة في الاستقبال، فتتداخل معالجة الدفعة
+    مع وصول التي بعدها. كل إطار وارد يقابله رد واحد بالترتيب نفسه: إطار ثنائي
+    عند النجاح أو رسالة JSON نصية تحمل رقم الإطار عند الفشل.
+    """
+
+    def __init__(self, websocket: WebSocket, config: StreamSessionConfig, code: CodeSpec, backend: str):
+        self.websocket = websocket
+        self.mode = config.mode
+        self.code = code
+        self.backend = backend
+        # reedsolo يعمل تحت قفل عام فلا يُشغَّل أبداً داخل حلقة الأحداث
+        self.inline = isinstance(get_codec(code, backend=backend), NumpyRSCodec)
+        self.queue = asyncio.Queue(maxsize=max(1, WS_MAX_QUEUE))
+        self.frames_in = self.frames_out = self.failed = 0
+        self.bytes_in = self.bytes_out = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "failed": self.failed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "batches": self.batches,
+            "mean_batch_frames": round(self.frames_out / self.batches, 2) if self.batches else 0.0,
+            "frames_per_second": round(self.frames_out / elapsed, 2) if elapsed > 0 else 0.0
+        }
+
+    async def _process(self, frames: List[bytes]) -> list:
+        codes = [self.code] * len(frames)
+        if self.mode == "encode":
+            job, args = _encode_batch_job, (frames, codes, self.backend)
+        else:
+            job, args = _decode_batch_job, ([(f, None) for f in frames], codes, self.backend)
+        if self.inline and sum(map(len, frames)) <= WS_INLINE_BYTES:
+            return job(*args)
+        return await codec_pool.execute(job, *args)
+
+    async def _flush(self, frames: List[bytes]):
+        if not frames:
+            return
+        results = await self._process(frames)
+        self.batches += 1
+        nsym = self.code.nsym
+        for res in results:
+            index = self.frames_out
+            self.frames_out += 1
+            if isinstance(res, ReedSolomonError):
+                self.failed += 1
+                record_outcome(self.mode, nsym, "uncorrectable")
+                await self.websocket.send_json({
+                    "status": "uncorrectable", "frame": index, "code": "RS_UNCORRECTABLE",
+                    "max_correctable": nsym // 2
+                })
+            elif isinstance(res, (str, Exception)):
+                self.failed += 1
+                record_outcome(self.mode, nsym, "error")
+                await self.websocket.send_json({"status": "error", "frame": index, "message": str(res)})
+            elif self.mode == "encode":
+                record_outcome("encode", nsym, "success")
+                self.bytes_out += len(res)
+                await self.websocket.send_bytes(res)
+            else:
+                data, corrected, path = res
+                record_outcome("decode", nsym, "corrected" if corrected else "clean", path)
+                self.bytes_out += len(data)
+                await self.websocket.send_bytes(data)
+
+    async def worker(self):
+        """سحب ما تراكم في الطابور ومعالجته دفعات؛ الرسائل غير الثنائية تُنفذ في موضعها"""
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < WS_MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            frames = []
+            for item in batch:
+                if isinstance(item, bytes):
+                    frames.append(item)
+                    continue
+                await self._flush(frames)
+                frames = []
+                if item is None:
+                    return
+                if item == "stats":
+                    # اللقطة تؤخذ عند وصول دورها حتى تشمل كل الإطارات السابقة لها
+                    item = {"status": "stats", **self.stats()}
+                elif "frame" in item:
+                    self.frames_out += 1
+                    self.failed += 1
+                await self.websocket.send_json(item)
+            await self._flush(frames)
+
+    async def receive(self, message: dict):
+        """وضع رسالة واردة في الطابور (ينتظر إن امتلأ)؛ تُرجع False عند طلب الإغلاق"""
+        data = message.get("bytes")
+        if data is not None:
+            self.frames_in += 1
+            self.bytes_in += len(data)
+            if len(data) > WS_MAX_FRAME_BYTES:
+                # الإطار المرفوض يحجز موضعه في الترتيب برسالة خطأ
+                await self.queue.put({"status": "error", "frame": self.frames_in - 1,
+                                      "message": f"الإطار يتجاوز {WS_MAX_FRAME_BYTES} بايت"})
+                return True
+            await self.queue.put(data)
+            return True
+        try:
+            op = json.loads(message.get("text") or "{}").get("op")
+        except (ValueError, AttributeError):
+            op = None
+        if op == "close":
+            return False
+        if op == "stats":
+            await self.queue.put("stats")
+        else:
+            await self.queue.put({"status": "error", "message": "رسالة تحكم غير معروفة (المتاح: stats و close)"})
+        return True
+
+@app.websocket("/ws/stream")
+async def stream_session(websocket: WebSocket):
+    """جلسة ترميز أو فك ترميز مستمرة عبر WebSocket
+
+    1. يرسل العميل رسالة JSON نصية واحدة بالمعاملات: mode (encode أو decode)
+       و nsym و backend ومعاملات الكود (profile و nsize و fcr و prim و generator).
+    2. يرد الخادم {"status": "ready", ...} أو خطأ ثم يغلق الاتصال.
+    3. كل إطار ثنائي بعدها يُرمَّز أو يُفك مستقلاً ويُعاد بالترتيب نفسه.
+       {"op": "stats"} يعيد إحصائيات الجلسة، و {"op": "close"} ينهي الجلسة بعد
+       إرسال ردود كل الإطارات المعلقة.
+    """
+    await websocket.accept()
+    try:
+        config = StreamSessionConfig(**json.loads(await websocket.receive_text()))
+        if config.mode not in ("encode", "decode"):
+            raise ValueError(f"وضع غير معروف: {config.mode}")
+        code = config.code()
+        backend = config.backend or BATCH_BACKEND
+        session = _StreamSession(websocket, config, code, backend)
+    except WebSocketDisconnect:
+        return
+    except (ValueError, TypeError, KeyError) as e:
+        await websocket.send_json({"status": "error", "message": f"تفاوض غير صالح: {str(e)}"})
+        await websocket.close(code=1008)
+        return
+
+    await websocket.send_json({
+        "status": "ready",
+        "mode": session.mode,
+        "backend": backend,
+        "code": describe_code(code, config.profile),
+        "max_frame_bytes": WS_MAX_FRAME_BYTES
+    })
+    worker = asyncio.create_task(session.worker())
+    closing = False
+    try:
+        while not worker.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if not await session.receive(message):
+                closing = True
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if closing:
+            await session.queue.put(None)
+            await worker
+            await websocket.send_json({"status": "closed", **session.stats()})
+            await websocket.close(code=1000)
+        else:
+            worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect, Exception):
+                await worker
+
+# ===== تخزين الكائنات بترميز المحو =====
+STORAGE_DIR = os.environ.get("RS_STORAGE_DIR",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage"))
+shard_store = ShardStore(STORAGE_DIR)
+
+def _storage_error(e: Exception) -> JSONResponse:
+    """تحويل أخطاء المخزن إلى استجابات بنفس شكل أخطاء النقاط الثنائية"""
+    if isinstance(e, FileNotFoundError):
+        return _raw_error(404, str(e), code="RS_NOT_FOUND")
+    if isinstance(e, ReedSolomonError):
+        return _raw_error(422, f"الشظايا السليمة أقل من k: {str(e)}", code="RS_UNCORRECTABLE")
+    return _raw_error(400, str(e))
+
+def _remove_quietly(path: str):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+@app.post("/api/storage/objects")
+async def store_object(request: Request):
+    """تخزين جسم الطلب الخام ككائن مقسم إلى k شظية بيانات و m شظية تكافؤ
+
+    الجسم يُكتب إلى ملف مؤقت على القرص أثناء وصوله، ثم يُرمز على شرائح
+    مربوطة بالذاكرة داخل مجمع العمال. الاستجابة هي بيان الكائن.
+    """
+    try:
+        k = int(_raw_param(request, "k", "4"))
+        m = int(_raw_param(request, "m", "2"))
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+    codec_pool.check_capacity()
+
+    spool = shard_store.spool_path()
+    try:
+        with stage("parse"):
+            with open(spool, "wb") as f:
+                async for chunk in request.stream():
+                    f.write(chunk)
+        manifest = await codec_pool.execute(shard_store.put_file, spool, k, m)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return _storage_error(e)
+    finally:
+        _remove_quietly(spool)
+    return {"status": "success", **manifest}
+
+@app.get("/api/storage/objects/{object_id}")
+async def fetch_object(object_id: str, request: Request):
+    """استعادة الكائن من أي k شظايا سليمة
+
+    verify=true يتحقق من بصمة كل شظية قبل استخدامها فتُعامل التالفة كمفقودة.
+    """
+    verify = _raw_param(request, "verify", "false").lower() in ("1", "true", "yes")
+    out_path = shard_store.spool_path()
+    try:
+        info = await codec_pool.run(shard_store.get_to_file, object_id, out_path, verify)
+    except HTTPException:
+        _remove_quietly(out_path)
+        raise
+    except Exception as e:
+        _remove_quietly(out_path)
+        return _storage_error(e)
+    return FileResponse(
+        out_path,
+        media_type="application/octet-stream",
+        background=BackgroundTask(_remove_quietly, out_path),
+        headers={
+            "X-RS-Status": "success",
+            "X-RS-Shards-Used": ",".join(map(str, info["shards_used"])),
+            "X-RS-Shards-Missing": ",".join(map(str, info["shards_missing"])),
+            "X-RS-Reconstructed": "true" if info["reconstructed"] else "false"
+        }
+    )
 
-@app.get("/api/health")
-async def health_check():
-    """فحص حالة النظام"""
+@app.get("/api/storage/objects/{object_id}/manifest")
+async def object_manifest(object_id: str, request: Request):
+    """بيان الكائن مع حالة كل شظية (present أو missing أو corrupt)"""
+    verify = _raw_param(request, "verify", "false").lower() in ("1", "true", "yes")
+    try:
+        manifest, status = await codec_pool.run(shard_store.shard_status, object_id, verify)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return _storage_error(e)
+    for shard, state in zip(manifest["shards"], status):
+        shard["status"] = state
     return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "reed-solomon-api",
-        "version": "2.0.0",
-        "checks": {
-            "api": "operational",
-            "encoding": "ready",
-            "decoding": "ready",
-            "simulation": "ready"
-        }
+        "status": "success",
+        **manifest,
+        "recoverable": status.count("present") >= manifest["k"]
     }
 
-# ===== نقطة نهاية الترميز =====
-@app.post("/api/encode")
-async def encode_data(request: EncodeRequest):
-    """ترميز البيانات مع إرجاع معلومات إضافية"""
+@app.post("/api/storage/objects/{object_id}/repair")
+async def repair_object(object_id: str):
+    """إعادة بناء الشظايا المفقودة أو التالفة في مكانها"""
     try:
-        start_time = time.time()
-        
-        # تحويل النص إلى بايتات
-        data_bytes = request.data.encode('utf-8')
-        
-        # إنشاء كود Reed-Solomon
-        rsc = RSCodec(request.nsym)
-        
-        # الترميز
-        encoded = rsc.encode(data_bytes)
-        
-        # تحويل إلى base64
-        encoded_b64 = base64.b64encode(encoded).decode('utf-8')
-        
-        # حساب إحصائيات
-        processing_time = (time.time() - start_time) * 1000  # ملي ثانية
-        overhead = ((len(encoded) - len(data_bytes)) / len(data_bytes)) * 100
-        
-        return {
-            "status": "success",
-            "data": {
-                "original": {
-                    "text": request.data,
-                    "length_bytes": len(data_bytes),
-                    "length_bits": len(data_bytes) * 8
-                },
-                "encoded": {
-                    "base64": encoded_b64,
-                    "length_bytes": len(encoded),
-                    "length_bits": len(encoded) * 8
-                },
-                "correction": {
-                    "nsym": request.nsym,
-                    "parity_bytes": request.nsym,
-                    "max_errors_correctable": request.nsym // 2,
-                    "max_erasures_correctable": request.nsym
-                },
-                "efficiency": {
-                    "overhead_percentage": round(overhead, 2),
-                    "overhead_bytes": len(encoded) - len(data_bytes),
-                    "coding_rate": len(data_bytes) / len(encoded)
-                }
-            },
-            "metadata": {
-                "processing_time_ms": round(processing_time, 2),
-                "timestamp": datetime.now().isoformat(),
-                "algorithm": "Reed-Solomon",
-                "field": "GF(256)"
-            },
-            "developer": DEVELOPER_INFO["name"]
-        }
-        
+        result = await codec_pool.run(shard_store.repair, object_id)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "message": f"فشل الترميز: {str(e)}",
-                "developer": DEVELOPER_INFO["name"]
-            }
+        return _storage_error(e)
+    return {"status": "success", **result}
+
+@app.delete("/api/storage/objects/{object_id}")
+async def delete_object(object_id: str):
+    """حذف الكائن وكل شظاياه"""
+    try:
+        await asyncio.to_thread(shard_store.delete, object_id)
+    except Exception as e:
+        return _storage_error(e)
+    return {"status": "success", "object_id": object_id, "deleted": True}
+
+# ===== رفع الملفات =====
+# عدد الكلمات الرمزية في كل كتلة من الملف المرفوع (حوالي 1 ميغابايت بالإعدادات الافتراضية)
+FILE_BLOCK_CODEWORDS = int(os.environ.get("RS_FILE_BLOCK_CODEWORDS", "4096"))
+# المحرك الافتراضي للملفات: المتجه مطابق للمرجعي بايتاً ببايت وأسرع منه بعشرين مرة على الكتل الكبيرة
+FILE_BACKEND = os.environ.get("RS_FILE_BACKEND", "numpy")
+# مجلد ملفات النتائج المؤقتة (الافتراضي مجلد النظام المؤقت)
+SPOOL_DIR = os.environ.get("RS_SPOOL_DIR") or None
+
+def _spool_output() -> str:
+    fd, path = tempfile.mkstemp(dir=SPOOL_DIR, prefix="rs-", suffix=".out")
+    os.close(fd)
+    return path
+
+async def _process_upload(upload: UploadFile, out_path: str, block_size: int, job, *args):
+    """تمرير الملف المرفوع كتلة كتلة إلى المجمع وكتابة النتائج بالترتيب
+
+    الرفع محفوظ على القرص (SpooledTemporaryFile ينقل الصغير منه إلى القرص عند
+    طلب fileno)، فيُربط بالذاكرة وتُقتطع منه كتلة لكل مهمة، ولا يُعالج في آن واحد
+    أكثر من كتلة لكل عامل. يُرجع (حجم الملف، [بقية نتيجة كل كتلة]). الاستثناء من
+    كتلة يحمل إزاحتها في rs_offset.
+    """
+    results = []
+    pending = deque()
+    size = os.fstat(upload.file.fileno()).st_size
+    view = mmap.mmap(upload.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+    try:
+        with open(out_path, "wb") as out:
+            async def drain():
+                offset, task = pending.popleft()
+                try:
+                    result = await task
+                except Exception as e:
+                    e.rs_offset = offset
+                    raise
+                if isinstance(result, tuple):
+                    out.write(result[0])
+                    results.append(result[1:])
+                else:
+                    out.write(result)
+                    results.append(len(result))
+
+            for offset in range(0, size, block_size):
+                task = asyncio.ensure_future(codec_pool.execute(job, view[offset:offset + block_size], *args))
+                pending.append((offset, task))
+                if len(pending) >= codec_pool.workers:
+                    await drain()
+            while pending:
+                await drain()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+        if view is not None:
+            view.close()
+    return size, results
+
+def _file_download(out_path: str, filename: str, headers: dict) -> FileResponse:
+    return FileResponse(
+        out_path,
+        media_type="application/octet-stream",
+        filename=filename,
+        background=BackgroundTask(_remove_quietly, out_path),
+        headers=headers
+    )
+
+@app.post("/api/encode/file")
+async def encode_file(request: Request, file: UploadFile = File(...)):
+    """ترميز ملف مرفوع (multipart/form-data) بأي حجم وإرجاع ملف للتنزيل
+
+    معاملات الكود في الاستعلام أو ترويسات X-RS-* كما في /api/encode/raw. الناتج
+    بتأطير /api/encode/stream نفسه فيُفك بـ /api/decode/file أو /api/decode/stream.
+    """
+    start_time = time.time()
+    try:
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend", FILE_BACKEND)
+        rsc = get_codec(code, backend=backend)
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+    codec_pool.check_capacity()
+
+    codeword_size, parity = _codeword_bytes(rsc)
+    out_path = _spool_output()
+    try:
+        size, lengths = await _process_upload(
+            file, out_path, (codeword_size - parity) * _block_codewords(rsc, FILE_BLOCK_CODEWORDS),
+            _encode_job, code, backend
         )
+    except Exception as e:
+        _remove_quietly(out_path)
+        record_outcome("encode", nsym, "error")
+        return _raw_error(400, f"فشل الترميز: {str(e)}")
+    record_outcome("encode", nsym, "success")
 
-# ===== نقطة نهاية المحاكاة =====
-@app.post("/api/simulate")
-async def simulate_transmission(request: SimulateRequest):
-    """محاكاة متقدمة لقناة الإرسال"""
+    processing_time = (time.time() - start_time) * 1000
+    return _file_download(out_path, f"{file.filename or 'data'}.rs", {
+        **_stream_headers(rsc),
+        "X-RS-Status": "success",
+        "X-RS-Original-Length": str(size),
+        "X-RS-Encoded-Length": str(sum(lengths)),
+        "X-RS-Processing-Time-Ms": f"{processing_time:.2f}"
+    })
+
+@app.post("/api/decode/file")
+async def decode_file(request: Request, file: UploadFile = File(...)):
+    """فك ترميز ملف مرفوع بتأطير rs-codewords-v1 وإرجاع البايتات الأصلية كما هي
+
+    عند كلمة غير قابلة للتصحيح يُرجع 422 مع رقمها من بداية الملف (codeword).
+    """
+    start_time = time.time()
     try:
-        start_time = time.time()
-        
-        # 1. ترميز البيانات
-        data_bytes = request.data.encode('utf-8')
-        rsc = RSCodec(request.nsym)
-        encoded = rsc.encode(data_bytes)
-        
-        # 2. محاكاة القناة حسب النوع
-        corrupted = bytearray(encoded)
-        error_positions = []
-        error_details = []
-        
-        if request.error_type == "random":
-            # أخطاء عشوائية
-            for i in range(len(corrupted)):
-                if np.random.random() < request.error_rate:
-                    original_byte = corrupted[i]
-                    corrupted[i] = np.random.randint(0, 256)
-                    error_positions.append(i)
-                    error_details.append({
-                        "position": i,
-                        "original": format(original_byte, '02x'),
-                        "corrupted": format(corrupted[i], '02x'),
-                        "type": "bit_flip"
-                    })
-        
-        elif request.error_type == "burst":
-            # أخطاء متتالية
-            burst_length = int(len(encoded) * request.error_rate)
-            if burst_length > 0:
-                burst_start = np.random.randint(0, len(encoded) - burst_length)
-                for i in range(burst_start, burst_start + burst_length):
-                    original_byte = corrupted[i]
-                    corrupted[i] = np.random.randint(0, 256)
-                    error_positions.append(i)
-                    error_details.append({
-                        "position": i,
-                        "original": format(original_byte, '02x'),
-                        "corrupted": format(corrupted[i], '02x'),
-                        "type": "burst_error",
-                        "burst_index": i - burst_start
-                    })
-        
-        elif request.error_type == "erasures":
-            # حذف بيانات
-            for i in range(len(corrupted)):
-                if np.random.random() < request.error_rate:
-                    original_byte = corrupted[i]
-                    corrupted[i] = 0  # حذف
-                    error_positions.append(i)
-                    error_details.append({
-                        "position": i,
-                        "original": format(original_byte, '02x'),
-                        "corrupted": "00",
-                        "type": "erasure"
-                    })
-        
-        # 3. محاولة التصحيح
-        try:
-            decoded_bytes, decoded, errors_corrected = rsc.decode(bytes(corrupted))
-            was_successful = True
-            success_rate = (errors_corrected / max(1, len(error_positions))) * 100
-            
-            # التحقق من صحة النتيجة
-            is_correct = decoded_bytes == data_bytes
-            
-        except ReedSolomonError:
-            was_successful = False
-            errors_corrected = 0
-            success_rate = 0
-            is_correct = False
-            decoded_bytes = b""
-            decoded = b""
-        
-        # 4. إحصائيات المحاكاة
-        processing_time = (time.time() - start_time) * 1000
-        
-        # تحليل القناة
-        channel_analysis = {
-            "type": request.channel_type,
-            "error_rate_actual": len(error_positions) / len(encoded),
-            "error_distribution": {
-                "total": len(error_positions),
-                "density": len(error_positions) / len(encoded),
-                "positions": error_positions[:20]  # أول 20 موقع فقط
+        code = _raw_code(request)
+        nsym = code.nsym
+        backend = _raw_param(request, "backend", FILE_BACKEND)
+        rsc = get_codec(code, backend=backend)
+    except ValueError as e:
+        return _raw_error(400, f"معامل غير صالح: {str(e)}")
+    codec_pool.check_capacity()
+
+    codeword_size = _codeword_bytes(rsc)[0]
+    block_codewords = _block_codewords(rsc, FILE_BLOCK_CODEWORDS)
+    out_path = _spool_output()
+    try:
+        _, blocks = await _process_upload(
+            file, out_path, codeword_size * block_codewords, _block_decode_job, code, backend
+        )
+    except ReedSolomonError as e:
+        _remove_quietly(out_path)
+        record_outcome("decode", nsym, "uncorrectable")
+        return _raw_error(
+            422, "عدد الأخطاء يتجاوز قدرة التصحيح", code="RS_UNCORRECTABLE",
+            max_correctable=nsym // 2,
+            codeword=e.rs_offset // codeword_size + e.rs_codeword
+        )
+    except Exception as e:
+        _remove_quietly(out_path)
+        record_outcome("decode", nsym, "error")
+        return _raw_error(400, f"فشل فك الترميز: {str(e)}")
+    errors_corrected = sum(errors for errors, _ in blocks)
+    # مسار الملف أثقل مسارات كتله، كما لو فُك دفعة واحدة
+    decode_path = max((path for _, path in blocks), key=DECODE_PATHS.index, default=DECODE_PATHS[0])
+    record_outcome("decode", nsym, "corrected" if errors_corrected else "clean", decode_path)
+
+    name = file.filename or "data"
+    processing_time = (time.time() - start_time) * 1000
+    return _file_download(out_path, name[:-3] if name.endswith(".rs") and len(name) > 3 else f"{name}.out", {
+        **_stream_headers(rsc),
+        "X-RS-Status": "success",
+        "X-RS-Errors-Corrected": str(errors_corrected),
+        "X-RS-Was-Corrupted": "true" if errors_corrected > 0 else "false",
+        "X-RS-Decode-Path": decode_path,
+        "X-RS-Decoded-Length": str(os.path.getsize(out_path)),
+        "X-RS-Processing-Time-Ms": f"{processing_time:.2f}"
+    })
+
+# ===== المهام غير المتزامنة =====
+# عدد المهام التي تعمل في آن واحد (البقية تنتظر في الطابور) والحد الأقصى للمهام المحفوظة
+JOB_WORKERS = int(os.environ.get("RS_JOB_WORKERS", "2"))
+MAX_JOBS = int(os.environ.get("RS_MAX_JOBS", "64"))
+# مدة الاحتفاظ بنتيجة المهمة المنتهية، ومهلة إلغاء المهمة الجارية التي توقف العميل عن متابعتها (بالثواني)
+JOB_RESULT_TTL = float(os.environ.get("RS_JOB_RESULT_TTL", "600"))
+JOB_ABANDON_AFTER = float(os.environ.get("RS_JOB_ABANDON_AFTER", "60"))
+# عدد الكلمات الرمزية في كل جزء من مهام الترميز والمحاكاة: التقدم والإلغاء يحدثان بين الأجزاء
+JOB_CHUNK_CODEWORDS = int(os.environ.get("RS_JOB_CHUNK_CODEWORDS", "1024"))
+
+JOB_ACTIVE = ("queued", "running")
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+class Job:
+    """مهمة خلفية واحدة: الحالة والتقدم والنتيجة الجزئية ثم النهائية"""
+
+    def __init__(self, kind: str, total: int, unit: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.total = total
+        self.unit = unit
+        self.completed = 0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.cancel_reason = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.last_seen = time.monotonic()
+        self.task = None
+
+    def advance(self, amount: int, partial=None):
+        self.completed += amount
+        if partial is not None:
+            self.partial = partial
+
+    @property
+    def expires(self) -> Optional[float]:
+        return self.finished + JOB_RESULT_TTL if self.finished else None
+
+    def snapshot(self, include_result: bool = True) -> dict:
+        snapshot = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {
+                "completed": self.completed,
+                "total": self.total,
+                "unit": self.unit,
+                "fraction": round(self.completed / self.total, 4) if self.total else 1.0
             },
-            "noise_level": request.error_rate * 100
+            "created_at": _isoformat(self.created),
+            "started_at": _isoformat(self.started),
+            "finished_at": _isoformat(self.finished),
+            "expires_at": _isoformat(self.expires),
+            "links": {"self": f"/api/jobs/{self.id}"}
         }
-        
-        return {
-            "status": "success" if was_successful else "partial",
-            "simulation": {
-                "summary": {
-                    "was_successful": was_successful,
-                    "data_recovered": is_correct,
-                    "success_rate": round(success_rate, 2),
-                    "errors_introduced": len(error_positions),
-                    "errors_corrected": errors_corrected,
-                    "errors_remaining": len(error_positions) - errors_corrected,
-                    "max_correctable": request.nsym // 2
-                },
-                "transmission": {
-                    "original_size": len(data_bytes),
-                    "encoded_size": len(encoded),
-                    "channel_type": request.channel_type,
-                    "error_type": request.error_type,
-                    "error_rate_requested": request.error_rate,
-                    "error_rate_actual": len(error_positions) / len(encoded)
-                },
-                "performance": {
-                    "processing_time_ms": round(processing_time, 2),
-                    "bytes_processed": len(encoded),
-                    "throughput_bps": len(encoded) * 8 / (processing_time / 1000) if processing_time > 0 else 0
-                }
-            },
-            "analysis": {
-                "channel": channel_analysis,
-                "correction": {
-                    "capacity_utilization": errors_corrected / (request.nsym // 2),
-                    "efficiency": errors_corrected / max(1, len(error_positions))
+        if self.cancel_reason:
+            snapshot["cancel_reason"] = self.cancel_reason
+        if self.error:
+            snapshot["error"] = self.error
+        if include_result:
+            if self.result is not None:
+                snapshot["result"] = self.result
+            elif self.partial is not None:
+                snapshot["partial"] = self.partial
+        return snapshot
+
+class JobManager:
+    """تشغيل المهام الطويلة في الخلفية بعدد محدود مع انتهاء صلاحية النتائج
+
+    كل مهمة مهمة asyncio تنتظر واحداً من JOB_WORKERS مقعداً، ثم تُرسل أجزاءها
+    إلى مجمع العمال بنافذة لا تتجاوز حصتها من العمال حتى تبقى الطلبات التفاعلية
+    قادرة على الوصول إليه. المهمة الجارية التي لم يستعلم عنها العميل خلال
+    JOB_ABANDON_AFTER ثانية تُلغى، والنتائج المنتهية تُحذف بعد JOB_RESULT_TTL.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_jobs: int = MAX_JOBS):
+        self.workers = max(1, workers)
+        self.max_jobs = max(1, max_jobs)
+        self._jobs = OrderedDict()
+        self._slots = None
+        self.counts = {"submitted": 0, "succeeded": 0, "failed": 0, "cancelled": 0,
+                       "abandoned": 0, "expired": 0, "rejected": 0}
+
+    @property
+    def window(self) -> int:
+        """عدد أجزاء المهمة الواحدة المرسلة إلى المجمع في آن واحد"""
+        return max(1, codec_pool.workers // self.workers)
+
+    def submit(self, kind: str, runner, total: int, unit: str) -> Job:
+        """تسجيل مهمة جديدة؛ runner(job) دالة غير متزامنة تُرجع النتيجة النهائية"""
+        self.reap()
+        if len(self._jobs) >= self.max_jobs:
+            self.counts["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "status": "error",
+                    "message": "عدد المهام بلغ الحد الأقصى، حاول لاحقاً",
+                    "developer": DEVELOPER_INFO["name"]
                 },
-                "errors": error_details[:10]  # أول 10 أخطاء فقط
-            },
-            "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "algorithm": "Reed-Solomon",
-                "parameters": {
-                    "nsym": request.nsym,
-                    "block_size": len(encoded)
-                }
-            },
-            "developer": DEVELOPER_INFO["name"]
+                headers={"Retry-After": "5"}
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        job = Job(kind, total, unit)
+        self._jobs[job.id] = job
+        self.counts["submitted"] += 1
+        job.task = asyncio.ensure_future(self._run(job, runner))
+        job.task.add_done_callback(functools.partial(self._settle, job))
+        return job
+
+    async def _run(self, job: Job, runner):
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started = time.time()
+                result = await runner(job)
+            job.result, job.partial = result, None
+            job.completed = job.total
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = e.detail.get("message") if isinstance(e.detail, dict) else str(e.detail)
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        job.finished = time.time()
+        self.counts[job.status] += 1
+
+    def _settle(self, job: Job, task):
+        if job.finished is None:
+            # أُلغيت قبل أن تبدأ فلم يُنفذ جسم _run
+            job.status = "cancelled"
+            job.finished = time.time()
+            self.counts["cancelled"] += 1
+        job.task = None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """المهمة إن وُجدت، مع تسجيل الاستعلام حتى لا تُعد متروكة"""
+        self.reap()
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.last_seen = time.monotonic()
+        return job
+
+    def jobs(self) -> list:
+        self.reap()
+        return list(self._jobs.values())
+
+    def cancel(self, job: Job, reason: str = "client") -> bool:
+        """إلغاء مهمة جارية أو منتظرة؛ الأجزاء المرسلة إلى العمال تكتمل وتُهمل نتائجها"""
+        if job.status not in JOB_ACTIVE or job.task is None:
+            return False
+        job.cancel_reason = reason
+        job.task.cancel()
+        return True
+
+    def remove(self, job_id: str):
+        self._jobs.pop(job_id, None)
+
+    def reap(self):
+        """حذف النتائج المنتهية الصلاحية وإلغاء المهام المتروكة"""
+        now, wall = time.monotonic(), time.time()
+        for job in list(self._jobs.values()):
+            if job.status in JOB_ACTIVE:
+                if now - job.last_seen > JOB_ABANDON_AFTER and self.cancel(job, "abandoned"):
+                    self.counts["abandoned"] += 1
+            elif job.expires is not None and wall >= job.expires:
+                del self._jobs[job.id]
+                self.counts["expired"] += 1
+
+    async def reap_periodically(self):
+        interval = min(30.0, max(0.5, min(JOB_ABANDON_AFTER, JOB_RESULT_TTL) / 2))
+        while True:
+            await asyncio.sleep(interval)
+            self.reap()
+
+    async def shutdown(self):
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        states = {}
+        for job in self._jobs.values():
+            states[job.status] = states.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+            "window": self.window,
+            "result_ttl_seconds": JOB_RESULT_TTL,
+            "abandon_after_seconds": JOB_ABANDON_AFTER,
+            "jobs": len(self._jobs),
+            "by_status": states,
+            **self.counts
         }
-        
+
+job_manager = JobManager()
+
+async def _run_windowed(job: Job, calls, on_result=None):
+    """تنفيذ (دالة، وسائط، وزن) في المجمع بنافذة job_manager.window وبالترتيب
+
+    on_result(result) يُستدعى لكل نتيجة بترتيب الإرسال ويُرجع النتيجة الجزئية
+    الجديدة (أو None)؛ التقدم يزيد بالوزن بعد كل نتيجة.
+    """
+    pending = deque()
+    window = job_manager.window
+    try:
+        async def drain():
+            weight, task = pending.popleft()
+            result = await task
+            job.advance(weight, on_result(result) if on_result else None)
+
+        for fn, args, weight in calls:
+            pending.append((weight, asyncio.ensure_future(codec_pool.execute(fn, *args))))
+            if len(pending) >= window:
+                await drain()
+        while pending:
+            await drain()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+def _submitted(job: Job) -> JSONResponse:
+    return FastJSONResponse(
+        job.snapshot(include_result=False),
+        status_code=202,
+        headers={"Location": f"/api/jobs/{job.id}"}
+    )
+
+def _job_error(status_code: int, message: str):
+    return HTTPException(
+        status_code=status_code,
+        detail={"status": "error", "message": message, "developer": DEVELOPER_INFO["name"]}
+    )
+
+def _job_chunks(rsc, data_bytes: bytes, interleave: int = 1) -> list:
+    """تقسيم الرسالة إلى أجزاء من JOB_CHUNK_CODEWORDS كلمة رمزية
+
+    الأجزاء بطول مضاعفات بيانات الكلمة فيتطابق ترميزها المجمّع مع ترميز الرسالة
+    دفعة واحدة. التشابك يوزع الرسالة كلها على الكلمات فلا تُجزأ.
+    """
+    if interleave > 1:
+        return [data_bytes]
+    size, parity = _codeword_bytes(rsc)
+    step = (size - parity) * _block_codewords(rsc, JOB_CHUNK_CODEWORDS)
+    return [data_bytes[i:i + step] for i in range(0, len(data_bytes), step)] or [data_bytes]
+
+@app.post("/api/jobs/encode", status_code=202)
+async def submit_encode_job(request: EncodeRequest):
+    """ترميز طويل في الخلفية: الرسالة تُقسم إلى أجزاء بحدود الكلمات الرمزية
+
+    النتيجة الجزئية عدد البايتات المرمزة حتى الآن، والنهائية مطابقة لـ /api/encode.
+    """
+    try:
+        data_bytes = request.data.encode('utf-8')
+        code = request.code()
+        chunks = _job_chunks(get_codec(code, backend=request.backend), data_bytes, request.interleave)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "message": f"فشل المحاكاة: {str(e)}",
-                "developer": DEVELOPER_INFO["name"]
-            }
-        )
+        raise _job_error(400, f"فشل الترميز: {str(e)}")
 
-# ===== نقطة نهاية فك الترميز =====
-@app.post("/api/decode")
-async def decode_data(request: DecodeRequest):
-    """فك الترميز مع خيارات متقدمة"""
+    async def runner(job: Job):
+        start_time = time.time()
+        parts = []
+
+        def collect(encoded: bytes):
+            parts.append(encoded)
+            return {"encoded_bytes": sum(map(len, parts)), "chunks_done": len(parts)}
+
+        await _run_windowed(job, (
+            (_encode_job, (chunk, code, request.backend, request.interleave), len(chunk))
+            for chunk in chunks
+        ), collect)
+        encoded = b"".join(parts)
+        record_outcome("encode", code.nsym, "success")
+        return _encode_report(request, code, data_bytes, encoded, (time.time() - start_time) * 1000)
+
+    return _submitted(job_manager.submit("encode", runner, len(data_bytes), "bytes"))
+
+@app.post("/api/jobs/simulate", status_code=202)
+async def submit_simulate_job(request: SimulateRequest):
+    """محاكاة في الخلفية؛ النتيجة مطابقة لـ /api/simulate
+
+    الرسالة تُرمز في أجزاء كما في /api/jobs/encode، ثم تمر كاملة عبر القناة
+    (خطوة متجهة واحدة ببذرة الطلب)، ثم يُصحح كل جزء مرمز وحده. التقدم يعد كل
+    كلمة رمزية مرتين، عند ترميزها وعند تصحيحها، والإلغاء يحدث بين الأجزاء. النتيجة
+    الجزئية المرحلة والأخطاء المصححة حتى الآن؛ أول جزء يتعذر تصحيحه يُفشل الرسالة
+    كلها فلا تُرسل الأجزاء التالية.
+    """
     try:
+        data_bytes = request.data.encode('utf-8')
+        code = request.code()
+        chunks = _job_chunks(get_codec(code, backend=request.backend), data_bytes, request.interleave)
+        weights = [_codeword_count(code, len(chunk), request.interleave) for chunk in chunks]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _job_error(400, f"فشل المحاكاة: {str(e)}")
+
+    async def runner(job: Job):
         start_time = time.time()
-        
-        # تحويل base64 إلى بايتات
-        encoded_bytes = base64.b64decode(request.encoded_data)
-        
-        # إنشاء الكود
-        rsc = RSCodec(request.nsym)
-        
-        # فك الترميز
-        if request.erasures:
-            decoded_bytes, decoded, errors_corrected = rsc.decode(encoded_bytes, erase_pos=request.erasures)
-        else:
-            decoded_bytes, decoded, errors_corrected = rsc.decode(encoded_bytes)
-        
-        # تحويل البايتات إلى نص
-        decoded_text = decoded.decode('utf-8', errors='ignore')
-        
-        processing_time = (time.time() - start_time) * 1000
-        
-        return {
-            "status": "success",
-            "data": {
-                "decoded": {
-                    "text": decoded_text,
-                    "bytes_base64": base64.b64encode(decoded_bytes).decode('utf-8'),
-                    "length": len(decoded_bytes)
-                },
-                "correction": {
-                    "errors_corrected": errors_corrected,
-                    "was_corrupted": errors_corrected > 0,
-                    "erasures_provided": len(request.erasures) if request.erasures else 0
-                }
-            },
-            "metadata": {
-                "processing_time_ms": round(processing_time, 2),
-                "timestamp": datetime.now().isoformat()
-            },
-            "developer": DEVELOPER_INFO["name"]
-        }
-        
-    except ReedSolomonError as e:
-        return {
-            "status": "uncorrectable",
-            "error": {
-                "code": "RS_UNCORRECTABLE",
-                "message": "عدد الأخطاء يتجاوز قدرة التصحيح",
-                "max_correctable": request.nsym // 2
-            },
-            "developer": DEVELOPER_INFO["name"]
-        }
+        parts = []
+
+        def collect_encoded(encoded: bytes):
+            parts.append(encoded)
+            return {"stage": "encode", "encoded_bytes": sum(map(len, parts)), "chunks_done": len(parts)}
+
+        await _run_windowed(job, (
+            (_encode_job, (chunk, code, request.backend, request.interleave), weight)
+            for chunk, weight in zip(chunks, weights)
+        ), collect_encoded)
+        channel = await codec_pool.execute(
+            _channel_job, b"".join(parts), code, request.error_rate, request.error_type,
+            request.backend, request.seed
+        )
+
+        # حدود الأجزاء في التدفق التالف هي حدود أجزائه المرمزة
+        stream = channel.corrupted.tobytes()
+        positions = channel.error_positions if request.error_type == "erasures" else None
+        bounds = list(itertools.accumulate(map(len, parts), initial=0))
+        decoded_parts = []
+        state = {"errors_corrected": 0, "decode_path": DECODE_PATHS[0], "failed": False}
+
+        def calls():
+            for begin, end, weight in zip(bounds, bounds[1:], weights):
+                if state["failed"]:
+                    return
+                erasures = None
+                if positions is not None:
+                    erasures = (positions[(positions >= begin) & (positions < end)] - begin).tolist()
+                yield (_simulate_decode_job,
+                       (stream[begin:end], code, erasures, request.backend, request.interleave), weight)
+
+        def collect_decoded(decoded):
+            if decoded is None:
+                state["failed"] = True
+            elif not state["failed"]:
+                decoded_parts.append(decoded[0])
+                state["errors_corrected"] += decoded[1]
+                # مسار الرسالة أثقل مسارات أجزائها، كما لو فُكت دفعة واحدة
+                state["decode_path"] = max(state["decode_path"], decoded[2], key=DECODE_PATHS.index)
+            return {
+                "stage": "decode",
+                "errors_introduced": channel.error_count,
+                "errors_corrected": state["errors_corrected"],
+                "chunks_done": len(decoded_parts),
+                "chunks_total": len(parts),
+                "uncorrectable": state["failed"]
+            }
+
+        await _run_windowed(job, calls(), collect_decoded)
+        decoded = None
+        if not state["failed"]:
+            decoded = (b"".join(decoded_parts), state["errors_corrected"], state["decode_path"])
+        result = _simulation_result(channel, decoded, data_bytes, request.error_type)
+        return _simulation_report(request, code, data_bytes, result, (time.time() - start_time) * 1000)
+
+    return _submitted(job_manager.submit("simulate", runner, 2 * sum(weights), "codewords"))
+
+@app.post("/api/jobs/sweep", status_code=202)
+async def submit_sweep_job(request: SweepRequest):
+    """مسح مونت كارلو في الخلفية؛ النتيجة الجزئية هي النقاط المكتملة حتى الآن
+
+    المهام الفرعية نفسها ببذورها نفسها كما في /api/simulate/sweep، فالنتيجة النهائية مطابقة.
+    """
+    try:
+        plan = _plan_sweep(request)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "message": f"فشل فك الترميز: {str(e)}",
-                "developer": DEVELOPER_INFO["name"]
+        raise _job_error(400, f"فشل المسح: {str(e)}")
+
+    async def runner(job: Job):
+        start_time = time.time()
+        remaining = {}
+        for point, _ in plan.subtasks:
+            remaining[point] = remaining.get(point, 0) + 1
+        owners = iter(point for point, _ in plan.subtasks)
+        by_point, points = {}, []
+
+        def collect(part: dict):
+            # المهام الفرعية مرتبة حسب النقطة، فتكتمل النقاط بترتيب الشبكة
+            point = next(owners)
+            by_point.setdefault(point, []).append(part)
+            if len(by_point[point]) == remaining[point]:
+                points.append(_aggregate_sweep(*point, by_point.pop(point), plan.z))
+                return {"points": list(points)}
+            return None
+
+        await _run_windowed(job, (
+            (_sweep_trials_job, args, args[4]) for _, args in plan.subtasks
+        ), collect)
+        return _sweep_report(request, plan, points, (time.time() - start_time) * 1000)
+
+    return _submitted(job_manager.submit("sweep", runner, len(plan.grid) * request.trials, "trials"))
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """كل المهام المحفوظة دون نتائجها"""
+    return {
+        "status": "success",
+        "jobs": [job.snapshot(include_result=False) for job in job_manager.jobs()],
+        "stats": job_manager.stats()
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """حالة المهمة وتقدمها؛ مع النتيجة الجزئية أثناء التشغيل والنهائية بعد النجاح
+
+    الاستعلام يُبقي المهمة حية: المهمة التي لا يُستعلم عنها تُلغى كمتروكة.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise _job_error(404, "المهمة غير موجودة أو انتهت صلاحية نتيجتها")
+    return _json(job.snapshot())
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """إلغاء المهمة الجارية أو المنتظرة، أو حذف المهمة المنتهية ونتيجتها"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise _job_error(404, "المهمة غير موجودة أو انتهت صلاحية نتيجتها")
+    task = job.task
+    if job_manager.cancel(job):
+        await asyncio.gather(task, return_exceptions=True)
+        return {"status": "success", "deleted": False, "job": job.snapshot(include_result=False)}
+    job_manager.remove(job_id)
+    return {"status": "success", "deleted": True, "job": job.snapshot(include_result=False)}
+
+# ===== نقطة نهاية ملفات تعريف الأكواد =====
+@app.get("/api/profiles")
+async def list_profiles():
+    """ملفات تعريف الأكواد المسماة؛ تُستخدم بـ profile في أي طلب ترميز أو فك ترميز"""
+    return {
+        "profiles": {
+            name: {
+                "description": profile["description"],
+                **describe_code(profile["code"], name),
+                "max_errors_correctable": profile["code"].nsym // 2
             }
-        )
+            for name, profile in CODE_PROFILES.items()
+        },
+        "parameters": ["profile", "nsym", "nsize", "fcr", "prim", "generator", "c_exp"]
+    }
+
+# ===== نقطة نهاية المقاييس =====
+@app.get("/metrics")
+async def metrics():
+    """مقاييس Prometheus: مدرجات المراحل وعدادات النتائج ومقاييس مجمع العمال"""
+    return Response(content=render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # ===== نقطة نهاية قدرات النظام =====
 @app.get("/api/capabilities")
@@ -423,15 +3354,20 @@ async def get_capabilities():
                 "combined": "2t + e ≤ n-k"
             },
             "parameters": {
-                "field": "GF(256)",
-                "symbol_size": "8 bits",
-                "block_length": "n ≤ 255",
+                "field": "GF(256) أو GF(65536) عبر c_exp=16",
+                "symbol_size": "8 bits (c_exp=8) أو 16 bits كبايتين big-endian (c_exp=16)",
+                "block_length": "n ≤ 255 (c_exp=8) أو n ≤ 65535 (c_exp=16)",
                 "data_length": "k ≤ n"
             },
+            "backends": {
+                "available": list(CODEC_BACKENDS),
+                "default": DEFAULT_BACKEND
+            },
             "performance": {
-                "encoding_speed": "O(n log n)",
-                "decoding_speed": "O(n log n)",
-                "memory_usage": "O(n)"
+                "encoding_complexity": "O(k · nsym) لكل كلمة رمزية",
+                "decoding_complexity": "O(n · nsym) للمتلازمات + O(nsym²) للتصحيح لكل كلمة تالفة",
+                "memory_usage": "O(n)",
+                "measured": "/api/performance"
             }
         },
         "applications": [
@@ -447,26 +3383,50 @@ async def get_capabilities():
 # ===== نقطة نهاية تحليل الأداء =====
 @app.get("/api/performance")
 async def get_performance_analysis():
-    """تحليل أداء النظام"""
+    """تحليل أداء النظام من أرقام مقاسة: آخر تشغيل لـ benchmark.py والحركة الحية"""
+    try:
+        document = load_benchmark_results()
+    except (OSError, ValueError) as e:
+        document = None
+        benchmark_error = str(e)
+    else:
+        benchmark_error = None
+
+    if document:
+        benchmarks = {
+            "available": True,
+            "source": os.path.basename(BENCHMARK_RESULTS),
+            "environment": document.get("environment"),
+            "summary": summarize_benchmarks(document),
+            "regressions": document.get("comparison", {}).get("regressions"),
+            "results": document.get("results", [])
+        }
+    else:
+        benchmarks = {
+            "available": False,
+            "message": benchmark_error or "لا توجد نتائج قياس بعد، شغّل: python benchmark.py"
+        }
+
     return {
         "performance": {
-            "encoding_speed": "عالية",
-            "decoding_speed": "عالية",
-            "memory_efficiency": "ممتازة",
-            "scalability": "عالية",
-            "reliability": "ممتازة"
-        },
-        "benchmarks": {
-            "small_data": "1-10ms",
-            "medium_data": "10-50ms",
-            "large_data": "50-200ms"
+            "live": live_latency.summary(),
+            "window_size": live_latency.window
         },
+        "benchmarks": benchmarks,
         "optimizations": [
-            "استخدام مكتبات محسنة",
-            "معالجة متوازية",
-            "تخزين مؤقت",
-            "ضغط البيانات"
-        ]
+            "سجل مرمزات مشترك مع إخلاء LRU",
+            "محرك NumPy متجه لحساب التكافؤ والمتلازمات",
+            "مجمع عمال خارج حلقة الأحداث مع ضغط عكسي",
+            "نقاط نهاية للدفعات والبيانات الثنائية والتدفق",
+            "جداول GF(256) وكثيرات حدود مولدة محسوبة مسبقاً ومربوطة بالذاكرة",
+            "ذاكرة نتائج بعنوان المحتوى لفك الترميز والمحاكاة المكررين",
+            "مهام خلفية محدودة العدد مع التقدم والإلغاء وانتهاء صلاحية النتائج"
+        ],
+        "gf_tables": gf_tables.info() if gf_tables else None,
+        "worker_pool": codec_pool.stats(),
+        "codec_cache": codec_registry.stats(),
+        "result_cache": result_cache.stats(),
+        "jobs": job_manager.stats()
     }
 
 # ===== نقطة نهاية أمثلة الاستخدام =====
@@ -480,7 +3440,8 @@ async def get_examples():
                 "description": "ترميز رسالة نصية قصيرة",
                 "data": "مرحبا بك في نظام Reed-Solomon",
                 "nsym": 8,
-                "error_rate": 0.1
+                "error_rate": 0.1,
+                "seed": 1
             },
             {
                 "name": "محاكاة قناة لاسلكية",
@@ -488,7 +3449,8 @@ async def get_examples():
                 "data": "هذا نص تجريبي لنقل البيانات اللاسلكية",
                 "nsym": 12,
                 "error_rate": 0.2,
-                "error_type": "random"
+                "error_type": "random",
+                "seed": 2
             },
             {
                 "name": "تصحيح أخطاء متتالية",
@@ -496,9 +3458,11 @@ async def get_examples():
                 "data": "اختبار أخطاء متتالية في نقل البيانات",
                 "nsym": 16,
                 "error_rate": 0.3,
-                "error_type": "burst"
+                "error_type": "burst",
+                "seed": 3
             }
         ],
+        "note": "البذرة تجعل المحاكاة حتمية فتُخدم إعادة تشغيل المثال نفسه من ذاكرة النتائج",
         "developer": DEVELOPER_INFO["name"]
     }
 
@@ -566,8 +3530,21 @@ async def get_versions():
     }
 
 # ===== تشغيل السيرفر =====
+def _server_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="تشغيل سيرفر Reed-Solomon API")
+    parser.add_argument("--host", default=os.environ.get("RS_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("RS_PORT", "8000")))
+    parser.add_argument("--production", action="store_true",
+                        help="عدة عمليات بعدد الأنوية، دون إعادة تحميل ولا سجل وصول")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("RS_SERVER_WORKERS", "0")),
+                        help="عدد عمليات السيرفر (0 = عدد الأنوية في الوضع الإنتاجي)")
+    parser.add_argument("--backlog", type=int, default=2048)
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
     import uvicorn
+    args = _server_args()
     print("=" * 50)
     print("🚀 تشغيل سيرفر Reed-Solomon API")
     print("=" * 50)
@@ -580,11 +3557,22 @@ if __name__ == "__main__":
     print("- الوثائق: /api/docs")
     print("- الواجهة: /api/redoc")
     print("=" * 50)
-    
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    if not args.production:
+        uvicorn.run("app:app", app_dir=app_dir, host=args.host, port=args.port,
+                    reload=True, log_level="info")
+    else:
+        # عمليات مستقلة تماماً (shared-nothing): لكل عملية سجل مرمزاتها وذاكرة نتائجها
+        # ومقاييسها. ملف الجداول بُني عند استيراد هذا الملف قبل إنشاء العمليات، فكل
+        # عامل يربطه بالذاكرة جاهزاً وتتشارك العمليات صفحاته.
+        workers = args.workers or os.cpu_count() or 1
+        # خيوط مجمع الترميز لكل عملية: الأنوية مقسومة على العمليات بدل أن تطلب كل عملية كل الأنوية
+        os.environ.setdefault("RS_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+        if gf_tables is not None:
+            os.environ.setdefault("RS_GF_TABLES", gf_tables.path)
+        print(f"الوضع الإنتاجي: {workers} عملية × {os.environ['RS_WORKERS']} خيط ترميز")
+        print(f"جداول GF: {gf_tables.path if gf_tables else 'تُحسب في الذاكرة'}")
+        uvicorn.run("app:app", app_dir=app_dir, host=args.host, port=args.port,
+                    workers=workers, backlog=args.backlog, access_log=False,
+                    log_level="warning", timeout_keep_alive=30)
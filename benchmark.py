@@ -0,0 +1,248 @@
+"""قياس أداء الترميز وفك الترميز
+
+يقيس الإنتاجية ومئينات زمن الاستجابة عبر أحجام البيانات وقيم nsym وحِمل
+الأخطاء والمحركات، ويكتب النتائج بصيغة JSON، ويقارنها بخط أساس محفوظ لاكتشاف
+التراجع في الأداء.
+
+أمثلة:
+    python benchmark.py                              # القياس الكامل وكتابة benchmark_results.json
+    python benchmark.py --quick                      # قياس سريع
+    python benchmark.py --save-baseline              # حفظ النتائج كخط أساس
+    python benchmark.py --baseline benchmark_baseline.json --threshold 0.2
+    python benchmark.py --wide                       # مقارنة GF(2^16) بالتقطيع إلى كلمات GF(256)
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from reedsolo import ReedSolomonError
+
+from app import CODEC_BACKENDS, BENCHMARK_RESULTS
+from rs_engine import NumpyRSCodec, WideRSCodec
+
+DEFAULT_RESULTS = BENCHMARK_RESULTS
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+def _csv(cast):
+    return lambda text: [cast(v) for v in text.split(",") if v]
+
+
+def percentile_summary(samples_ms, payload_bytes):
+    """مئينات زمن الاستجابة والإنتاجية من عينات بالملي ثانية"""
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    median = float(np.median(samples))
+    return {
+        "samples": len(samples),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(median, 4),
+        "p90_ms": round(float(np.percentile(samples, 90)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "throughput_mbps": round(payload_bytes / (median / 1000) / 1e6, 4) if median > 0 else 0.0
+    }
+
+
+def inject_errors(encoded: bytes, nsym: int, nsize: int, load: float, rng) -> bytes:
+    """إدخال floor(load × nsym/2) خطأ في كل كلمة رمزية (ضمن قدرة التصحيح)"""
+    corrupted = np.frombuffer(encoded, dtype=np.uint8).copy()
+    per_codeword = int(load * (nsym // 2))
+    if per_codeword <= 0:
+        return corrupted.tobytes()
+    for start in range(0, len(corrupted), nsize):
+        length = min(nsize, len(corrupted) - start)
+        positions = rng.choice(length, size=min(per_codeword, length), replace=False) + start
+        corrupted[positions] ^= rng.integers(1, 256, size=len(positions), dtype=np.uint8)
+    return corrupted.tobytes()
+
+
+def time_call(fn, repeat: int, min_time: float):
+    """تكرار الاستدعاء حتى repeat مرة على الأقل أو min_time ثانية"""
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < repeat or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        if len(samples) >= repeat * 20:
+            break
+    return samples
+
+
+def run_benchmarks(backends, sizes, nsyms, loads, repeat, min_time, seed=0, log=print):
+    rng = np.random.default_rng(seed)
+    results = []
+    for backend in backends:
+        for nsym in nsyms:
+            codec = CODEC_BACKENDS[backend](nsym)
+            for size in sizes:
+                data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+                encoded = bytes(codec.encode(data))
+                # تسخين: بناء المصفوفات المؤجلة قبل القياس
+                codec.decode(encoded)
+
+                stats = percentile_summary(time_call(lambda: codec.encode(data), repeat, min_time), size)
+                results.append({"backend": backend, "operation": "encode", "size": size,
+                                 "nsym": nsym, "error_load": 0.0, **stats})
+                log(f"{backend:9s} encode nsym={nsym:<3d} size={size:<8d} "
+                    f"p50={stats['p50_ms']:.3f}ms {stats['throughput_mbps']:.2f}MB/s")
+
+                for load in loads:
+                    corrupted = inject_errors(encoded, nsym, codec.nsize, load, rng)
+
+                    def decode():
+                        try:
+                            codec.decode(corrupted)
+                        except ReedSolomonError:
+                            pass
+
+                    stats = percentile_summary(time_call(decode, repeat, min_time), len(encoded))
+                    results.append({"backend": backend, "operation": "decode", "size": size,
+                                    "nsym": nsym, "error_load": load, **stats})
+                    log(f"{backend:9s} decode nsym={nsym:<3d} size={size:<8d} load={load:<4} "
+                        f"p50={stats['p50_ms']:.3f}ms {stats['throughput_mbps']:.2f}MB/s")
+    return results
+
+
+def run_wide_comparison(sizes, wide_nsyms, narrow_nsym, load, repeat, min_time, seed=0, log=print):
+    """GF(2^16) بكلمات 65535 رمزاً مقابل تقطيع GF(256) إلى كلمات 255 بايتاً
+
+    لكل حجم: إنتاجية الترميز وفك الترميز بحِمل أخطاء load من قدرة كل كلمة، وعدد
+    الكلمات (أي استدعاءات المصحح حين تكون كل الكلمات تالفة)، ونسبة التكافؤ، وأطول
+    انفجار أخطاء متصل يُصحح أينما وقع.
+    """
+    rng = np.random.default_rng(seed)
+    codecs = [("gf256", NumpyRSCodec(narrow_nsym))] + [("gf65536", WideRSCodec(n)) for n in wide_nsyms]
+    results = []
+    for field, codec in codecs:
+        width = codec.symbol_bytes
+        codeword_bytes = codec.nsize * width
+        # التقطيع بالبايت: انفجار بطول nsym/2 قد يعبر حد كلمتين فيُضمن نصف القدرة فقط
+        burst = codec.nsym // 2 if width == 1 else codec.nsym - 1
+        for size in sizes:
+            data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+            encoded = bytes(codec.encode(data))
+            corrupted = inject_errors(encoded, codec.nsym, codeword_bytes, load, rng)
+            codec.decode(corrupted)
+
+            row = {"field": field, "nsym": codec.nsym, "nsize": codec.nsize, "size": size,
+                   "codewords": -(-len(encoded) // codeword_bytes),
+                   "overhead_percent": round((len(encoded) / size - 1) * 100, 3),
+                   "burst_bytes_correctable": burst, "error_load": load}
+            for operation, fn, payload in (("encode", lambda: codec.encode(data), size),
+                                           ("decode", lambda: codec.decode(corrupted), len(encoded))):
+                stats = percentile_summary(time_call(fn, repeat, min_time), payload)
+                results.append({**row, "operation": operation, **stats})
+                log(f"{field:8s} {operation} nsym={codec.nsym:<4d} size={size:<8d} "
+                    f"codewords={row['codewords']:<6d} overhead={row['overhead_percent']:.2f}% "
+                    f"p50={stats['p50_ms']:.2f}ms {stats['throughput_mbps']:.2f}MB/s")
+    return results
+
+
+def result_key(row):
+    return (row["backend"], row["operation"], row["size"], row["nsym"], row["error_load"])
+
+
+def compare(results, baseline, threshold):
+    """مقارنة الإنتاجية بخط الأساس؛ التراجع هو انخفاض يتجاوز threshold"""
+    base = {result_key(row): row for row in baseline["results"]}
+    report = []
+    for row in results:
+        old = base.get(result_key(row))
+        if not old or not old["throughput_mbps"]:
+            continue
+        change = row["throughput_mbps"] / old["throughput_mbps"] - 1
+        report.append({
+            "key": dict(zip(("backend", "operation", "size", "nsym", "error_load"), result_key(row))),
+            "baseline_mbps": old["throughput_mbps"],
+            "current_mbps": row["throughput_mbps"],
+            "change": round(change, 4),
+            "regression": change < -threshold
+        })
+    return report
+
+
+def environment():
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="قياس أداء Reed-Solomon")
+    parser.add_argument("--backends", type=_csv(str), default=list(CODEC_BACKENDS))
+    parser.add_argument("--sizes", type=_csv(int), default=[64, 1024, 16384, 262144])
+    parser.add_argument("--nsym", type=_csv(int), default=[8, 16, 32])
+    parser.add_argument("--loads", type=_csv(float), default=[0.0, 0.5, 1.0],
+                        help="حِمل الأخطاء كنسبة من قدرة التصحيح لكل كلمة")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="أحجام وقيم أقل للتشغيل السريع")
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=None, help="ملف خط الأساس للمقارنة")
+    parser.add_argument("--save-baseline", action="store_true", help="حفظ النتائج كخط أساس")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--wide", action="store_true",
+                        help="مقارنة GF(2^16) بـ GF(256) المقطّع بدل القياس العادي")
+    parser.add_argument("--wide-sizes", type=_csv(int), default=[65536, 1048576])
+    parser.add_argument("--wide-nsym", type=_csv(int), default=[32, 64, 128],
+                        help="قيم nsym لكود GF(2^16) (كود GF(256) يستخدم آخر قيمة في --nsym)")
+    args = parser.parse_args(argv)
+
+    if args.wide:
+        load = max(args.loads) if args.loads else 0.5
+        results = run_wide_comparison(args.wide_sizes, args.wide_nsym, args.nsym[-1], load,
+                                      args.repeat, args.min_time, args.seed)
+        # تُضاف المقارنة إلى ملف النتائج القائم دون المساس بنتائج القياس العادي
+        document = {"environment": environment(), "results": []}
+        if os.path.exists(args.output):
+            with open(args.output, encoding="utf-8") as f:
+                document = json.load(f)
+        document["wide_comparison"] = results
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"wrote {args.output}")
+        return 0
+
+    if args.quick:
+        args.sizes, args.nsym, args.loads = [1024, 16384], [10], [0.0, 1.0]
+        args.repeat, args.min_time = 3, 0.05
+
+    results = run_benchmarks(args.backends, args.sizes, args.nsym, args.loads,
+                             args.repeat, args.min_time, args.seed)
+    document = {"environment": environment(), "results": results}
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None)
+    regressions = []
+    if baseline_path and not args.save_baseline:
+        with open(baseline_path, encoding="utf-8") as f:
+            report = compare(results, json.load(f), args.threshold)
+        regressions = [r for r in report if r["regression"]]
+        document["comparison"] = {"baseline": baseline_path, "threshold": args.threshold,
+                                  "regressions": len(regressions), "entries": report}
+        for r in regressions:
+            print(f"REGRESSION {r['key']}: {r['baseline_mbps']} -> {r['current_mbps']} MB/s "
+                  f"({r['change']:+.1%})")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE if args.baseline is None else args.baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print("baseline saved")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
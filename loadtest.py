@@ -0,0 +1,298 @@
+"""اختبار الحِمل لسيرفر Reed-Solomon API
+
+يولّد حِملاً محلياً على /api/encode و /api/decode و /api/simulate بمعدل طلبات
+مستهدف (حلقة مفتوحة: يُقاس زمن الاستجابة من موعد الإرسال المجدول لا من لحظة
+الإرسال الفعلية، فلا يختفي الانتظار في الطابور عند التشبع)، ثم يقيس إنتاجية
+التشبع بحلقة مغلقة. مع --workers يشغّل السيرفر في الوضع الإنتاجي لكل عدد عمليات
+ويطبع كيف تتغير المئينات والإنتاجية مع زيادة العمليات.
+
+أمثلة:
+    python loadtest.py --url http://127.0.0.1:8000 --qps 200 --duration 10
+    python loadtest.py --workers 1,2,4 --qps 300 --endpoints encode,decode
+    python loadtest.py --workers 1,2 --output loadtest_results.json
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+ENDPOINTS = ("encode", "decode", "simulate")
+
+
+# لا يستورد هذا الملف app ولا benchmark: مولّد الحِمل يجب ألا ينافس السيرفر على الأنوية
+def _csv(cast):
+    return lambda text: [cast(v) for v in text.split(",") if v]
+
+
+def latency_summary(samples_ms):
+    """مئينات زمن الاستجابة بالملي ثانية"""
+    ordered = sorted(samples_ms)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {"samples": len(ordered), "mean_ms": round(sum(ordered) / len(ordered), 3),
+            "p50_ms": percentile(50), "p90_ms": percentile(90), "p99_ms": percentile(99),
+            "max_ms": round(ordered[-1], 3)}
+
+
+class Target:
+    """اتصال HTTP دائم لكل خيط مع أجسام الطلبات المبنية مسبقاً"""
+
+    def __init__(self, url: str, bodies: dict, headers: dict):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.bodies, self.headers = bodies, headers
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        return conn
+
+    def send(self, endpoint: str) -> bool:
+        path, body = self.bodies[endpoint]
+        try:
+            conn = self._connection()
+            conn.request("POST", path, body=body, headers=self.headers[endpoint])
+            response = conn.getresponse()
+            response.read()
+            return response.status == 200
+        except (OSError, http.client.HTTPException):
+            # إعادة فتح الاتصال في الطلب التالي
+            self._local.conn = None
+            return False
+
+
+def build_requests(url: str, size: int, nsym: int, lean: bool, cache: bool, seed: int):
+    """أجسام ثابتة لكل نقطة نهاية؛ جسم فك الترميز من ترميز حقيقي مع أخطاء ضمن القدرة"""
+    rng = random.Random(seed)
+    text = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(size))
+    query = "?profile=lean" if lean else ""
+    base = {"Content-Type": "application/json"}
+
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    conn.request("POST", "/api/encode?profile=lean", body=json.dumps({"data": text, "nsym": nsym}),
+                 headers=base)
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"encode failed: {response.status} {payload}")
+
+    encoded = bytearray(base64.b64decode(payload["encoded_base64"]))
+    for position in rng.sample(range(min(len(encoded), 255)), nsym // 2):
+        encoded[position] ^= rng.randrange(1, 256)
+
+    # فك الترميز ومحاكاة البذرة تُخزَّن نتائجهما مؤقتاً؛ تجاوز الذاكرة ليقيس الاختبار الحساب نفسه
+    uncached = base if cache else {**base, "Cache-Control": "no-cache"}
+    bodies = {
+        "encode": (f"/api/encode{query}", json.dumps({"data": text, "nsym": nsym})),
+        "decode": (f"/api/decode{query}", json.dumps({
+            "encoded_data": base64.b64encode(bytes(encoded)).decode("ascii"), "nsym": nsym})),
+        "simulate": (f"/api/simulate{query}", json.dumps({
+            "data": text, "nsym": nsym, "error_rate": 0.05, "seed": seed})),
+    }
+    headers = {"encode": base, "decode": uncached, "simulate": uncached}
+    return bodies, headers
+
+
+def open_loop(target: Target, endpoints, qps: float, duration: float, concurrency: int):
+    """إرسال بمعدل ثابت؛ زمن الاستجابة = الانتهاء − الموعد المجدول"""
+    total = int(qps * duration)
+    samples = {name: [] for name in endpoints}
+    errors = {name: 0 for name in endpoints}
+    lock = threading.Lock()
+    counter = iter(range(total))
+    start = time.perf_counter() + 0.05
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            scheduled = start + index / qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            endpoint = endpoints[index % len(endpoints)]
+            ok = target.send(endpoint)
+            latency = (time.perf_counter() - scheduled) * 1000
+            with lock:
+                samples[endpoint].append(latency)
+                if not ok:
+                    errors[endpoint] += 1
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    report = {"target_qps": qps, "achieved_qps": round(total / elapsed, 2), "requests": total,
+              "endpoints": {}}
+    for name in endpoints:
+        if samples[name]:
+            stats = latency_summary(samples[name])
+            report["endpoints"][name] = {**stats, "errors": errors[name]}
+    return report
+
+
+def saturation(target: Target, endpoints, duration: float, concurrency: int):
+    """حلقة مغلقة: كل خيط يرسل الطلب التالي فور اكتمال السابق"""
+    completed = [0] * concurrency
+    failed = [0] * concurrency
+    deadline = time.perf_counter() + duration
+
+    def worker(slot):
+        index = slot
+        while time.perf_counter() < deadline:
+            if target.send(endpoints[index % len(endpoints)]):
+                completed[slot] += 1
+            else:
+                failed[slot] += 1
+            index += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "throughput_qps": round(sum(completed) / elapsed, 2),
+            "errors": sum(failed)}
+
+
+def wait_healthy(url: str, timeout: float = 60.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=2)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become healthy")
+
+
+def start_server(workers: int, port: int):
+    """تشغيل السيرفر في الوضع الإنتاجي بعدد عمليات محدد"""
+    process = subprocess.Popen(
+        [sys.executable, APP_FILE, "--production", "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_healthy(url)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process, url
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run(url: str, args, log=print):
+    target = Target(url, *build_requests(url, args.size, args.nsym, not args.full, args.cache, args.seed))
+    # تسخين: بناء المرمزات في كل عملية قبل القياس
+    saturation(target, args.endpoints, 1.0, args.concurrency)
+    load = open_loop(target, args.endpoints, args.qps, args.duration, args.concurrency)
+    for name, stats in load["endpoints"].items():
+        log(f"  {name:9s} p50={stats['p50_ms']:.2f}ms p90={stats['p90_ms']:.2f}ms "
+            f"p99={stats['p99_ms']:.2f}ms errors={stats['errors']}")
+    log(f"  open loop: target={args.qps} achieved={load['achieved_qps']} qps")
+    peak = saturation(target, args.endpoints, args.saturation_time, args.concurrency)
+    log(f"  saturation: {peak['throughput_qps']} qps at concurrency {peak['concurrency']} "
+        f"(errors={peak['errors']})")
+    return {"open_loop": load, "saturation": peak}
+
+
+def environment():
+    return {"timestamp": datetime.now().isoformat(), "python": platform.python_version(),
+            "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="اختبار الحِمل لسيرفر Reed-Solomon")
+    parser.add_argument("--url", default=None, help="سيرفر قائم؛ يُتجاهل عند تحديد --workers")
+    parser.add_argument("--workers", type=_csv(int), default=None,
+                        help="أعداد العمليات التي يُشغَّل بها السيرفر محلياً، مثل 1,2,4")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoints", type=_csv(str), default=list(ENDPOINTS))
+    parser.add_argument("--qps", type=float, default=100.0, help="معدل الطلبات المستهدف")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--saturation-time", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32, help="عدد خيوط العميل")
+    parser.add_argument("--size", type=int, default=1024, help="حجم الرسالة بالبايت")
+    parser.add_argument("--nsym", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--full", action="store_true", help="الاستجابة الكاملة بدل الملف المختصر")
+    parser.add_argument("--cache", action="store_true", help="السماح بذاكرة النتائج المؤقتة")
+    parser.add_argument("--output", default=None, help="كتابة النتائج بصيغة JSON")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    runs = []
+    if args.workers:
+        for workers in args.workers:
+            print(f"workers={workers}")
+            process, url = start_server(workers, args.port)
+            try:
+                runs.append({"workers": workers, **run(url, args)})
+            finally:
+                stop_server(process)
+    else:
+        url = args.url or "http://127.0.0.1:8000"
+        print(url)
+        runs.append({"workers": None, **run(url, args)})
+
+    if len(runs) > 1:
+        base = runs[0]["saturation"]["throughput_qps"] or 1
+        print("workers  saturation_qps  speedup")
+        for entry in runs:
+            qps = entry["saturation"]["throughput_qps"]
+            print(f"{entry['workers']:>7}  {qps:>14}  {qps / base:>6.2f}x")
+
+    if args.output:
+        config = {k: v for k, v in vars(args).items() if k != "output"}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "config": config, "runs": runs}, f, indent=2)
+        print(f"wrote {args.output}")
+
+    failures = sum(r["saturation"]["errors"] + sum(e["errors"] for e in r["open_loop"]["endpoints"].values())
+                   for r in runs)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1131 @@
+"""محرك Reed-Solomon متجه مبني على NumPy
+
+بديل لـ reedsolo ينفذ حساب GF(2^m) عبر جداول اللوغاريتم/الأس وعمليات المصفوفات:
+- التكافؤ يُحسب لعدة كلمات رمزية دفعة واحدة كضرب مصفوفة (الترميز خطي)
+- المتلازمات تُحسب لكل الكلمات دفعة واحدة، ولا يُشغّل المصحح إلا على الكلمات التالفة
+- خوارزميات التصحيح (Berlekamp-Massey، Chien، Forney) منقولة من reedsolo حرفياً
+  لذلك المخرجات مطابقة بايتاً ببايت لـ RSCodec بنفس المعاملات
+"""
+from functools import lru_cache
+import itertools
+import os
+import tempfile
+import threading
+from typing import Optional
+
+import numpy as np
+import reedsolo
+from reedsolo import RSCodec, ReedSolomonError, find_prime_polys
+
+# الحد الأقصى لعناصر الموتر المؤقت (كلمات × رموز × تكافؤ) في عملية متجهة واحدة
+MAX_TENSOR_ELEMENTS = 1 << 22
+
+
+def _mult_nolut(x: int, y: int, prim: int, field_charac_full: int) -> int:
+    """ضرب بدون جداول (طريقة الفلاح الروسي) لبناء جداول الحقل"""
+    r = 0
+    while y:
+        if y & 1:
+            r ^= x
+        y >>= 1
+        x <<= 1
+        if prim > 0 and x & field_charac_full:
+            x ^= prim
+    return r
+
+
+class GaloisField:
+    """حقل جالوا GF(2^c_exp) مع جداول لوغاريتم/أس وجدول ضرب كامل للحقول الصغيرة"""
+
+    def __init__(self, prim: int = 0x11d, generator: int = 2, c_exp: int = 8):
+        self.prim = prim
+        self.generator = generator
+        self.c_exp = c_exp
+        self.field_charac = (1 << c_exp) - 1
+        self.dtype = np.uint8 if c_exp <= 8 else np.uint16 if c_exp <= 16 else np.uint32
+
+        charac = self.field_charac
+        # الجداول المحمّلة من القرص تُستخدم كما هي إن طابقت معاملات الحقل: كل الجداول
+        # عروض مباشرة على الملف المربوط بالذاكرة فصفحاتها مشتركة بين العمليات
+        self.tables = _tables if _tables is not None and _tables.matches(prim, generator, c_exp) else None
+        if self.tables is not None:
+            self.exp, self.log = self.tables.exp, self.tables.log
+            self.mul_table = self.tables.mul_table
+        else:
+            exp = np.zeros(charac * 2, dtype=self.dtype)
+            log = np.zeros(charac + 1, dtype=self.dtype)
+            x = 1
+            for i in range(charac):
+                exp[i] = x
+                log[x] = i
+                x = _mult_nolut(x, generator, prim, charac + 1)
+            exp[charac:] = exp[:charac]
+            self.exp, self.log = exp, log
+            # جدول ضرب كامل 256×256 لحقل البايت: الضرب المتجه يصبح فهرسة واحدة
+            self.mul_table = None
+            if c_exp <= 8:
+                a = np.arange(charac + 1)
+                table = exp[(log[a].astype(np.int64)[:, None] + log[a][None, :]) % charac]
+                table[0, :] = 0
+                table[:, 0] = 0
+                self.mul_table = table
+
+        # العمليات العددية المفردة تفهرس memoryview فتحصل على أعداد بايثون دون نسخ الجداول
+        self._exp = memoryview(self.exp)
+        self._log = memoryview(self.log)
+
+        # للحقول الواسعة (جدول الضرب الكامل 2^32 عنصراً): log(0) قيمة حارسة تقع جمعها
+        # دائماً في ذيل أصفار من جدول الأس، فالضرب المتجه فهرستان وجمع دون قناع للصفر
+        if self.mul_table is None:
+            self._zlog = self.log.astype(np.int32)
+            self._zlog[0] = 2 * charac
+            self._zexp = np.zeros(4 * charac + 1, dtype=self.dtype)
+            self._zexp[:2 * charac] = self.exp
+
+    # ----- عمليات عددية مفردة -----
+    def mul(self, x: int, y: int) -> int:
+        if x == 0 or y == 0:
+            return 0
+        return self._exp[(self._log[x] + self._log[y]) % self.field_charac]
+
+    def div(self, x: int, y: int) -> int:
+        if y == 0:
+            raise ZeroDivisionError()
+        if x == 0:
+            return 0
+        return self._exp[(self._log[x] + self.field_charac - self._log[y]) % self.field_charac]
+
+    def pow(self, x: int, power: int) -> int:
+        return self._exp[(self._log[x] * power) % self.field_charac]
+
+    def inverse(self, x: int) -> int:
+        return self._exp[self.field_charac - self._log[x]]
+
+    # ----- عمليات متجهة -----
+    def vmul(self, a, b) -> np.ndarray:
+        """ضرب عنصري متجه مع دعم البث (broadcasting)"""
+        if self.mul_table is not None:
+            return self.mul_table[a, b]
+        return self._zexp[self._zlog[a] + self._zlog[b]]
+
+    def vpow(self, x: int, powers) -> np.ndarray:
+        """x^p لمصفوفة من الأسس"""
+        powers = np.asarray(powers, dtype=np.int64)
+        return self.exp[(self._log[x] * powers) % self.field_charac].astype(self.dtype)
+
+    def matmul_xor(self, msgs: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """ضرب مصفوفات فوق الحقل: (B×k) · (k×m) مع الجمع بـ XOR
+
+        يُقسّم على دفعات حتى لا يتجاوز الموتر المؤقت MAX_TENSOR_ELEMENTS.
+        """
+        rows, k = msgs.shape
+        m = matrix.shape[1]
+        out = np.zeros((rows, m), dtype=self.dtype)
+        if rows == 0 or k == 0 or m == 0:
+            return out
+        step_k = max(1, min(k, MAX_TENSOR_ELEMENTS // max(1, m)))
+        step_rows = max(1, MAX_TENSOR_ELEMENTS // (step_k * m))
+        for r0 in range(0, rows, step_rows):
+            block = msgs[r0:r0 + step_rows]
+            acc = out[r0:r0 + step_rows]
+            for k0 in range(0, k, step_k):
+                prod = self.vmul(block[:, k0:k0 + step_k, None], matrix[None, k0:k0 + step_k, :])
+                acc ^= np.bitwise_xor.reduce(prod, axis=1)
+        return out
+
+    def matrix_inverse(self, matrix: np.ndarray) -> np.ndarray:
+        """معكوس مصفوفة مربعة فوق الحقل بحذف غاوس-جوردان (عمليات الصفوف متجهة)"""
+        n = matrix.shape[0]
+        aug = np.concatenate((np.asarray(matrix, dtype=self.dtype), np.eye(n, dtype=self.dtype)), axis=1)
+        for col in range(n):
+            candidates = np.flatnonzero(aug[col:, col])
+            if not len(candidates):
+                raise ValueError("Matrix is singular over GF(2^%i)" % self.c_exp)
+            pivot = col + int(candidates[0])
+            if pivot != col:
+                aug[[col, pivot]] = aug[[pivot, col]]
+            aug[col] = self.vmul(aug[col], self.inverse(int(aug[col, col])))
+            factors = aug[:, col].copy()
+            factors[col] = 0
+            aug ^= self.vmul(factors[:, None], aug[col][None, :])
+        return aug[:, n:]
+
+    # ----- كثيرات الحدود (من الأعلى درجة إلى الأدنى، كما في reedsolo) -----
+    def poly_scale(self, p, x):
+        return [self.mul(c, x) for c in p]
+
+    def poly_add(self, p, q):
+        r = [0] * max(len(p), len(q))
+        r[len(r) - len(p):] = p
+        offset = len(r) - len(q)
+        for i, c in enumerate(q):
+            r[i + offset] ^= c
+        return r
+
+    def poly_mul(self, p, q):
+        r = [0] * (len(p) + len(q) - 1)
+        exp, log = self._exp, self._log
+        lp = [log[c] for c in p]
+        for j, qj in enumerate(q):
+            if qj != 0:
+                lq = log[qj]
+                for i, pi in enumerate(p):
+                    if pi != 0:
+                        r[i + j] ^= exp[lp[i] + lq]
+        return r
+
+    def poly_eval(self, poly, x):
+        y = poly[0]
+        for c in poly[1:]:
+            y = self.mul(y, x) ^ c
+        return y
+
+    def poly_eval_many(self, poly, xs: np.ndarray) -> np.ndarray:
+        """تقييم كثير حدود عند عدة نقاط دفعة واحدة (Horner متجه)"""
+        y = np.full(xs.shape, poly[0], dtype=self.dtype)
+        for c in poly[1:]:
+            y = self.vmul(y, xs) ^ c
+        return y
+
+    def generator_poly(self, nsym: int, fcr: int = 0):
+        if self.tables is not None and self.tables.has_generator(nsym, fcr):
+            return self.tables.generator_poly(nsym)
+        g = [1]
+        for i in range(nsym):
+            g = self.poly_mul(g, [1, self.pow(self.generator, i + fcr)])
+        return g
+
+
+@lru_cache(maxsize=None)
+def is_primitive(prim: int, generator: int, c_exp: int = 8) -> bool:
+    """هل generator عنصر أولي في الحقل المعرّف بـ prim؟ (أي تولّد قواه كل العناصر غير الصفرية)
+
+    جداول اللوغاريتم تُبنى من قوى generator، فإن لم يكن أولياً تتكرر القيم
+    وتفسد الجداول بصمت.
+    """
+    charac = (1 << c_exp) - 1
+    if not 0 < generator <= charac:
+        return False
+    x = 1
+    for i in range(1, charac + 1):
+        x = _mult_nolut(x, generator, prim, charac + 1)
+        if x == 1:
+            return i == charac
+    return False
+
+
+@lru_cache(maxsize=None)
+def get_field(prim: int = 0x11d, generator: int = 2, c_exp: int = 8) -> GaloisField:
+    """حقل مشترك لكل المرمزات التي تستخدم نفس المعاملات"""
+    return GaloisField(prim, generator, c_exp)
+
+
+# ===== الجداول المحسوبة مسبقاً =====
+# ملف ثنائي واحد يُربط بالذاكرة: العمليات المتفرعة تتشارك صفحاته عبر ذاكرة
+# التخزين المؤقت للنظام بدل أن تبني كل عملية جداولها عند أول طلب.
+#
+# التخطيط (كل الأطوال ثابتة لحقل البايت):
+#   الترويسة 16 بايت: TABLES_MAGIC (8) ثم uint16 × 4: prim, generator, fcr, max_nsym
+#   exp: 512 بايت (510 مستخدمة، مكررة مرتين كما في reedsolo)
+#   log: 256 بايت
+#   mul: 256 × 256 بايت
+#   كثيرات الحدود المولدة لـ nsym = 1..max_nsym متتالية، طول كل منها nsym + 1
+TABLES_MAGIC = b"RSGF256\x01"
+# في مجلد التخزين المؤقت للمستخدم لا بجوار الشيفرة: التثبيت قد يكون للقراءة فقط
+TABLES_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                           "rs-engine", "gf256_tables.bin")
+_HEADER_BYTES = 16
+_EXP_BYTES = 512
+_LOG_BYTES = 256
+_MUL_BYTES = 256 * 256
+
+_tables = None
+
+
+def _generator_offset(nsym: int) -> int:
+    """إزاحة كثير الحدود المولد لـ nsym داخل قسم المولدات: Σ(j + 1) لـ j < nsym"""
+    return (nsym - 1) * (nsym + 2) // 2
+
+
+class PrecomputedTables:
+    """عرض للقراءة فقط على ملف الجداول المربوط بالذاكرة"""
+
+    def __init__(self, path: str):
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(raw) < _HEADER_BYTES or raw[:8].tobytes() != TABLES_MAGIC:
+            raise ValueError(f"ملف جداول غير صالح: {path}")
+        self.prim, self.generator, self.fcr, self.max_nsym = (
+            int(v) for v in raw[8:_HEADER_BYTES].view("<u2")
+        )
+        offset = _HEADER_BYTES
+        self.exp = raw[offset:offset + 510]
+        offset += _EXP_BYTES
+        self.log = raw[offset:offset + _LOG_BYTES]
+        offset += _LOG_BYTES
+        self.mul_table = raw[offset:offset + _MUL_BYTES].reshape(256, 256)
+        offset += _MUL_BYTES
+        self._generators = raw[offset:]
+        if len(self._generators) != _generator_offset(self.max_nsym + 1):
+            raise ValueError(f"ملف جداول مقطوع: {path}")
+        self.path = path
+        self.size = len(raw)
+
+    def matches(self, prim: int, generator: int, c_exp: int) -> bool:
+        return c_exp == 8 and prim == self.prim and generator == self.generator
+
+    def has_generator(self, nsym: int, fcr: int) -> bool:
+        return fcr == self.fcr and 1 <= nsym <= self.max_nsym
+
+    def generator_poly(self, nsym: int) -> np.ndarray:
+        start = _generator_offset(nsym)
+        return self._generators[start:start + nsym + 1]
+
+    def info(self) -> dict:
+        return {"path": self.path, "bytes": self.size, "prim": self.prim,
+                "generator": self.generator, "fcr": self.fcr, "max_nsym": self.max_nsym}
+
+
+def build_tables(path: str = TABLES_FILE, prim: int = 0x11d, generator: int = 2, fcr: int = 0) -> str:
+    """حساب الجداول وكتابتها ذرياً (ملف مؤقت ثم إعادة تسمية) حتى لا يقرأ عامل ملفاً ناقصاً"""
+    gf = _computed_field(prim, generator)
+    max_nsym = gf.field_charac - 1
+    header = TABLES_MAGIC + np.array([prim, generator, fcr, max_nsym], dtype="<u2").tobytes()
+    exp = np.zeros(_EXP_BYTES, dtype=np.uint8)
+    exp[:510] = gf._exp
+    parts = [header, exp.tobytes(), bytes(gf._log), gf.mul_table.tobytes()]
+    # g_n = g_(n-1) · (x - α^(n-1+fcr)): كل مولد يُبنى من سابقه
+    g = [1]
+    for nsym in range(1, max_nsym + 1):
+        g = gf.poly_mul(g, [1, gf.pow(generator, nsym - 1 + fcr)])
+        parts.append(bytes(g))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.chmod(tmp, 0o644)  # mkstemp ينشئ الملف بصلاحية 600
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def _computed_field(prim: int, generator: int) -> GaloisField:
+    """حقل محسوب من الصفر متجاهلاً الجداول المحمّلة"""
+    global _tables
+    loaded, _tables = _tables, None
+    try:
+        return GaloisField(prim, generator, 8)
+    finally:
+        _tables = loaded
+
+
+def load_tables(path: str = TABLES_FILE, build: bool = True) -> Optional["PrecomputedTables"]:
+    """ربط ملف الجداول بالذاكرة واعتماده لكل الحقول اللاحقة
+
+    يُبنى الملف إن لم يوجد أو كان تالفاً (مع build). عند الفشل يُكمل المحرك
+    بحساب الجداول في الذاكرة كما في السابق ويُرجع None.
+    """
+    global _tables
+    try:
+        tables = PrecomputedTables(path)
+    except (OSError, ValueError):
+        if not build:
+            return None
+        try:
+            build_tables(path)
+            tables = PrecomputedTables(path)
+        except (OSError, ValueError):
+            return None
+    _tables = tables
+    get_field.cache_clear()
+    return tables
+
+
+def loaded_tables() -> Optional["PrecomputedTables"]:
+    return _tables
+
+
+# reedsolo يضع جداول المرمز في متغيرات الوحدة العامة قبل كل حساب، فلا يعمل
+# مرمزان بحقلين مختلفين في آن واحد. القفل يُؤخذ لكل كلمة رمزية لا للرسالة كلها،
+# فلا ينتظر الطلب الصغير خلف رسالة كبيرة أكثر من كلمة واحدة
+_reedsolo_globals = threading.Lock()
+
+
+def _check_erase_pos(erase_pos, length: int):
+    """رفض مواضع المحو خارج الرسالة: السالب يلتف إلى آخرها والكبير يسقط صامتاً أو يفهرس خطأً"""
+    for pos in erase_pos or ():
+        if not 0 <= pos < length:
+            raise ValueError("Erasure position %i is out of range for a message of length %i" % (pos, length))
+
+
+class TabledRSCodec(RSCodec):
+    """RSCodec يأخذ جداول الحقل وكثير الحدود المولد من الملف المحمّل
+
+    السلوك والمخرجات مطابقة لـ RSCodec؛ فقط البناء يتخطى init_tables وحساب
+    كثير الحدود المولد إن طابقت المعاملات الجداول المحمّلة. encode/decode/check
+    آمنة بين الخيوط: تثبيت الجداول العامة والحساب يتمان تحت القفل لكل كلمة.
+    """
+
+    def __init__(self, nsym=10, nsize=255, fcr=0, prim=0x11d, generator=2, c_exp=8, single_gen=True):
+        tables = _tables
+        if (tables is None or not single_gen or nsize > 255 or nsym >= nsize
+                or not tables.matches(prim, generator, c_exp) or not tables.has_generator(nsym, fcr)):
+            super().__init__(nsym, nsize, fcr, prim, generator, c_exp, single_gen)
+            return
+        self.nsym = nsym
+        self.nsize = nsize
+        self.fcr = fcr
+        self.prim = prim
+        self.generator = generator
+        self.c_exp = c_exp
+        # memoryview على الملف المربوط: فهرسته تعطي أعداد بايثون كما تتوقع reedsolo
+        self.gf_log = memoryview(tables.log)
+        self.gf_exp = memoryview(tables.exp)
+        self.field_charac = 255
+        self.gen = {nsym: memoryview(tables.generator_poly(nsym))}
+
+    def _install(self):
+        reedsolo.gf_log, reedsolo.gf_exp, reedsolo.field_charac = self.gf_log, self.gf_exp, self.field_charac
+        if self.c_exp <= 8:
+            # init_tables لحقل أوسع من بايت يستبدل _bytearray بمصفوفة أعداد فتخرج الكلمات بأربعة بايتات للرمز
+            reedsolo._bytearray = bytearray
+
+    def encode(self, data, nsym=None):
+        nsym = nsym or self.nsym
+        if isinstance(data, str):
+            data = reedsolo._bytearray(data)
+        enc = bytearray()
+        for chunk in self.chunk(data, self.nsize - self.nsym):
+            with _reedsolo_globals:
+                self._install()
+                enc.extend(reedsolo.rs_encode_msg(chunk, self.nsym, fcr=self.fcr,
+                                                  generator=self.generator, gen=self.gen[nsym]))
+        return enc
+
+    def decode(self, data, nsym=None, erase_pos=None, only_erasures=False):
+        nsym = nsym or self.nsym
+        if isinstance(data, str):
+            data = reedsolo._bytearray(data)
+        _check_erase_pos(erase_pos, len(data))
+        dec, dec_full, errata_pos_all = bytearray(), bytearray(), bytearray()
+        for chunk in self.chunk(data, self.nsize):
+            # مواضع المحو الخاصة بهذه الكلمة، وإزاحة البقية إلى الكلمة التالية
+            e_pos = []
+            if erase_pos:
+                e_pos = [x for x in erase_pos if x < self.nsize]
+                erase_pos = [x - self.nsize for x in erase_pos if x >= self.nsize]
+            with _reedsolo_globals:
+                self._install()
+                rmes, recc, errata_pos = reedsolo.rs_correct_msg(
+                    chunk, nsym, fcr=self.fcr, generator=self.generator,
+                    erase_pos=e_pos, only_erasures=only_erasures)
+            dec.extend(rmes)
+            dec_full.extend(rmes + recc)
+            errata_pos_all.extend(errata_pos)
+        return dec, dec_full, errata_pos_all
+
+    def check(self, data, nsym=None):
+        nsym = nsym or self.nsym
+        if isinstance(data, str):
+            data = reedsolo._bytearray(data)
+        check = []
+        for chunk in self.chunk(data, self.nsize):
+            with _reedsolo_globals:
+                self._install()
+                check.append(reedsolo.rs_check(chunk, nsym, fcr=self.fcr, generator=self.generator))
+        return check
+
+
+class NumpyRSCodec:
+    """مرمز Reed-Solomon متجه بواجهة RSCodec نفسها
+
+    encode/decode/check تقبل نفس المعاملات وتُرجع نفس الأنواع، لذا يمكن
+    استبداله بـ RSCodec دون تغيير البيانات المخزنة.
+    """
+
+    # بايتات كل رمز في الواجهة الثنائية (رمز لكل بايت في حقل البايت)
+    symbol_bytes = 1
+
+    def __init__(self, nsym: int = 10, nsize: int = 255, fcr: int = 0, prim: int = 0x11d,
+                 generator: int = 2, c_exp: int = 8):
+        # نفس الضبط التلقائي الذي يجريه RSCodec
+        if nsize > 255 and c_exp <= 8:
+            c_exp = int(np.log2(2 ** (int(np.floor(np.log2(nsize))) + 1)))
+        if c_exp != 8 and prim == 0x11d:
+            prim = find_prime_polys(generator=generator, c_exp=c_exp, fast_primes=True, single=True)
+            if nsize == 255:
+                nsize = int(2 ** c_exp - 1)
+        if nsym >= nsize:
+            raise ValueError('ECC symbols must be strictly less than the total message length (nsym < nsize).')
+
+        self.nsym = nsym
+        self.nsize = nsize
+        self.fcr = fcr
+        self.prim = prim
+        self.generator = generator
+        self.c_exp = c_exp
+        self.gf = get_field(prim, generator, c_exp)
+        self.field_charac = self.gf.field_charac
+        self.gen = {nsym: self.generator_poly(nsym)}
+        self._parity_matrix = None
+        self._syndrome_matrix = None
+
+    def generator_poly(self, nsym: int):
+        return self.gf.generator_poly(nsym, self.fcr)
+
+    # ----- مصفوفات التحويل الخطي -----
+    @property
+    def parity_matrix(self) -> np.ndarray:
+        """مصفوفة (k×nsym): الصف i هو تكافؤ رسالة أحادية عند الموضع i
+
+        الصف i يساوي باقي x^(k-1-i+nsym) على كثير الحدود المولد، فتُبنى الصفوف
+        بتكرار الضرب في x بدل ترميز مصفوفة الوحدة كاملة.
+        """
+        if self._parity_matrix is None:
+            gf = self.gf
+            nsym = self.nsym
+            k = self.nsize - nsym
+            gen_tail = np.array(self.gen[nsym][1:], dtype=np.int64)
+            rows = np.zeros((k, nsym), dtype=gf.dtype)
+            rem = gen_tail.astype(gf.dtype)  # x^nsym mod g
+            for m in range(k):
+                rows[k - 1 - m] = rem
+                top = int(rem[0])
+                rem = np.concatenate((rem[1:], np.zeros(1, dtype=gf.dtype)))
+                if top:
+                    rem ^= gf.vmul(top, gen_tail)
+            self._parity_matrix = rows
+        return self._parity_matrix
+
+    @property
+    def syndrome_matrix(self) -> np.ndarray:
+        """مصفوفة (nsize×nsym): العنصر [i, j] = alpha_j^(nsize-1-i)"""
+        if self._syndrome_matrix is None:
+            gf = self.gf
+            n = self.nsize
+            degrees = np.arange(n - 1, -1, -1, dtype=np.int64)
+            cols = [gf.vpow(gf.pow(self.generator, j + self.fcr), degrees) for j in range(self.nsym)]
+            self._syndrome_matrix = np.stack(cols, axis=1).astype(gf.dtype)
+        return self._syndrome_matrix
+
+    # ----- أدوات التقطيع -----
+    def _to_symbols(self, data) -> np.ndarray:
+        if isinstance(data, str):
+            data = data.encode('latin-1')
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return np.frombuffer(data, dtype=np.uint8).astype(self.gf.dtype, copy=False)
+        return np.asarray(data, dtype=self.gf.dtype)
+
+    def _to_output(self, symbols: np.ndarray):
+        if self.c_exp <= 8:
+            return bytearray(symbols.astype(np.uint8).tobytes())
+        return symbols.astype(self.gf.dtype)
+
+    @staticmethod
+    def _pack_chunks(symbols: np.ndarray, size: int):
+        """تقسيم متجه إلى مصفوفة (قطع×size) محشوة بأصفار من اليسار
+
+        الأصفار البادئة لا تغير قيمة كثير الحدود، فالكلمة القصيرة الأخيرة تُعامل
+        ككود مقصّر دون أن يظهر الحشو في المخرجات.
+        """
+        n = len(symbols)
+        count = -(-n // size) if n else 0
+        matrix = np.zeros((count, size), dtype=symbols.dtype)
+        full = n // size
+        if full:
+            matrix[:full] = symbols[:full * size].reshape(full, size)
+        tail = n - full * size
+        if tail:
+            matrix[full, size - tail:] = symbols[full * size:]
+        return matrix, tail
+
+    @staticmethod
+    def _widths(count: int, tail: int, full: int) -> np.ndarray:
+        """الطول الفعلي لكل كلمة في مصفوفة _pack_chunks (الأخيرة قد تكون أقصر)"""
+        widths = np.full(count, full, dtype=np.int64)
+        if tail:
+            widths[-1] = tail
+        return widths
+
+    def _by_width(self, blocks: np.ndarray, widths: np.ndarray, full: int, fn) -> np.ndarray:
+        """تطبيق fn (التكافؤ أو المتلازمات) مع قص الحشو البادئ للكلمات القصيرة
+
+        الأصفار البادئة لا تغير الناتج، فالكلمات القصيرة تُحسب معاً على أعرض طول
+        بينها بدل الطول الكامل. في الحقول الواسعة (65535 رمزاً للكلمة) هذا ما يجعل
+        الرسائل الصغيرة رخيصة.
+        """
+        short = widths < full
+        if not short.any():
+            return fn(blocks)
+        out = np.empty((len(blocks), self.nsym), dtype=self.gf.dtype)
+        if not short.all():
+            out[~short] = fn(blocks[~short])
+        width = int(widths[short].max())
+        out[short] = fn(blocks[short][:, full - width:])
+        return out
+
+    # ----- الترميز -----
+    def parity_blocks(self, msgs: np.ndarray) -> np.ndarray:
+        """حساب التكافؤ لمصفوفة رسائل (B×L) حيث L ≤ k، دفعة واحدة"""
+        k = self.nsize - self.nsym
+        width = msgs.shape[1]
+        if width > k:
+            raise ValueError("Message is too long (%i when max is %i)" % (width + self.nsym, self.nsize))
+        return self.gf.matmul_xor(msgs, self.parity_matrix[k - width:])
+
+    def _join_codewords(self, codewords: np.ndarray, tail: int, width: int) -> np.ndarray:
+        """تسطيح مصفوفة كلمات إلى متجه مع إزالة حشو الكلمة الأخيرة"""
+        if tail:
+            last = codewords[-1, width - tail:]
+            return np.concatenate((codewords[:-1].ravel(), last))
+        return codewords.ravel()
+
+    def encode_symbols(self, symbols: np.ndarray) -> np.ndarray:
+        """ترميز متجه رموز مع التقطيع إلى كلمات طولها nsize"""
+        k = self.nsize - self.nsym
+        msgs, tail = self._pack_chunks(symbols, k)
+        if not len(msgs):
+            return np.zeros(0, dtype=self.gf.dtype)
+        parity = self._by_width(msgs, self._widths(len(msgs), tail, k), k, self.parity_blocks)
+        codewords = np.concatenate((msgs, parity), axis=1)
+        return self._join_codewords(codewords, tail, k)
+
+    def encode(self, data, nsym=None):
+        """ترميز رسالة بأي طول (مطابق لـ RSCodec.encode)"""
+        if nsym and nsym != self.nsym:
+            return NumpyRSCodec(nsym, self.nsize, self.fcr, self.prim, self.generator, self.c_exp).encode(data)
+        return self._to_output(self.encode_symbols(self._to_symbols(data)))
+
+    def encode_batch(self, messages):
+        """ترميز عدة رسائل بعملية متجهة واحدة، والنتائج بنفس ترتيب المدخلات"""
+        k = self.nsize - self.nsym
+        packed = [self._pack_chunks(self._to_symbols(m), k) for m in messages]
+        if not any(len(blocks) for blocks, _ in packed):
+            return [self._to_output(np.zeros(0, dtype=self.gf.dtype)) for _ in packed]
+        msgs = np.concatenate([blocks for blocks, _ in packed])
+        widths = np.concatenate([self._widths(len(blocks), tail, k) for blocks, tail in packed])
+        parity = self._by_width(msgs, widths, k, self.parity_blocks)
+
+        results = []
+        offset = 0
+        for blocks, tail in packed:
+            count = len(blocks)
+            codewords = np.concatenate((blocks, parity[offset:offset + count]), axis=1)
+            offset += count
+            results.append(self._to_output(self._join_codewords(codewords, tail, k)))
+        return results
+
+    # ----- المتلازمات -----
+    def syndromes_blocks(self, codewords: np.ndarray) -> np.ndarray:
+        """حساب المتلازمات لمصفوفة كلمات (B×L) حيث L ≤ nsize"""
+        width = codewords.shape[1]
+        return self.gf.matmul_xor(codewords, self.syndrome_matrix[self.nsize - width:])
+
+    def check(self, data, nsym=None):
+        """هل كل كلمة رمزية سليمة؟ (مطابق لـ RSCodec.check)"""
+        symbols = self._to_symbols(data)
+        blocks, tail = self._pack_chunks(symbols, self.nsize)
+        if not len(blocks):
+            return []
+        synd = self._by_width(blocks, self._widths(len(blocks), tail, self.nsize), self.nsize,
+                              self.syndromes_blocks)
+        return [bool(v) for v in ~synd.any(axis=1)]
+
+    def check_batch(self, messages):
+        """فحص عدة رسائل بعملية متلازمات واحدة؛ لكل رسالة مصفوفة منطقية لكلماتها"""
+        packed = [self._pack_chunks(self._to_symbols(m), self.nsize) for m in messages]
+        blocks = [b for b, _ in packed if len(b)]
+        if blocks:
+            widths = np.concatenate([self._widths(len(b), tail, self.nsize) for b, tail in packed])
+            synd = self._by_width(np.concatenate(blocks), widths, self.nsize, self.syndromes_blocks)
+            clean = ~synd.any(axis=1)
+        else:
+            clean = np.zeros(0, dtype=bool)
+        results = []
+        offset = 0
+        for b, _ in packed:
+            results.append(clean[offset:offset + len(b)])
+            offset += len(b)
+        return results
+
+    def strip_parity(self, data):
+        """إزالة رموز التكافؤ من كل كلمة دون تصحيح (للكلمات التي ثبتت سلامتها)"""
+        k = self.nsize - self.nsym
+        blocks, tail = self._pack_chunks(self._to_symbols(data), self.nsize)
+        msgs = blocks[:, :k]
+        if tail:
+            last = blocks[-1, self.nsize - tail:k]
+            return self._to_output(np.concatenate((msgs[:-1].ravel(), last)))
+        return self._to_output(msgs.ravel())
+
+    # ----- فك الترميز -----
+    def decode(self, data, nsym=None, erase_pos=None, only_erasures=False):
+        """إصلاح رسالة بأي طول (مطابق لـ RSCodec.decode)
+
+        تُحسب متلازمات كل الكلمات دفعة واحدة، ثم يُشغّل المصحح الكامل فقط
+        على الكلمات ذات المتلازمات غير الصفرية.
+        """
+        if nsym and nsym != self.nsym:
+            return NumpyRSCodec(nsym, self.nsize, self.fcr, self.prim, self.generator, self.c_exp).decode(
+                data, erase_pos=erase_pos, only_erasures=only_erasures
+            )
+        prepared = self._prepare_decode(data, erase_pos)
+        return self._finish_decode(prepared, self._prepared_syndromes([prepared]), only_erasures)
+
+    def decode_batch(self, items, only_erasures=False):
+        """فك ترميز عدة رسائل مع حساب متلازمات كل كلماتها في عملية واحدة
+
+        items: قائمة (data, erase_pos). تُرجع لكل عنصر إما نتيجة decode أو
+        الاستثناء الذي أطلقه، حتى لا يُفشل عنصر واحد الدفعة كلها.
+        """
+        prepared = []
+        for data, erase_pos in items:
+            try:
+                prepared.append(self._prepare_decode(data, erase_pos))
+            except (ReedSolomonError, ValueError, IndexError) as e:
+                prepared.append(e)
+
+        ready = [p for p in prepared if not isinstance(p, Exception)]
+        synd_all = self._prepared_syndromes(ready) if ready else None
+
+        results = []
+        offset = 0
+        for p in prepared:
+            if isinstance(p, Exception):
+                results.append(p)
+                continue
+            count = len(p[0])
+            try:
+                results.append(self._finish_decode(p, synd_all[offset:offset + count], only_erasures))
+            except ReedSolomonError as e:
+                results.append(e)
+            offset += count
+        return results
+
+    def _prepare_decode(self, data, erase_pos=None):
+        """تقطيع الكلمات وتوزيع المحو وتصفير مواضعه كما يفعل reedsolo"""
+        nsym = self.nsym
+        n = self.nsize
+        symbols = np.array(self._to_symbols(data), dtype=self.gf.dtype)
+        if min(len(symbols), n) > self.field_charac:
+            raise ValueError("Message is too long (%i when max is %i)" % (len(symbols), self.field_charac))
+        _check_erase_pos(erase_pos, len(symbols))
+
+        count = -(-len(symbols) // n) if len(symbols) else 0
+        chunk_erasures = [[] for _ in range(count)]
+        for pos in erase_pos or []:
+            chunk_erasures[pos // n].append(pos % n)
+        for c, e_pos in enumerate(chunk_erasures):
+            if len(e_pos) > nsym:
+                raise ReedSolomonError("Too many erasures to correct")
+            for p in e_pos:
+                symbols[c * n + p] = 0
+
+        blocks, tail = self._pack_chunks(symbols, n)
+        return blocks, tail, chunk_erasures
+
+    def _prepared_syndromes(self, prepared: list) -> np.ndarray:
+        """متلازمات كل كلمات عدة رسائل محضّرة بعملية واحدة"""
+        n = self.nsize
+        blocks = np.concatenate([p[0] for p in prepared])
+        widths = np.concatenate([self._widths(len(p[0]), p[1], n) for p in prepared])
+        return self._by_width(blocks, widths, n, self.syndromes_blocks)
+
+    def _finish_decode(self, prepared, synd, only_erasures=False):
+        """تصحيح الكلمات التالفة فقط ثم تجميع المخرجات بصيغة RSCodec.decode"""
+        blocks, tail, chunk_erasures = prepared
+        nsym = self.nsym
+        n = self.nsize
+        count = len(blocks)
+        dirty = np.flatnonzero(synd.any(axis=1))
+
+        corrected = {}
+        for c in dirty:
+            width = tail if (tail and c == count - 1) else n
+            chunk = [int(v) for v in blocks[c, n - width:]]
+            synd_list = [0] + [int(v) for v in synd[c]]
+            corrected[c], chunk_erasures[c] = self._correct_chunk(
+                chunk, synd_list, chunk_erasures[c], only_erasures
+            )
+
+        dec = bytearray() if self.c_exp <= 8 else []
+        dec_full = bytearray() if self.c_exp <= 8 else []
+        errata_all = []
+        for c in range(count):
+            width = tail if (tail and c == count - 1) else n
+            if c in corrected:
+                full = corrected[c]
+            else:
+                full = blocks[c, n - width:].tolist()
+            dec.extend(full[:-nsym] if nsym else full)
+            dec_full.extend(full)
+            errata_all.extend(chunk_erasures[c])
+        errata = bytearray(errata_all) if self.c_exp <= 8 else errata_all
+        return dec, dec_full, errata
+
+    def _correct_chunk(self, msg, synd, erase_pos, only_erasures=False):
+        """تصحيح كلمة واحدة: منقول من rs_correct_msg في reedsolo مع بحث Chien متجه"""
+        gf = self.gf
+        nsym = self.nsym
+        if only_erasures:
+            err_pos = []
+        else:
+            fsynd = self._forney_syndromes(synd, erase_pos, len(msg))
+            err_loc = self._find_error_locator(fsynd, nsym, erase_count=len(erase_pos))
+            err_pos = self._find_errors(err_loc[::-1], len(msg))
+            if err_pos is None:
+                raise ReedSolomonError("Could not locate error")
+
+        errata_pos = list(erase_pos) + err_pos
+        msg = self._correct_errata(msg, synd, errata_pos)
+        check = self.syndromes_blocks(np.array([msg], dtype=gf.dtype))
+        if check.any():
+            raise ReedSolomonError("Could not correct message")
+        return msg, errata_pos
+
+    def _forney_syndromes(self, synd, pos, nmess):
+        gf = self.gf
+        fsynd = list(synd[1:])
+        for p in pos:
+            x = gf.pow(self.generator, nmess - 1 - p)
+            for j in range(len(fsynd) - 1):
+                fsynd[j] = gf.mul(fsynd[j], x) ^ fsynd[j + 1]
+        return fsynd
+
+    def _find_error_locator(self, synd, nsym, erase_loc=None, erase_count=0):
+        gf = self.gf
+        if erase_loc:
+            err_loc = list(erase_loc)
+            old_loc = list(erase_loc)
+        else:
+            err_loc = [1]
+            old_loc = [1]
+        synd_shift = len(synd) - nsym if len(synd) > nsym else 0
+
+        for i in range(nsym - erase_count):
+            K = erase_count + i + synd_shift if erase_loc else i + synd_shift
+            delta = synd[K]
+            for j in range(1, len(err_loc)):
+                delta ^= gf.mul(err_loc[-(j + 1)], synd[K - j])
+            old_loc = old_loc + [0]
+            if delta != 0:
+                if len(old_loc) > len(err_loc):
+                    new_loc = gf.poly_scale(old_loc, delta)
+                    old_loc = gf.poly_scale(err_loc, gf.inverse(delta))
+                    err_loc = new_loc
+                err_loc = gf.poly_add(err_loc, gf.poly_scale(old_loc, delta))
+
+        err_loc = list(itertools.dropwhile(lambda x: x == 0, err_loc))
+        errs = len(err_loc) - 1
+        if (errs - erase_count) * 2 + erase_count > nsym:
+            raise ReedSolomonError("Too many errors to correct")
+        return err_loc
+
+    def _find_errors(self, err_loc, nmess):
+        """بحث Chien: تقييم كثير الحدود عند كل المواضع دفعة واحدة"""
+        gf = self.gf
+        errs = len(err_loc) - 1
+        xs = gf.vpow(self.generator, np.arange(nmess))
+        roots = np.flatnonzero(gf.poly_eval_many(err_loc, xs) == 0)
+        err_pos = [nmess - 1 - int(i) for i in roots]
+        if len(err_pos) != errs:
+            raise ReedSolomonError("Too many (or few) errors found by Chien Search for the errata locator polynomial!")
+        return err_pos
+
+    def _errata_locator(self, e_pos):
+        gf = self.gf
+        e_loc = [1]
+        for i in e_pos:
+            e_loc = gf.poly_mul(e_loc, gf.poly_add([1], [gf.pow(self.generator, i), 0]))
+        return e_loc
+
+    def _error_evaluator(self, synd, err_loc, nsym):
+        gf = self.gf
+        synd = np.asarray(synd, dtype=gf.dtype)
+        product = np.zeros(len(synd) + len(err_loc) - 1, dtype=gf.dtype)
+        for j, coef in enumerate(np.asarray(err_loc).tolist()):
+            if coef:
+                product[j:j + len(synd)] ^= gf.vmul(synd, coef)
+        return product[-(nsym + 1):]
+
+    def _correct_errata(self, msg, synd, err_pos):
+        """خوارزمية Forney لحساب قيم الأخطاء وتطبيقها (متجهة على كل مواضع الأخطاء)"""
+        gf = self.gf
+        charac = self.field_charac
+        coef_pos = [len(msg) - 1 - p for p in err_pos]
+        err_loc = self._errata_locator(coef_pos)
+        err_eval = self._error_evaluator(synd[::-1], err_loc, len(err_loc) - 1)[::-1]
+
+        X = gf.vpow(self.generator, -(charac - np.array(coef_pos, dtype=np.int64)))
+        # الجداول بنوع الرمز (uint8 أو uint16)، فالجمع والطرح على لوغاريتماتها بـ int64
+        log_x = gf.log[X].astype(np.int64)
+        X_inv = gf.exp[charac - log_x].astype(gf.dtype)
+
+        # مشتقة محدد المواقع: ∏_{j≠i} (1 - Xi⁻¹·Xj) لكل i دفعة واحدة
+        terms = gf.vmul(X_inv[:, None], X[None, :]) ^ 1
+        np.fill_diagonal(terms, 1)
+        if (terms == 0).any():
+            raise ReedSolomonError("Decoding failed: Forney algorithm could not properly detect where the errors are located (errata locator prime is 0).")
+        err_loc_prime = gf.exp[gf.log[terms].sum(axis=1, dtype=np.int64) % charac]
+
+        y = gf.poly_eval_many(err_eval[::-1], X_inv).astype(np.int64)
+        y = np.where(y == 0, 0, gf.exp[(gf.log[y] + log_x * (1 - self.fcr)) % charac])
+        magnitude = np.where(
+            y == 0, 0, gf.exp[(gf.log[y].astype(np.int64) + charac - gf.log[err_loc_prime]) % charac]
+        )
+
+        out = np.array(msg, dtype=np.int64)
+        np.bitwise_xor.at(out, np.array(err_pos, dtype=np.int64), magnitude)
+        return out.tolist()
+
+
+# ===== الرموز الواسعة GF(2^16) =====
+# x^16 + x^12 + x^3 + x + 1: كثير حدود أولي و 2 عنصر مولّد فيه
+WIDE_PRIM = 0x1100b
+
+
+class WideRSCodec(NumpyRSCodec):
+    """مرمز GF(2^16) بواجهة بايتات: كل رمز بايتان بترتيب big-endian
+
+    الكلمة الرمزية حتى 65535 رمزاً (حوالي 128 كيلوبايت) بدل 255 بايتاً، فتقل
+    الكلمات واستدعاءات المصحح على الرسائل الكبيرة، ويتحمل كل كلمة انفجار أخطاء
+    متصلاً طوله حتى nsym - 1 بايت أينما وقع (nsym بايت إن بدأ عند حد رمز).
+
+    الرسالة ذات الطول الفردي تُحشى ببايت صفري في بداية الكلمة الأخيرة (البايت
+    العلوي لأول رموزها) ولا يُرسل هذا البايت: تقصير بدقة البايت كما تُقصّر الكلمة
+    الأخيرة بدقة الرمز. لذلك فردية طول الناتج وحدها تحدد موضع الحشو ولا حاجة
+    لإرسال الطول الأصلي، ومواضع المحو تبقى مواضع بايتات في التدفق المرسل.
+    """
+
+    symbol_bytes = 2
+
+    def __init__(self, nsym: int = 10, nsize: int = 65535, fcr: int = 0, prim: int = WIDE_PRIM,
+                 generator: int = 2, c_exp: int = 16):
+        if c_exp != 16:
+            raise ValueError("WideRSCodec supports c_exp=16 only")
+        super().__init__(nsym, nsize, fcr, prim, generator, c_exp)
+
+    def _split(self, data, width: int):
+        """بايتات → رموز؛ يُرجع (الرموز، رقم الكلمة المحشوة أو None)
+
+        width طول الكلمة بالرموز في المدخلات (k للترميز و nsize لفك الترميز).
+        """
+        if isinstance(data, str):
+            data = data.encode('latin-1')
+        raw = np.frombuffer(data, dtype=np.uint8)
+        padded = None
+        if len(raw) % 2:
+            padded = len(raw) // (2 * width)
+            raw = np.insert(raw, padded * 2 * width, 0)
+        return raw.view('>u2').astype(np.uint16), padded
+
+    @staticmethod
+    def _join(symbols, padded, width: int) -> bytearray:
+        """رموز → بايتات مع إسقاط بايت الحشو من بداية الكلمة padded (طولها width رمزاً)"""
+        out = bytearray(np.asarray(symbols, dtype='>u2').tobytes())
+        if padded is not None:
+            at = padded * 2 * width
+            if at >= len(out):
+                raise ReedSolomonError("Message is too short: the padded codeword has no data symbols")
+            if out[at]:
+                raise ReedSolomonError("Could not correct message (implied zero byte decoded as non-zero)")
+            del out[at]
+        return out
+
+    def _erasure_symbols(self, erase_pos, padded):
+        """مواضع البايتات المرسلة → مواضع الرموز (الرمز يُمحى إن مُحي أي من بايتيه)"""
+        if not erase_pos:
+            return erase_pos
+        shift = padded * 2 * self.nsize if padded is not None else None
+        return sorted({(p + (shift is not None and p >= shift)) // 2 for p in erase_pos})
+
+    def symbol_positions(self, positions, encoded_length: int) -> list:
+        """مواضع البايتات في تدفق مرمز طوله encoded_length → مواضع الرموز التي تحتويها"""
+        padded = encoded_length // (2 * self.nsize) if encoded_length % 2 else None
+        return self._erasure_symbols(list(positions), padded)
+
+    def encode(self, data, nsym=None):
+        if nsym and nsym != self.nsym:
+            return WideRSCodec(nsym, self.nsize, self.fcr, self.prim, self.generator).encode(data)
+        symbols, padded = self._split(data, self.nsize - self.nsym)
+        return self._join(self.encode_symbols(symbols), padded, self.nsize)
+
+    def encode_batch(self, messages):
+        split = [self._split(m, self.nsize - self.nsym) for m in messages]
+        encoded = super().encode_batch([symbols for symbols, _ in split])
+        return [self._join(enc, padded, self.nsize) for enc, (_, padded) in zip(encoded, split)]
+
+    def check(self, data, nsym=None):
+        return super().check(self._split(data, self.nsize)[0])
+
+    def check_batch(self, messages):
+        return super().check_batch([self._split(m, self.nsize)[0] for m in messages])
+
+    def strip_parity(self, data):
+        symbols, padded = self._split(data, self.nsize)
+        return self._join(super().strip_parity(symbols), padded, self.nsize - self.nsym)
+
+    def _finish_bytes(self, result, padded):
+        dec, dec_full, errata = result
+        return (self._join(dec, padded, self.nsize - self.nsym),
+                self._join(dec_full, padded, self.nsize), errata)
+
+    def decode(self, data, nsym=None, erase_pos=None, only_erasures=False):
+        if nsym and nsym != self.nsym:
+            return WideRSCodec(nsym, self.nsize, self.fcr, self.prim, self.generator).decode(
+                data, erase_pos=erase_pos, only_erasures=only_erasures
+            )
+        symbols, padded = self._split(data, self.nsize)
+        result = super().decode(symbols, erase_pos=self._erasure_symbols(erase_pos, padded),
+                                only_erasures=only_erasures)
+        return self._finish_bytes(result, padded)
+
+    def decode_batch(self, items, only_erasures=False):
+        split = []
+        for data, erase_pos in items:
+            symbols, padded = self._split(data, self.nsize)
+            split.append((symbols, self._erasure_symbols(erase_pos, padded), padded))
+        decoded = super().decode_batch([(symbols, erase) for symbols, erase, _ in split], only_erasures)
+        results = []
+        for res, (_, _, padded) in zip(decoded, split):
+            if not isinstance(res, Exception):
+                try:
+                    res = self._finish_bytes(res, padded)
+                except ReedSolomonError as e:
+                    res = e
+            results.append(res)
+        return results
+
+
+# ===== التشابك الكتلي (Block interleaving) =====
+def _encoded_length(m: int, k: int, nsym: int) -> int:
+    """طول الناتج المرمز لرسالة طولها m مع التقطيع إلى كلمات بيانات طولها k"""
+    return m + nsym * (-(-m // k))
+
+
+def _row_lengths(length: int, depth: int) -> np.ndarray:
+    """أطوال صفوف المشابك: الصف r يأخذ البايتات r, r+D, r+2D, ..."""
+    rows = np.arange(depth)
+    return np.maximum(0, -(-(length - rows) // depth))
+
+
+def _interleave_mask(lengths: np.ndarray) -> np.ndarray:
+    """قناع (D × أطول صف) للخانات المشغولة؛ الصفوف مرتبة تنازلياً بالطول"""
+    width = int(lengths.max()) if len(lengths) else 0
+    return np.arange(width)[None, :] < lengths[:, None]
+
+
+def _check_interleave(codec, depth: int):
+    if depth < 1:
+        raise ValueError("Interleaving depth must be at least 1")
+    # التشابك يوزع البايتات على الصفوف، فالرمز الواسع سيُقسم بين صفين
+    if getattr(codec, "symbol_bytes", 1) != 1:
+        raise ValueError("Interleaving requires one byte per symbol (c_exp=8)")
+
+
+def interleave_encode(codec, data, depth: int) -> bytes:
+    """ترميز مع تشابك كتلي بعمق depth
+
+    تُوزع الرسالة على depth صفاً (الصف r يحمل البايتات r::depth)، ويُرمز كل صف
+    ككلمة (أو كلمات) مستقلة، ثم تُرسل المصفوفة عموداً عموداً. بذلك ينقسم أي
+    انفجار أخطاء بطول B على الصفوف فلا يصيب كل كلمة إلا نحو B/depth بايت.
+    كل الصفوف تُرمز بعملية متجهة واحدة عبر encode_batch إن توفرت.
+    """
+    _check_interleave(codec, depth)
+    data = bytes(data)
+    rows = [data[r::depth] for r in range(depth)]
+    if hasattr(codec, "encode_batch"):
+        encoded_rows = codec.encode_batch(rows)
+    else:
+        encoded_rows = [codec.encode(row) for row in rows]
+
+    lengths = np.array([len(row) for row in encoded_rows])
+    mask = _interleave_mask(lengths)
+    matrix = np.zeros(mask.shape, dtype=np.uint8)
+    for r, row in enumerate(encoded_rows):
+        matrix[r, :len(row)] = np.frombuffer(bytes(row), dtype=np.uint8)
+    # القراءة عموداً عموداً مع تخطي الخانات الفارغة في الصفوف الأقصر
+    return matrix.T[mask.T].tobytes()
+
+
+def interleaved_message_length(encoded_length: int, depth: int, nsize: int, nsym: int) -> int:
+    """استنتاج طول الرسالة الأصلية من طول التدفق المشابك (بحث ثنائي)"""
+    k = nsize - nsym
+
+    def total(length):
+        return sum(_encoded_length(int(m), k, nsym) for m in _row_lengths(length, depth))
+
+    lo, hi = 0, encoded_length
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if total(mid) < encoded_length:
+            lo = mid + 1
+        else:
+            hi = mid
+    if total(lo) != encoded_length:
+        raise ValueError("Encoded length %i does not match interleaving depth %i" % (encoded_length, depth))
+    return lo
+
+
+def _deinterleave(codec, encoded, depth: int):
+    """إعادة بناء مصفوفة الصفوف من التدفق المشابك: (طول الرسالة، أطوال الصفوف، القناع، المصفوفة)"""
+    stream = np.frombuffer(bytes(encoded), dtype=np.uint8)
+    length = interleaved_message_length(len(stream), depth, codec.nsize, codec.nsym)
+    k = codec.nsize - codec.nsym
+    lengths = np.array([_encoded_length(int(m), k, codec.nsym) for m in _row_lengths(length, depth)])
+    mask = _interleave_mask(lengths)
+
+    matrix = np.zeros(mask.shape, dtype=np.uint8)
+    matrix.T[mask.T] = stream
+    return length, lengths, mask, matrix
+
+
+def interleave_check(codec, encoded, depth: int) -> np.ndarray:
+    """فحص متلازمات كل كلمات الصفوف دون فك الترميز (يتطلب مرمزاً يدعم check_batch)"""
+    _check_interleave(codec, depth)
+    _, lengths, _, matrix = _deinterleave(codec, encoded, depth)
+    rows = [matrix[r, :lengths[r]].tobytes() for r in range(depth)]
+    return np.concatenate(codec.check_batch(rows))
+
+
+def interleave_decode(codec, encoded, depth: int, erase_pos=None, only_erasures=False):
+    """فك تشابك وترميز تدفق ناتج عن interleave_encode
+
+    مواضع المحو تُعطى بالنسبة للتدفق المشابك وتُحوَّل إلى (صف، موضع). تُرجع
+    (البيانات، عدد المواضع المصححة)، وتطلق ReedSolomonError إن فشل أي صف.
+    مع only_erasures تُصحح مواضع المحو فقط دون البحث عن أخطاء مجهولة.
+    """
+    _check_interleave(codec, depth)
+    length, lengths, mask, matrix = _deinterleave(codec, encoded, depth)
+    _check_erase_pos(erase_pos, len(encoded))
+    # ترتيب الخانات في التدفق هو ترتيب العناصر غير الصفرية في القناع المنقول
+    cols_of, rows_of = np.nonzero(mask.T)
+    row_erasures = [[] for _ in range(depth)]
+    for p in erase_pos or []:
+        row_erasures[rows_of[p]].append(int(cols_of[p]))
+
+    items = [(matrix[r, :lengths[r]].tobytes(), row_erasures[r] or None) for r in range(depth)]
+    if hasattr(codec, "decode_batch"):
+        results = codec.decode_batch(items, only_erasures=only_erasures)
+    else:
+        results = []
+        for row, erasures in items:
+            try:
+                results.append(codec.decode(row, erase_pos=erasures, only_erasures=only_erasures))
+            except ReedSolomonError as e:
+                results.append(e)
+
+    out = np.zeros(length, dtype=np.uint8)
+    corrected = 0
+    for r, res in enumerate(results):
+        if isinstance(res, Exception):
+            raise res
+        out[r::depth] = np.frombuffer(bytes(res[0]), dtype=np.uint8)
+        corrected += len(res[2])
+    return out.tobytes(), corrected
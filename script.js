@@ -3,6 +3,8 @@ const CONFIG = {
     API_BASE_URL: 'https://read-solomon-git-main-eng-hussein-fahime-projects.vercel.app/api',
     DEFAULT_NSYM: 10,
     DEFAULT_ERROR_RATE: 15,
+    // المدخلات الأكبر من هذا الحد تُرسل كمهمة خلفية مع عرض التقدم بدل طلب واحد طويل
+    JOB_THRESHOLD_BYTES: 64 * 1024,
     DEVELOPER: {
         name: "المهندس حسين فاهم الخزعلي",
         email: "husseinfaheem6@gmail.com",
@@ -247,16 +249,11 @@ async function handleEncode() {
         setButtonLoading(elements.encodeBtn, true);
         
         // ⚠️ التعديل المهم: nsym → ecc_symbols
-        const response = await fetch(`${CONFIG.API_BASE_URL}/encode`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                data: inputData,
-                ecc_symbols: nsym  // ✅ تم التعديل
-            })
-        });
-        
-        const result = await response.json();
+        const result = await postOrRunJob('encode', {
+            data: inputData,
+            nsym: nsym,
+            ecc_symbols: nsym  // ✅ تم التعديل
+        }, elements.encodeBtn);
         
         if (result.status === 'success' || result.data) {
             state.encodedData = result.data?.encoded?.base64 || result.encoded_data;
@@ -408,19 +405,16 @@ async function handleSimulate() {
         setButtonLoading(elements.simulateBtn, true);
         
         // ⚠️ التعديل المهم: data → encoded_data, nsym → ecc_symbols
-        const response = await fetch(`${CONFIG.API_BASE_URL}/simulate`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                encoded_data: state.encodedData,  // ✅ تم التعديل
-                ecc_symbols: nsym,                // ✅ تم التعديل
-                error_rate: errorRate,
-                error_type: state.errorType,
-                channel_type: state.channelType
-            })
-        });
-        
-        const result = await response.json();
+        // data و nsym مطلوبان لمهمة /jobs/simulate التي ترمز النص بنفسها
+        const result = await postOrRunJob('simulate', {
+            data: inputData,
+            nsym: nsym,
+            encoded_data: state.encodedData,  // ✅ تم التعديل
+            ecc_symbols: nsym,                // ✅ تم التعديل
+            error_rate: errorRate,
+            error_type: state.errorType,
+            channel_type: state.channelType
+        }, elements.simulateBtn);
         
         if (result.status === 'success' || result.status === 'partial' || result.simulation) {
             state.simulationResults = result;
@@ -535,6 +529,45 @@ function setButtonLoading(button, isLoading) {
     } else {
         button.classList.remove('loading');
         button.disabled = false;
+        setButtonProgress(button, null);
+    }
+}
+
+// نسبة تقدم المهمة الخلفية بجانب مؤشر التحميل (null يخفيها)
+function setButtonProgress(button, fraction) {
+    const loading = button.querySelector('.btn-loading');
+    let label = loading.querySelector('.btn-progress');
+    if (fraction === null) {
+        if (label) label.remove();
+        return;
+    }
+    if (!label) {
+        label = document.createElement('div');
+        label.className = 'btn-progress';
+        loading.appendChild(label);
+    }
+    label.textContent = `${Math.round(fraction * 100)}%`;
+}
+
+// الطلبات الصغيرة تُرسل مباشرة؛ الكبيرة تمر عبر runJob فيظهر تقدمها على الزر
+// ولا تنتهي مهلة الاتصال، وتُلغى على السيرفر إن غادر المستخدم الصفحة
+async function postOrRunJob(kind, body, button) {
+    if (new TextEncoder().encode(body.data).length < CONFIG.JOB_THRESHOLD_BYTES) {
+        const response = await fetch(`${CONFIG.API_BASE_URL}/${kind}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        return response.json();
+    }
+    const job = runJob(kind, body, {
+        onProgress: progress => setButtonProgress(button, progress.fraction)
+    });
+    window.addEventListener('pagehide', job.cancel);
+    try {
+        return await job.promise;
+    } finally {
+        window.removeEventListener('pagehide', job.cancel);
     }
 }
 
@@ -812,3 +845,36 @@ window.fetchWithTimeout = function(url, options = {}, timeout = 10000) {
         )
     ]);
 };
+
+// تشغيل مهمة خلفية (encode أو simulate أو sweep) ومتابعتها حتى تنتهي
+// الاستعلام الدوري يُبقي المهمة حية؛ cancel() يلغيها على السيرفر
+window.runJob = function(kind, body, { onProgress, interval = 500 } = {}) {
+    let jobId = null;
+    let cancelled = false;
+    const promise = (async () => {
+        const submit = await fetch(`${CONFIG.API_BASE_URL}/jobs/${kind}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const submitted = await submit.json();
+        if (!submit.ok) throw new Error(submitted.detail?.message || 'فشل إرسال المهمة');
+        jobId = submitted.job_id;
+        while (!cancelled) {
+            const response = await fetchWithTimeout(`${CONFIG.API_BASE_URL}/jobs/${jobId}`);
+            const job = await response.json();
+            if (!response.ok) throw new Error(job.detail?.message || 'المهمة غير موجودة');
+            if (onProgress) onProgress(job.progress, job.partial);
+            if (job.status === 'succeeded') return job.result;
+            if (job.status === 'failed') throw new Error(job.error);
+            if (job.status === 'cancelled') break;
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+        throw new Error('أُلغيت المهمة');
+    })();
+    const cancel = () => {
+        cancelled = true;
+        if (jobId) fetch(`${CONFIG.API_BASE_URL}/jobs/${jobId}`, { method: 'DELETE' });
+    };
+    return { promise, cancel };
+};
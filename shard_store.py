@@ -0,0 +1,293 @@
+"""تخزين الكائنات بترميز المحو: k شظية بيانات + m شظية تكافؤ
+
+كل موضع بايت i عبر الشظايا يشكل كلمة Reed-Solomon نظامية RS(k+m, k) فوق
+GF(256): البايتات i من شظايا البيانات هي الرسالة، والبايتات i من شظايا
+التكافؤ هي رموز التكافؤ. لأن الكود MDS فأي k شظايا سليمة تكفي لاستعادة الكائن
+بضرب مصفوفة k×k معكوسة.
+
+الشظايا تُقرأ وتُكتب كملفات مربوطة بالذاكرة (memmap) على شرائح بطول ثابت،
+فلا يُحمّل الكائن كاملاً في ذاكرة بايثون مهما كبر حجمه.
+
+التخطيط على القرص:
+    <root>/<object_id>/manifest.json
+    <root>/<object_id>/shard_000.bin ... shard_<k+m-1>.bin
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from reedsolo import ReedSolomonError
+
+from rs_engine import NumpyRSCodec, get_field
+
+MANIFEST = "manifest.json"
+STRIPE_BYTES = 1 << 20  # بايتات كل شظية في الشريحة الواحدة
+MAX_SHARDS = 255        # k + m ≤ 255 في GF(256)
+
+_OBJECT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _shard_name(index: int) -> str:
+    return f"shard_{index:03d}.bin"
+
+
+def generator_matrix(k: int, m: int) -> tuple:
+    """(مصفوفة التوليد النظامية [I | A] بأبعاد k×(k+m)، الحقل)"""
+    gf = get_field()
+    identity = np.eye(k, dtype=gf.dtype)
+    if not m:
+        return identity, gf
+    return np.concatenate((identity, NumpyRSCodec(m, nsize=k + m).parity_matrix), axis=1), gf
+
+
+def combine_rows(gf, rows: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """(n×w) = matrixᵀ · rows فوق الحقل، صفاً بصف
+
+    كل معامل ثابت عبر الشريحة كلها، فضربه في صف كامل هو فهرسة واحدة في صف
+    جدول الضرب (256 بايت) بدل موتر k×w×n المؤقت في matmul_xor.
+    """
+    out = np.zeros((matrix.shape[1], rows.shape[1]), dtype=np.uint8)
+    for i in range(matrix.shape[1]):
+        for j in range(matrix.shape[0]):
+            coef = int(matrix[j, i])
+            if coef == 1:
+                out[i] ^= rows[j]
+            elif coef:
+                out[i] ^= gf.mul_table[coef].take(rows[j])
+    return out
+
+
+def _open_shard(path: str, size: int, mode: str = "r"):
+    """memmap للشظية؛ الشظايا الفارغة (كائن بحجم صفر) تُمثل بمصفوفة فارغة"""
+    if size == 0:
+        if mode == "w+":
+            open(path, "wb").close()
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode=mode, shape=(size,))
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(STRIPE_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ShardStore:
+    """مخزن كائنات بترميز المحو في مجلد محلي"""
+
+    def __init__(self, root: str, stripe_bytes: int = STRIPE_BYTES, read_workers: int = 8):
+        self.root = root
+        self.stripe_bytes = max(1, stripe_bytes)
+        self.read_workers = max(1, read_workers)
+
+    # ----- المسارات والبيان -----
+    def _object_dir(self, object_id: str) -> str:
+        if not _OBJECT_ID.match(object_id or ""):
+            raise FileNotFoundError(f"معرف كائن غير صالح: {object_id}")
+        return os.path.join(self.root, object_id)
+
+    def manifest(self, object_id: str) -> dict:
+        path = os.path.join(self._object_dir(object_id), MANIFEST)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"الكائن غير موجود: {object_id}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, directory: str, manifest: dict):
+        # الكتابة الذرية: ملف مؤقت ثم إعادة تسمية
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(directory, MANIFEST))
+
+    def spool_path(self) -> str:
+        """مسار مؤقت داخل المخزن لاستقبال رفع (على نفس القرص لتجنب النسخ)"""
+        os.makedirs(self.root, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.root, suffix=".upload")
+        os.close(fd)
+        return path
+
+    # ----- الترميز -----
+    def put_file(self, source_path: str, k: int, m: int) -> dict:
+        """تقسيم ملف إلى k شظية بيانات و m شظية تكافؤ وكتابتها في مجلد جديد"""
+        if k < 1 or m < 0 or k + m > MAX_SHARDS:
+            raise ValueError(f"يجب أن يكون k ≥ 1 و m ≥ 0 و k + m ≤ {MAX_SHARDS}")
+        size = os.path.getsize(source_path)
+        shard_size = -(-size // k)
+        object_id = uuid.uuid4().hex
+        directory = os.path.join(self.root, object_id)
+        os.makedirs(directory)
+
+        try:
+            source = _open_shard(source_path, size)
+            shards = [_open_shard(os.path.join(directory, _shard_name(i)), shard_size, "w+")
+                      for i in range(k + m)]
+            digests = [hashlib.sha256() for _ in range(k + m)]
+            object_digest = hashlib.sha256()
+            full, gf = generator_matrix(k, m)
+            parity = full[:, k:]
+
+            for start in range(0, shard_size, self.stripe_bytes):
+                end = min(start + self.stripe_bytes, shard_size)
+                data = np.zeros((k, end - start), dtype=np.uint8)
+                for j in range(k):
+                    lo = j * shard_size + start
+                    hi = min(j * shard_size + end, size)
+                    if hi > lo:
+                        data[j, :hi - lo] = source[lo:hi]
+                rows = [data[j] for j in range(k)]
+                if m:
+                    rows.extend(combine_rows(gf, data, parity))
+                for i, row in enumerate(rows):
+                    shards[i][start:end] = row
+                    digests[i].update(row.tobytes())
+
+            for lo in range(0, size, self.stripe_bytes):
+                object_digest.update(source[lo:lo + self.stripe_bytes].tobytes())
+            for shard in shards:
+                if isinstance(shard, np.memmap):
+                    shard.flush()
+            del shards, source
+
+            manifest = {
+                "object_id": object_id,
+                "size": size,
+                "k": k,
+                "m": m,
+                "shard_size": shard_size,
+                "sha256": object_digest.hexdigest(),
+                "shards": [{"index": i, "file": _shard_name(i), "kind": "data" if i < k else "parity",
+                            "sha256": digests[i].hexdigest()} for i in range(k + m)],
+                "created": datetime.now().isoformat()
+            }
+            self._write_manifest(directory, manifest)
+            return manifest
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+    # ----- حالة الشظايا -----
+    def shard_status(self, object_id: str, verify: bool = False) -> tuple:
+        """(البيان، قائمة حالة كل شظية): present أو missing أو corrupt
+
+        مع verify تُحسب بصمات كل الشظايا بالتوازي (hashlib يحرر GIL للكتل الكبيرة).
+        """
+        manifest = self.manifest(object_id)
+        directory = self._object_dir(object_id)
+        paths = [os.path.join(directory, s["file"]) for s in manifest["shards"]]
+
+        def check(index):
+            path = paths[index]
+            if not os.path.exists(path) or os.path.getsize(path) != manifest["shard_size"]:
+                return "missing"
+            if verify and _file_sha256(path) != manifest["shards"][index]["sha256"]:
+                return "corrupt"
+            return "present"
+
+        with ThreadPoolExecutor(max_workers=self.read_workers) as pool:
+            status = list(pool.map(check, range(len(paths))))
+        return manifest, status
+
+    # ----- الاستعادة -----
+    def _stripes(self, object_id: str, manifest: dict, chosen: list):
+        """توليد شرائح بيانات مستعادة (بداية، نهاية، مصفوفة k×w) من الشظايا المختارة
+
+        الشظايا المختارة تُقرأ بالتوازي لكل شريحة؛ إن كانت كلها شظايا بيانات
+        فلا حاجة لأي حساب.
+        """
+        k, m, shard_size = manifest["k"], manifest["m"], manifest["shard_size"]
+        directory = self._object_dir(object_id)
+        sources = [_open_shard(os.path.join(directory, _shard_name(i)), shard_size) for i in chosen]
+        decode = None
+        if chosen != list(range(k)):
+            full, gf = generator_matrix(k, m)
+            decode = gf.matrix_inverse(full[:, chosen])
+
+        with ThreadPoolExecutor(max_workers=min(self.read_workers, len(sources))) as pool:
+            for start in range(0, shard_size, self.stripe_bytes):
+                end = min(start + self.stripe_bytes, shard_size)
+                received = np.stack(list(pool.map(lambda mm: np.array(mm[start:end]), sources)))
+                if decode is not None:
+                    received = combine_rows(gf, received, decode)
+                yield start, end, received
+
+    def _choose(self, manifest: dict, status: list) -> list:
+        survivors = [i for i, state in enumerate(status) if state == "present"]
+        if len(survivors) < manifest["k"]:
+            raise ReedSolomonError(
+                f"Too few shards to reconstruct ({len(survivors)} available, {manifest['k']} needed)"
+            )
+        # ترتيب الفهارس يفضل شظايا البيانات فتُتخطى عملية فك الترميز متى أمكن
+        return survivors[:manifest["k"]]
+
+    def get_to_file(self, object_id: str, out_path: str, verify: bool = False) -> dict:
+        """استعادة الكائن إلى ملف من أي k شظايا سليمة"""
+        manifest, status = self.shard_status(object_id, verify)
+        chosen = self._choose(manifest, status)
+        k, size, shard_size = manifest["k"], manifest["size"], manifest["shard_size"]
+
+        out = _open_shard(out_path, size, "w+")
+        for start, end, data in self._stripes(object_id, manifest, chosen):
+            for j in range(k):
+                lo = j * shard_size + start
+                hi = min(j * shard_size + end, size)
+                if hi > lo:
+                    out[lo:hi] = data[j, :hi - lo]
+        if isinstance(out, np.memmap):
+            out.flush()
+        del out
+
+        return {
+            "object_id": object_id,
+            "size": size,
+            "shards_used": chosen,
+            "shards_missing": [i for i, state in enumerate(status) if state != "present"],
+            "reconstructed": chosen != list(range(k))
+        }
+
+    def repair(self, object_id: str, verify: bool = True) -> dict:
+        """إعادة بناء الشظايا المفقودة أو التالفة من k شظايا سليمة"""
+        manifest, status = self.shard_status(object_id, verify)
+        missing = [i for i, state in enumerate(status) if state != "present"]
+        if not missing:
+            return {"object_id": object_id, "repaired": []}
+        chosen = self._choose(manifest, status)
+        k, m, shard_size = manifest["k"], manifest["m"], manifest["shard_size"]
+        directory = self._object_dir(object_id)
+
+        full, gf = generator_matrix(k, m)
+        columns = full[:, missing]
+        tmp_paths = [os.path.join(directory, _shard_name(i) + ".tmp") for i in missing]
+        targets = [_open_shard(p, shard_size, "w+") for p in tmp_paths]
+        digests = [hashlib.sha256() for _ in missing]
+        for start, end, data in self._stripes(object_id, manifest, chosen):
+            rebuilt = combine_rows(gf, data, columns)
+            for t, target in enumerate(targets):
+                row = rebuilt[t]
+                target[start:end] = row
+                digests[t].update(row.tobytes())
+        for target in targets:
+            if isinstance(target, np.memmap):
+                target.flush()
+        del targets
+
+        for index, tmp, digest in zip(missing, tmp_paths, digests):
+            os.replace(tmp, os.path.join(directory, _shard_name(index)))
+            manifest["shards"][index]["sha256"] = digest.hexdigest()
+        self._write_manifest(directory, manifest)
+        return {"object_id": object_id, "repaired": missing, "shards_used": chosen}
+
+    def delete(self, object_id: str):
+        directory = self._object_dir(object_id)
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"الكائن غير موجود: {object_id}")
+        shutil.rmtree(directory)
@@ -0,0 +1,73 @@
+"""التحقق من المعاملات: عمق التشابك ومواضع المحو"""
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+client = TestClient(app.app)
+
+
+@pytest.mark.parametrize("depth", [0, -3])
+def test_non_positive_interleave_is_rejected(depth):
+    assert client.post("/api/encode", json={"data": "abc", "interleave": depth}).status_code == 422
+    assert client.post("/api/simulate", json={"data": "abc", "interleave": depth}).status_code == 422
+    assert client.post("/api/jobs/encode", json={"data": "abc", "interleave": depth}).status_code == 422
+    for path in ("/api/encode/raw", "/api/decode/raw"):
+        response = client.post(f"{path}?interleave={depth}", content=b"abc")
+        assert response.status_code == 400
+        assert response.headers["x-rs-status"] == "RS_BAD_REQUEST"
+
+
+@pytest.mark.parametrize("size", [100, 5000])
+@pytest.mark.parametrize("encoded_depth,decoded_depth", [(1, 3), (3, 1), (4, 2), (2, 5)])
+def test_mismatched_interleave_depth_is_a_parameter_error(size, encoded_depth, decoded_depth):
+    encoded = client.post(f"/api/encode/raw?nsym=10&interleave={encoded_depth}", content=b"m" * size).content
+    response = client.post(f"/api/decode/raw?nsym=10&interleave={decoded_depth}", content=encoded)
+    assert response.status_code == 400
+    assert response.json()["error"]["interleave_hint"] == encoded_depth
+
+    response = client.post("/api/decode", json={
+        "encoded_data": base64.b64encode(encoded).decode(), "nsym": 10, "interleave": decoded_depth
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"]["interleave_hint"] == encoded_depth
+
+
+def test_damage_at_the_right_depth_stays_uncorrectable():
+    encoded = bytearray(client.post("/api/encode/raw?nsym=10&interleave=3", content=b"d" * 3000).content)
+    encoded[100:400] = bytes(300)
+    response = client.post("/api/decode/raw?nsym=10&interleave=3", content=bytes(encoded))
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "RS_UNCORRECTABLE"
+
+
+@pytest.mark.parametrize("backend", ["reedsolo", "numpy"])
+@pytest.mark.parametrize("interleave", [1, 3])
+@pytest.mark.parametrize("position", [-1, 600, 10_000])
+def test_out_of_range_erasures_are_rejected(backend, interleave, position):
+    encoded = client.post(f"/api/encode/raw?nsym=10&interleave={interleave}", content=b"e" * 500).content
+    assert len(encoded) < 600
+    query = f"nsym=10&interleave={interleave}&backend={backend}"
+    response = client.post(f"/api/decode/raw?{query}&erasures=3,{position}", content=encoded)
+    assert response.status_code == 400
+    assert response.headers["x-rs-status"] == "RS_BAD_REQUEST"
+
+    response = client.post("/api/decode", json={"encoded_data": base64.b64encode(encoded).decode(), "nsym": 10,
+                                                "interleave": interleave, "backend": backend,
+                                                "erasures": [3, position]})
+    assert response.status_code == 400
+    assert str(position) in response.json()["detail"]["message"]
+
+
+def test_engines_reject_out_of_range_erasures():
+    from rs_engine import NumpyRSCodec, TabledRSCodec, WideRSCodec, interleave_decode
+    for codec in (NumpyRSCodec(10), TabledRSCodec(10), WideRSCodec(10)):
+        encoded = bytes(codec.encode(b"x" * 300))
+        for position in (-1, len(encoded)):
+            with pytest.raises(ValueError):
+                codec.decode(encoded, erase_pos=[position])
+        assert bytes(codec.decode(encoded, erase_pos=[len(encoded) - 1])[0]) == b"x" * 300
+    with pytest.raises(ValueError):
+        interleave_decode(NumpyRSCodec(10), bytes(NumpyRSCodec(10).encode(b"y" * 50)), 1, [-2])
@@ -0,0 +1,63 @@
+"""نقاط الدفعات: ترتيب النتائج وعزل العنصر الفاشل عن بقية الدفعة"""
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+client = TestClient(app.app)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+@pytest.mark.parametrize("backend", ["numpy", "reedsolo"])
+def test_encode_batch_keeps_order_and_isolates_bad_items(backend):
+    items = [{"data": f"message {i} " * (i + 1), "nsym": 4 + 2 * (i % 3)} for i in range(12)]
+    items.insert(5, {"data": "bad nsym", "nsym": 300})
+    response = client.post("/api/encode/batch", json={"items": items, "backend": backend})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "partial"
+    assert body["summary"] == {"total": 13, "succeeded": 12, "failed": 1}
+
+    results = body["results"]
+    assert [r["index"] for r in results] == list(range(13))
+    assert results[5]["status"] == "error"
+    for item, result in zip(items, results):
+        if result["status"] == "success":
+            expected = bytes(RSCodec(item["nsym"]).encode(item["data"].encode()))
+            assert base64.b64decode(result["encoded_base64"]) == expected
+
+
+def test_decode_batch_reports_each_item_in_order():
+    rng = np.random.default_rng(4)
+    messages = [rng.integers(0, 256, size=size, dtype=np.uint8).tobytes() for size in (10, 300, 600, 50, 1000)]
+    encoded = [bytearray(RSCodec(10).encode(m)) for m in messages]
+    encoded[1][7] ^= 0xFF                          # قابل للتصحيح
+    encoded[2][0:12] = bytes(12)                   # غير قابل للتصحيح
+    items = [{"encoded_data": _b64(bytes(e)), "nsym": 10} for e in encoded]
+    items[3]["encoded_data"] = "@@not base64@@"   # عنصر غير صالح
+    items[4]["erasures"] = [3, 4]
+
+    response = client.post("/api/decode/batch", json={"items": items})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["summary"] == {"total": 5, "succeeded": 3, "uncorrectable": 1, "failed": 1}
+    results = body["results"]
+    assert [r["index"] for r in results] == list(range(5))
+    assert [r["status"] for r in results] == ["success", "success", "uncorrectable", "error", "success"]
+    for index in (0, 1, 4):
+        assert base64.b64decode(results[index]["decoded_base64"]) == messages[index]
+    assert results[1]["errors_corrected"] == 1 and results[0]["errors_corrected"] == 0
+    assert results[2]["error"]["code"] == "RS_UNCORRECTABLE"
+
+
+def test_batch_size_limit(monkeypatch):
+    monkeypatch.setattr(app, "MAX_BATCH_ITEMS", 2)
+    response = client.post("/api/encode/batch", json={"items": [{"data": "a"}] * 3})
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+"""نموذج القناة المتجه: مواضع الأخطاء وطول الانفجار والحتمية بالبذرة"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from app import simulate_channel, simulate_channel_batch
+
+ENCODED = bytes(range(256)) * 8
+
+
+def test_random_and_erasure_channels_touch_only_masked_bytes():
+    original = np.frombuffer(ENCODED, dtype=np.uint8)
+    for error_type in ("random", "erasures"):
+        corrupted, mask, starts = simulate_channel_batch(ENCODED, error_type, 0.1,
+                                                         np.random.default_rng(1), trials=50)
+        assert corrupted.shape == mask.shape == (50, len(ENCODED)) and starts is None
+        assert np.array_equal(corrupted[~mask], np.broadcast_to(original, mask.shape)[~mask])
+        assert abs(mask.mean() - 0.1) < 0.01
+        if error_type == "erasures":
+            assert not corrupted[mask].any()
+    # المحاولات مستقلة: لا تتكرر مواضع الأخطاء بين الصفوف
+    assert len({row.tobytes() for row in mask}) == 50
+
+
+def test_burst_is_one_contiguous_run_per_trial():
+    corrupted, mask, starts = simulate_channel_batch(ENCODED, "burst", 0.05, np.random.default_rng(2), trials=20)
+    length = int(len(ENCODED) * 0.05)
+    for row, start in zip(mask, starts):
+        assert np.array_equal(np.flatnonzero(row), np.arange(start, start + length))
+
+    _, positions, start = simulate_channel(ENCODED, "burst", 0.05, np.random.default_rng(2))
+    assert positions[0] == start and len(positions) == length
+    details = app._error_details(ENCODED, corrupted[0], positions[:3], "burst", start)
+    assert [d["burst_index"] for d in details] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("error_type", app.ERROR_TYPES)
+def test_zero_rate_and_seed_are_deterministic(error_type):
+    corrupted, positions, _ = simulate_channel(ENCODED, error_type, 0.0, np.random.default_rng(3))
+    assert corrupted.tobytes() == ENCODED and len(positions) == 0
+    runs = [simulate_channel(ENCODED, error_type, 0.2, np.random.default_rng(4)) for _ in range(2)]
+    assert runs[0][0].tobytes() == runs[1][0].tobytes()
+
+
+def test_simulate_endpoint_is_reproducible_with_seed():
+    client = TestClient(app.app)
+    body = {"data": "seeded channel " * 20, "nsym": 16, "error_rate": 0.02, "seed": 99}
+    first, second = (client.post("/api/simulate", json=body).json() for _ in range(2))
+    assert first["analysis"] == second["analysis"]
+    assert first["simulation"]["summary"] == second["simulation"]["summary"]
+    positions = first["analysis"]["channel"]["error_distribution"]["positions"]
+    assert first["simulation"]["summary"]["errors_introduced"] == len(positions) > 0
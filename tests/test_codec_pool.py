@@ -0,0 +1,47 @@
+"""زمن الطلبات الصغيرة أثناء فك ترميز رسالة كبيرة في مجمع العمال"""
+import asyncio
+import time
+
+import numpy as np
+
+from app import CodecPool, _decode_job, _encode_job
+
+
+def _corrupted_message(size: int, nsym: int, errors: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    encoded = bytearray(_encode_job(data, nsym, "reedsolo"))
+    for start in range(0, len(encoded), 255):
+        length = min(255, len(encoded) - start)
+        for position in rng.choice(length, size=min(errors, length), replace=False):
+            encoded[start + position] ^= 0x5a
+    return data, bytes(encoded)
+
+
+def test_small_requests_not_blocked_by_large_reedsolo_decode():
+    pool = CodecPool(kind="thread", workers=2)
+    data, corrupted = _corrupted_message(40000, 32, 16)
+
+    async def scenario():
+        big = asyncio.ensure_future(pool.execute(_decode_job, corrupted, 32, None, "reedsolo"))
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+        latencies = []
+        while not big.done():
+            start = time.perf_counter()
+            encoded = await pool.execute(_encode_job, b"small message", 10, "reedsolo")
+            decoded, _, _ = await pool.execute(_decode_job, encoded, 10, None, "reedsolo")
+            latencies.append(time.perf_counter() - start)
+            assert decoded == b"small message"
+        result = await big
+        return latencies, time.perf_counter() - started, result
+
+    try:
+        latencies, big_time, (decoded, corrected, path) = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert decoded == data and path == "errors_only" and corrected > 0
+    # قفل الرسالة الكاملة كان يجعل الطلب الأول ينتظر فك الترميز الكبير كله
+    assert len(latencies) >= 10
+    assert max(latencies) < min(0.25, big_time / 4)
@@ -0,0 +1,38 @@
+"""سجل المرمزات المشترك: إعادة الاستخدام والإخلاء بترتيب LRU والعدادات"""
+import pytest
+
+from app import CodecRegistry, NumpyRSCodec
+
+
+def test_lru_eviction_keeps_recently_used():
+    registry = CodecRegistry(maxsize=2)
+    ten = registry.get(10)
+    registry.get(12)
+    assert registry.get(10) is ten
+    registry.get(14)
+    stats = registry.stats()
+    assert [k["nsym"] for k in stats["keys"]] == [10, 14]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+    assert registry.get(12) is not None and registry.stats()["evictions"] == 2
+    assert [k["nsym"] for k in registry.stats()["keys"]] == [14, 12]
+
+
+def test_every_parameter_is_part_of_the_key():
+    registry = CodecRegistry(maxsize=8)
+    base = registry.get(10)
+    variants = [registry.get(10, nsize=200), registry.get(10, fcr=1), registry.get(10, prim=0x187),
+                registry.get(10, generator=3), registry.get(10, backend="numpy")]
+    assert len({id(c) for c in [base, *variants]}) == 6
+    assert isinstance(variants[-1], NumpyRSCodec)
+    assert registry.stats()["hit_rate"] == 0.0
+
+
+def test_unknown_backend_and_clear():
+    registry = CodecRegistry(maxsize=0)
+    assert registry.maxsize == 1
+    with pytest.raises(ValueError):
+        registry.get(10, backend="fpga")
+    registry.get(10)
+    registry.clear()
+    assert registry.stats() == {"size": 0, "max_size": 1, "hits": 0, "misses": 0, "evictions": 0,
+                                "hit_rate": 0.0, "keys": []}
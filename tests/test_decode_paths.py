@@ -0,0 +1,79 @@
+"""اختيار مسار فك الترميز: فحص المتلازمات، المحو فقط، ثم المسار الكامل"""
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+client = TestClient(app.app)
+NSYM = 16
+
+
+def _message(size: int = 700) -> tuple:
+    data = np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    return data, bytearray(RSCodec(NSYM).encode(data))
+
+
+def _decode(encoded: bytes, backend: str, erasures=None, interleave: int = 1) -> dict:
+    response = client.post("/api/decode", json={
+        "encoded_data": base64.b64encode(bytes(encoded)).decode(), "nsym": NSYM,
+        "erasures": erasures, "backend": backend, "interleave": interleave
+    }, headers={"Cache-Control": "no-cache"})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("backend", ["reedsolo", "numpy"])
+def test_path_selection(backend):
+    data, clean = _message()
+    body = _decode(clean, backend)
+    assert body["data"]["correction"]["decode_path"] == "syndrome_clean"
+
+    errors = bytearray(clean)
+    errors[10] ^= 1
+    errors[300] ^= 2
+    body = _decode(errors, backend)
+    assert body["data"]["correction"]["decode_path"] == "errors_only"
+    assert body["data"]["correction"]["errors_corrected"] == 2
+
+    # حتى nsym محواً في الكلمة تُصحح بمسار المحو فقط دون البحث عن أخطاء
+    erased = bytearray(clean)
+    positions = list(range(20, 20 + NSYM)) + [260, 600]
+    for p in positions:
+        erased[p] = 0
+    body = _decode(erased, backend, positions)
+    assert body["data"]["correction"]["decode_path"] == "erasures_only"
+    assert base64.b64decode(body["data"]["decoded"]["bytes_base64"]) == data
+
+    # خطأ مجهول إضافي يُفشل المحو فقط فيُعاد بالمسار الكامل
+    mixed = bytearray(clean)
+    for p in (1, 2, 3, 4):
+        mixed[p] = 0
+    mixed[100] ^= 0x77
+    body = _decode(mixed, backend, [1, 2, 3, 4])
+    assert body["data"]["correction"]["decode_path"] == "errors_and_erasures"
+    assert base64.b64decode(body["data"]["decoded"]["bytes_base64"]) == data
+
+
+def test_interleaved_erasures_use_the_same_paths():
+    data = b"interleaved erasures " * 60
+    encoded = bytearray(client.post("/api/encode/raw?nsym=16&interleave=3", content=data).content)
+    positions = list(range(100, 140))
+    for p in positions:
+        encoded[p] = 0
+    body = _decode(encoded, "numpy", positions, interleave=3)
+    assert body["data"]["correction"]["decode_path"] == "erasures_only"
+    assert base64.b64decode(body["data"]["decoded"]["bytes_base64"]) == data
+
+
+def test_simulated_erasure_channel_passes_positions_to_the_decoder():
+    response = client.post("/api/simulate", json={
+        "data": "erasure channel " * 30, "nsym": NSYM, "error_type": "erasures",
+        "error_rate": 0.04, "seed": 2
+    }, headers={"Cache-Control": "no-cache"})
+    summary = response.json()["simulation"]["summary"]
+    assert summary["data_recovered"]
+    assert summary["decode_path"] == "erasures_only"
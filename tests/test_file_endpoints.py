@@ -0,0 +1,49 @@
+"""رفع الملفات: تحديد الكلمة الفاشلة بدقة ومسار فك الترميز عبر الكتل"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "FILE_BLOCK_CODEWORDS", 8)
+    with TestClient(app.app) as client:
+        yield client
+
+
+def _encoded(size: int, nsym: int) -> tuple:
+    data = np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    return data, bytearray(RSCodec(nsym).encode(data))
+
+
+@pytest.mark.parametrize("failing", [0, 7, 8, 21, 36])
+def test_uncorrectable_codeword_index_in_multi_block_upload(client, failing):
+    nsym = 10
+    data, encoded = _encoded(37 * 245 - 100, nsym)  # 37 كلمة في 5 كتل، الأخيرة قصيرة
+    for codeword in (3, 12, 30):
+        encoded[codeword * 255 + 1] ^= 0x5A  # أخطاء قابلة للتصحيح في كتل أخرى
+    start = failing * 255
+    for offset in range(nsym):
+        encoded[start + offset] ^= 0xFF
+
+    response = client.post("/api/decode/file?nsym=10", files={"file": ("data.rs", bytes(encoded))})
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "RS_UNCORRECTABLE"
+    assert error["codeword"] == failing
+
+
+def test_decode_path_is_heaviest_block_path(client):
+    data, encoded = _encoded(20 * 245, 10)
+    encoded[17 * 255 + 3] ^= 1  # كلمة تالفة واحدة في الكتلة الثالثة، بقية الكتل سليمة
+    response = client.post("/api/decode/file?nsym=10", files={"file": ("data.rs", bytes(encoded))})
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["x-rs-decode-path"] == "errors_only"
+    assert response.headers["x-rs-errors-corrected"] == "1"
+
+    response = client.post("/api/decode/file?nsym=10", files={"file": ("data.rs", bytes(RSCodec(10).encode(data)))})
+    assert response.headers["x-rs-decode-path"] == "syndrome_clean"
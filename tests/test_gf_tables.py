@@ -0,0 +1,63 @@
+"""ملف جداول GF(256) المربوط بالذاكرة: عروض دون نسخ والرجوع إلى الحساب عند تعذر الكتابة"""
+import numpy as np
+import pytest
+import reedsolo
+from reedsolo import RSCodec
+
+import rs_engine
+from rs_engine import GaloisField, NumpyRSCodec, TabledRSCodec, load_tables
+
+
+@pytest.fixture
+def restore_tables():
+    saved = rs_engine._tables
+    yield
+    rs_engine._tables = saved
+    rs_engine.get_field.cache_clear()
+
+
+def test_tables_are_views_into_the_mapped_file(tmp_path, restore_tables):
+    tables = load_tables(str(tmp_path / "cache" / "gf256_tables.bin"))
+    assert tables is not None and tables.path.startswith(str(tmp_path))
+    raw = np.memmap(tables.path, dtype=np.uint8, mode="r")
+
+    gf = GaloisField()
+    for table in (gf.exp, gf.log, gf.mul_table, gf.generator_poly(32)):
+        assert isinstance(table, np.memmap) and table.filename == raw.filename
+    codec = TabledRSCodec(32)
+    assert isinstance(codec.gf_exp, memoryview) and isinstance(codec.gen[32], memoryview)
+
+    data = bytes(range(256)) * 3
+    encoded = bytes(RSCodec(32).encode(data))
+    assert bytes(codec.encode(data)) == encoded == bytes(NumpyRSCodec(32).encode(data))
+    corrupted = bytearray(encoded)
+    corrupted[5] ^= 1
+    assert bytes(codec.decode(bytes(corrupted))[0]) == bytes(NumpyRSCodec(32).decode(bytes(corrupted))[0]) == data
+
+
+def test_unwritable_path_falls_back_to_computed_tables(tmp_path, restore_tables):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_bytes(b"")
+    assert load_tables(str(blocker / "gf256_tables.bin")) is None
+    # الرجوع لا يمس الجداول المحمّلة سابقاً؛ الحقل المحسوب يعطي النتائج نفسها
+    rs_engine._tables = None
+    rs_engine.get_field.cache_clear()
+    assert GaloisField().tables is None
+    assert bytes(NumpyRSCodec(10).encode(b"abc")) == bytes(RSCodec(10).encode(b"abc"))
+
+
+def test_default_path_is_outside_the_source_tree():
+    source_dir = rs_engine.os.path.dirname(rs_engine.os.path.abspath(rs_engine.__file__))
+    assert not rs_engine.TABLES_FILE.startswith(source_dir + rs_engine.os.sep)
+
+
+def test_tabled_codec_survives_a_wide_reedsolo_codec(tmp_path, restore_tables, monkeypatch):
+    for name in ("gf_exp", "gf_log", "field_charac", "_bytearray"):
+        monkeypatch.setattr(reedsolo, name, getattr(reedsolo, name))
+    load_tables(str(tmp_path / "gf256_tables.bin"))
+    codec = TabledRSCodec(10)
+    expected = bytes(NumpyRSCodec(10).encode(b"after wide"))
+    # بناء RSCodec بحقل GF(2^16) يستبدل الدوال العامة في reedsolo دون علم المرمزات الأخرى
+    RSCodec(4, nsize=300, prim=rs_engine.WIDE_PRIM, c_exp=16)
+    assert bytes(codec.encode(b"after wide")) == expected
+    assert bytes(codec.decode(expected)[0]) == b"after wide"
@@ -0,0 +1,40 @@
+"""مهمة المحاكاة المجزأة: نتيجة مطابقة لـ /api/simulate وتقدم بحدود الكلمات"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "JOB_CHUNK_CODEWORDS", 8)
+    with TestClient(app.app) as client:
+        yield client
+
+
+def _wait(client, job_id: str) -> dict:
+    while (job := client.get(f"/api/jobs/{job_id}").json())["status"] in app.JOB_ACTIVE:
+        time.sleep(0.01)
+    return job
+
+
+@pytest.mark.parametrize("error_type,error_rate", [
+    ("random", 0.0), ("random", 0.03), ("random", 0.2), ("burst", 0.02), ("erasures", 0.05)
+])
+@pytest.mark.parametrize("params", [{"nsym": 16}, {"profile": "wide"}, {"nsym": 16, "interleave": 3}])
+def test_chunked_simulate_job_matches_simulate(client, params, error_type, error_rate):
+    body = {"data": "reed-solomon " * 700, "error_type": error_type, "error_rate": error_rate,
+            "seed": 11, **params}
+    submitted = client.post("/api/jobs/simulate", json=body)
+    assert submitted.status_code == 202
+    job = _wait(client, submitted.json()["job_id"])
+    reference = client.post("/api/simulate", json=body, headers={"Cache-Control": "no-cache"}).json()
+
+    assert job["status"] == "succeeded"
+    summary = reference["simulation"]["summary"]
+    assert job["result"]["simulation"]["summary"] == summary
+    assert job["result"]["analysis"]["errors"] == reference["analysis"]["errors"]
+    # كل كلمة تُعد مرة عند ترميزها ومرة عند تصحيحها
+    assert job["progress"]["total"] == 2 * summary["codewords"] == job["progress"]["completed"]
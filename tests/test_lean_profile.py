@@ -0,0 +1,51 @@
+"""الملف المختصر: شكل الاستجابة لكل نقطة وطرق طلبه"""
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+client = TestClient(app.app)
+LEAN_REQUESTS = [{"params": {"profile": "lean"}}, {"headers": {"X-RS-Profile": "lean"}},
+                 {"headers": {"Prefer": "return=minimal"}}]
+
+
+@pytest.mark.parametrize("lean", LEAN_REQUESTS)
+def test_lean_encode_and_decode_shape(lean):
+    encoded = client.post("/api/encode", json={"data": "lean body", "nsym": 8}, **lean)
+    assert encoded.headers["content-type"] == "application/json"
+    body = json.loads(encoded.content)
+    expected = bytes(RSCodec(8).encode(b"lean body"))
+    assert body == {"status": "success", "encoded_base64": base64.b64encode(expected).decode(),
+                    "length_bytes": len(expected), "nsym": 8}
+
+    corrupted = bytearray(expected)
+    corrupted[2] ^= 0x10
+    decoded = client.post("/api/decode", json={"encoded_data": base64.b64encode(bytes(corrupted)).decode(),
+                                               "nsym": 8}, **lean).json()
+    assert decoded == {"status": "success", "decoded_base64": base64.b64encode(b"lean body").decode(),
+                       "length_bytes": 9, "errors_corrected": 1, "decode_path": "errors_only"}
+
+
+def test_lean_uncorrectable_and_simulate_shape():
+    lean = {"X-RS-Profile": "lean"}
+    broken = base64.b64encode(bytes(20)[:10] + bytes(range(1, 11))).decode()
+    body = client.post("/api/decode", json={"encoded_data": broken, "nsym": 4}, headers=lean).json()
+    assert body == {"status": "uncorrectable", "code": "RS_UNCORRECTABLE", "max_correctable": 2}
+
+    body = client.post("/api/simulate", json={"data": "lean simulate", "nsym": 10, "error_rate": 0.0,
+                                              "seed": 1}, headers=lean).json()
+    assert set(body) == {"status", "data_recovered", "errors_introduced", "errors_corrected",
+                         "encoded_size", "decode_path"}
+    assert body["data_recovered"] and body["encoded_size"] == len("lean simulate") + 10
+
+
+def test_full_profile_is_the_default():
+    body = client.post("/api/encode", json={"data": "full", "nsym": 8}).json()
+    assert {"status", "data", "metadata"} <= set(body)
+    explicit = client.post("/api/encode", json={"data": "full", "nsym": 8},
+                           headers={"X-RS-Profile": "full", "Prefer": "return=minimal"}).json()
+    assert set(explicit) == set(body)
@@ -0,0 +1,64 @@
+"""أداة الحِمل ومعاملات التشغيل: المئينات وأجسام الطلبات والحلقتان المفتوحة والمغلقة"""
+import base64
+import json
+import socket
+import threading
+
+import pytest
+import uvicorn
+from reedsolo import RSCodec
+
+import app
+import loadtest
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app.app, host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{port}"
+    loadtest.wait_healthy(url, timeout=10)
+    yield url
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+def test_latency_summary_percentiles():
+    stats = loadtest.latency_summary([float(i) for i in range(1, 101)])
+    assert stats == {"samples": 100, "mean_ms": 50.5, "p50_ms": 51.0, "p90_ms": 91.0,
+                     "p99_ms": 100.0, "max_ms": 100.0}
+    assert loadtest.latency_summary([3.0])["p99_ms"] == 3.0
+
+
+def test_server_args(monkeypatch):
+    args = app._server_args([])
+    assert (args.production, args.workers, args.backlog) == (False, 0, 2048)
+    monkeypatch.setenv("RS_PORT", "9100")
+    monkeypatch.setenv("RS_SERVER_WORKERS", "3")
+    args = app._server_args(["--production", "--host", "127.0.0.1"])
+    assert (args.production, args.host, args.port, args.workers) == (True, "127.0.0.1", 9100, 3)
+
+
+def test_build_requests_produce_correctable_bodies(server_url):
+    bodies, headers = loadtest.build_requests(server_url, 300, 10, lean=True, cache=False, seed=5)
+    assert [path for path, _ in bodies.values()] == ["/api/encode?profile=lean", "/api/decode?profile=lean",
+                                                     "/api/simulate?profile=lean"]
+    assert headers["decode"]["Cache-Control"] == "no-cache" and "Cache-Control" not in headers["encode"]
+    decode = json.loads(bodies["decode"][1])
+    text = json.loads(bodies["encode"][1])["data"]
+    decoded, _, errata = RSCodec(10).decode(base64.b64decode(decode["encoded_data"]))
+    assert bytes(decoded) == text.encode() and len(errata) == 5
+
+
+def test_open_and_closed_loop_against_live_server(server_url):
+    target = loadtest.Target(server_url, *loadtest.build_requests(server_url, 100, 8, True, True, 1))
+    assert target.send("encode") and target.send("decode")
+    report = loadtest.open_loop(target, list(loadtest.ENDPOINTS), qps=60, duration=0.5, concurrency=4)
+    assert report["requests"] == 30
+    assert all(report["endpoints"][name]["errors"] == 0 for name in loadtest.ENDPOINTS)
+    peak = loadtest.saturation(target, ["encode"], 0.3, 2)
+    assert peak["throughput_qps"] > 0 and peak["errors"] == 0
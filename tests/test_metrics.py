@@ -0,0 +1,77 @@
+"""نقطة /metrics: مدرجات المراحل وعدادات النتائج بصيغة Prometheus"""
+import base64
+import re
+
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+from app import Counter, Histogram
+
+client = TestClient(app.app)
+SAMPLE = re.compile(r"^(\w+)(\{.*\})? (\S+)$")
+
+
+def _samples() -> dict:
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if not line.startswith("#"):
+            name, labels, value = SAMPLE.match(line).groups()
+            samples[name + (labels or "")] = float(value)
+    return samples
+
+
+def _decode(payload: bytes, nsym: int = 8):
+    return client.post("/api/decode", json={"encoded_data": base64.b64encode(payload).decode(), "nsym": nsym})
+
+
+def test_stage_histograms_cover_each_endpoint():
+    before = _samples()
+    client.post("/api/encode", json={"data": "metrics stages", "nsym": 8})
+    after = _samples()
+    for stage in ("parse", "codec_lookup", "queue_wait", "encode", "serialize", "other"):
+        key = f'rs_stage_duration_seconds_count{{endpoint="/api/encode",stage="{stage}"}}'
+        assert after[key] - before.get(key, 0) == 1
+    key = 'rs_request_duration_seconds_count{endpoint="/api/encode"}'
+    assert after[key] - before.get(key, 0) == 1
+    assert after['rs_request_duration_seconds_bucket{endpoint="/api/encode",le="+Inf"}'] == after[key]
+
+
+def test_outcome_and_path_counters():
+    rsc = RSCodec(8)
+    clean = bytes(rsc.encode(b"metrics clean"))
+    corrected = bytearray(rsc.encode(b"metrics corrected"))
+    corrected[3] ^= 0x40
+    broken = bytearray(rsc.encode(b"metrics broken"))
+    for pos in range(0, 12, 2):
+        broken[pos] ^= 0xff
+
+    before = _samples()
+    assert _decode(clean).status_code == 200
+    assert _decode(bytes(corrected)).status_code == 200
+    assert _decode(bytes(broken)).json()["status"] == "uncorrectable"
+    after = _samples()
+
+    def delta(key):
+        return after.get(key, 0) - before.get(key, 0)
+
+    for outcome in ("clean", "corrected", "uncorrectable"):
+        assert delta(f'rs_codec_operations_total{{operation="decode",nsym="8",outcome="{outcome}"}}') == 1
+    assert delta('rs_decode_path_total{path="errors_only"}') == 1
+    assert 'rs_pool_workers' in after and 'rs_codec_cache_size' in after
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("h", "help", ("endpoint",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, endpoint="/x")
+    lines = histogram.render()
+    assert 'h_bucket{endpoint="/x",le="0.1"} 1' in lines
+    assert 'h_bucket{endpoint="/x",le="1.0"} 2' in lines
+    assert 'h_bucket{endpoint="/x",le="+Inf"} 3' in lines and 'h_count{endpoint="/x"} 3' in lines
+
+    counter = Counter("c", "help", ("path",))
+    counter.inc(path='a"b')
+    assert counter.render()[-1] == 'c{path="a\\"b"} 1'
@@ -0,0 +1,68 @@
+"""قياس الأداء: أدوات benchmark.py وحمولتا /api/capabilities و /api/performance"""
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+import benchmark
+
+client = TestClient(app.app)
+
+
+@pytest.fixture
+def results_file(tmp_path, monkeypatch):
+    path = tmp_path / "benchmark_results.json"
+    monkeypatch.setattr(app, "BENCHMARK_RESULTS", str(path))
+    monkeypatch.setattr(app, "_benchmark_cache", {"mtime": None, "data": None})
+    return path
+
+
+def test_percentile_summary_and_error_injection():
+    stats = benchmark.percentile_summary([1.0, 2.0, 3.0, 4.0], 1_000_000)
+    assert (stats["samples"], stats["p50_ms"], stats["mean_ms"]) == (4, 2.5, 2.5)
+    assert stats["throughput_mbps"] == 400.0
+
+    rsc = RSCodec(16)
+    encoded = bytes(rsc.encode(bytes(1000)))
+    corrupted = benchmark.inject_errors(encoded, 16, 255, 1.0, np.random.default_rng(0))
+    assert sum(a != b for a, b in zip(encoded, corrupted)) == 8 * 5
+    assert bytes(rsc.decode(corrupted)[0]) == bytes(1000)
+    assert benchmark.inject_errors(encoded, 16, 255, 0.0, np.random.default_rng(0)) == encoded
+
+
+def test_compare_flags_only_drops_beyond_threshold():
+    row = {"backend": "numpy", "operation": "decode", "size": 1024, "nsym": 10, "error_load": 1.0}
+    baseline = {"results": [{**row, "throughput_mbps": 100.0}]}
+    report = benchmark.compare([{**row, "throughput_mbps": 85.0}], baseline, 0.2)
+    assert report[0]["regression"] is False and report[0]["change"] == -0.15
+    report = benchmark.compare([{**row, "throughput_mbps": 70.0}, {**row, "size": 1, "throughput_mbps": 1.0}],
+                               baseline, 0.2)
+    assert len(report) == 1 and report[0]["regression"] is True
+
+
+def test_capabilities_lists_backends():
+    body = client.get("/api/capabilities").json()
+    assert body["capabilities"]["backends"] == {"available": list(app.CODEC_BACKENDS),
+                                                "default": app.DEFAULT_BACKEND}
+    assert body["capabilities"]["performance"]["measured"] == "/api/performance"
+
+
+def test_performance_without_results_reports_live_traffic(results_file):
+    client.post("/api/encode", json={"data": "live", "nsym": 8})
+    body = client.get("/api/performance").json()
+    assert body["benchmarks"]["available"] is False
+    live = body["performance"]["live"]["/api/encode"]
+    assert live["requests_total"] >= 1 and live["p50_ms"] > 0
+
+
+def test_performance_serves_measured_results(results_file):
+    results = benchmark.run_benchmarks(["numpy", "reedsolo"], [256], [10], [0.0, 1.0], 1, 0.0, log=lambda _: None)
+    results_file.write_text(json.dumps({"environment": benchmark.environment(), "results": results}))
+    body = client.get("/api/performance").json()["benchmarks"]
+    assert body["available"] is True and body["source"] == "benchmark_results.json"
+    assert set(body["summary"]) == {"numpy/encode", "numpy/decode", "reedsolo/encode", "reedsolo/decode"}
+    assert body["summary"]["numpy/decode"]["p50_ms_by_size"]["256"] == results[1]["p50_ms"]
+    assert len(body["results"]) == 6
@@ -0,0 +1,50 @@
+"""ملفات تعريف الأكواد المسماة: التطابق البايتي مع reedsolo بنفس المعاملات"""
+import base64
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+client = TestClient(app.app)
+REFERENCE = {
+    "dvb": RSCodec(16, nsize=204),
+    "ccsds": RSCodec(32, nsize=255, fcr=112, prim=0x187, generator=0xad),
+    "qr-v1-m": RSCodec(10, nsize=26),
+    "cd-c1": RSCodec(4, nsize=32),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REFERENCE))
+def test_profile_encoding_matches_reedsolo(name):
+    data = random.Random(name).randbytes(500)
+    expected = bytes(REFERENCE[name].encode(data))
+    raw = client.post(f"/api/encode/raw?profile={name}", content=data)
+    assert raw.status_code == 200 and raw.content == expected
+
+    text = data.hex()
+    body = client.post("/api/encode", json={"data": text, "profile": name}, headers={"X-RS-Profile": "lean"}).json()
+    assert base64.b64decode(body["encoded_base64"]) == bytes(REFERENCE[name].encode(text.encode()))
+
+
+@pytest.mark.parametrize("name", ["dvb", "ccsds"])
+def test_profile_corrects_up_to_capacity(name):
+    code = app.CODE_PROFILES[name]["code"]
+    data = random.Random(7).randbytes(code.nsize - code.nsym)
+    corrupted = bytearray(REFERENCE[name].encode(data))
+    for pos in random.Random(name).sample(range(len(corrupted)), code.nsym // 2):
+        corrupted[pos] ^= 0x5a
+    decoded = client.post(f"/api/decode/raw?profile={name}", content=bytes(corrupted))
+    assert decoded.status_code == 200 and decoded.content == data
+    assert decoded.headers["X-RS-Errors-Corrected"] == str(code.nsym // 2)
+    assert bytes(REFERENCE[name].decode(bytes(corrupted))[0]) == data
+
+
+def test_profile_listing_and_unknown_profile():
+    profiles = client.get("/api/profiles").json()["profiles"]
+    assert set(profiles) == set(app.CODE_PROFILES)
+    assert profiles["ccsds"]["max_errors_correctable"] == 16
+    response = client.post("/api/encode/raw?profile=nope", content=b"x")
+    assert response.status_code == 400
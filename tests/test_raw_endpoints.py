@@ -0,0 +1,75 @@
+"""النقاط الثنائية والتدفقية: تطابق بايتاً ببايت مع reedsolo.RSCodec"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+SIZES = [0, 1, 244, 245, 246, 3000, 70001]
+
+
+def _data(size: int) -> bytes:
+    return np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8).tobytes()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "STREAM_BLOCK_CODEWORDS", 8)
+    with TestClient(app.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("backend", ["reedsolo", "numpy"])
+def test_raw_round_trip_matches_reedsolo(client, size, backend):
+    data = _data(size)
+    expected = bytes(RSCodec(10).encode(data))
+    encoded = client.post(f"/api/encode/raw?nsym=10&backend={backend}", content=data)
+    assert encoded.status_code == 200
+    assert encoded.headers["content-type"] == "application/octet-stream"
+    assert encoded.content == expected
+    assert encoded.headers["x-rs-encoded-length"] == str(len(expected))
+
+    corrupted = bytearray(expected)
+    for start in range(0, len(corrupted), 255):
+        corrupted[start] ^= 0x42
+    decoded = client.post("/api/decode/raw", headers={"X-RS-Nsym": "10", "X-RS-Backend": backend},
+                          content=bytes(corrupted))
+    assert decoded.status_code == 200
+    assert decoded.content == data
+    assert decoded.headers["x-rs-errors-corrected"] == str(-(-len(expected) // 255))
+
+
+def test_raw_erasures_and_code_parameters(client):
+    data = _data(600)
+    ref = RSCodec(16, 200, fcr=1)
+    encoded = bytearray(ref.encode(data))
+    assert client.post("/api/encode/raw?nsym=16&nsize=200&fcr=1", content=data).content == bytes(encoded)
+    for position in (0, 5, 9, 250):
+        encoded[position] = 0
+    decoded = client.post("/api/decode/raw?nsym=16&nsize=200&fcr=1&erasures=0,5,9,250", content=bytes(encoded))
+    assert decoded.content == data
+    assert decoded.headers["x-rs-erasures-provided"] == "4"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_stream_round_trip_matches_reedsolo(client, size):
+    data = _data(size)
+    expected = bytes(RSCodec(16).encode(data))
+    encoded = client.post("/api/encode/stream?nsym=16", content=data)
+    assert encoded.headers["x-rs-codeword-size"] == "255"
+    assert encoded.headers["x-rs-data-per-codeword"] == "239"
+    assert encoded.content == expected
+
+    corrupted = bytearray(expected)
+    for start in range(3, len(corrupted), 255):
+        corrupted[start] ^= 0x99
+    assert client.post("/api/decode/stream?nsym=16", content=bytes(corrupted)).content == data
+
+
+def test_wide_stream_matches_raw(client):
+    data = _data(300001)
+    raw = client.post("/api/encode/raw?profile=wide", content=data).content
+    assert client.post("/api/encode/stream?profile=wide", content=data).content == raw
+    assert client.post("/api/decode/stream?profile=wide", content=raw).content == data
@@ -0,0 +1,25 @@
+"""ذاكرة النتائج: معطلة افتراضياً، ومحدودة بالبايتات مع إخلاء LRU عند تفعيلها"""
+import app
+from app import _CACHE_ENTRY_OVERHEAD, ResultCache
+
+
+def test_disabled_by_default():
+    if "RS_RESULT_CACHE_BYTES" not in app.os.environ:
+        assert app.RESULT_CACHE_BYTES == 0
+    cache = ResultCache(max_bytes=0)
+    assert not cache.enabled
+    cache.put(cache.key("decode", b"x"), b"y", 1)
+    assert cache.stats()["entries"] == 0
+
+
+def test_bounded_lru_eviction():
+    entry = 100 + _CACHE_ENTRY_OVERHEAD
+    cache = ResultCache(max_bytes=2 * entry, ttl=60)
+    keys = [cache.key("decode", bytes([i])) for i in range(3)]
+    cache.put(keys[0], "a", 100)
+    cache.put(keys[1], "b", 100)
+    assert cache.get(keys[0]) == "a"  # يصبح الأحدث استخداماً
+    cache.put(keys[2], "c", 100)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a" and cache.get(keys[2]) == "c"
+    assert cache.bytes == 2 * entry and cache.evictions == 1
@@ -0,0 +1,131 @@
+"""مقارنة تفاضلية لمحرك numpy والمشابك مع reedsolo.RSCodec"""
+import numpy as np
+import pytest
+from reedsolo import RSCodec, ReedSolomonError
+
+from rs_engine import NumpyRSCodec, TabledRSCodec, interleave_decode, interleave_encode
+
+# (nsym, nsize, fcr, prim, generator)
+CODES = [
+    (2, 255, 0, 0x11d, 2),
+    (10, 255, 0, 0x11d, 2),
+    (32, 255, 0, 0x11d, 2),
+    (16, 40, 0, 0x11d, 2),
+    (8, 255, 1, 0x11d, 2),
+    (10, 255, 120, 0x187, 2),
+    (6, 255, 0, 0x11d, 9),
+    (12, 100, 5, 0x11d, 19),
+    (32, 255, 112, 0x187, 0xad),
+]
+
+
+def _outcome(fn, *args, **kwargs):
+    """النتيجة كبايتات قابلة للمقارنة، أو نوع الاستثناء"""
+    try:
+        return tuple(bytes(part) for part in fn(*args, **kwargs))
+    except (ReedSolomonError, ValueError, IndexError) as e:
+        return type(e)
+
+
+def _corrupt(rng, encoded: bytes, errors: int, erasures: int, nsize: int):
+    """errors خطأ و erasures محو في كل كلمة؛ يُرجع (البايتات، مواضع المحو)"""
+    out = bytearray(encoded)
+    erase_pos = []
+    for start in range(0, len(out), nsize):
+        length = min(nsize, len(out) - start)
+        picks = rng.choice(length, size=min(errors + erasures, length), replace=False) + start
+        for p in picks:
+            out[p] ^= int(rng.integers(1, 256))
+        erase_pos.extend(int(p) for p in picks[errors:])
+    return bytes(out), sorted(erase_pos)
+
+
+@pytest.mark.parametrize("nsym,nsize,fcr,prim,generator", CODES)
+def test_encode_and_check_match_reedsolo(nsym, nsize, fcr, prim, generator):
+    rng = np.random.default_rng(nsym * 1000 + nsize)
+    ref = RSCodec(nsym, nsize, fcr, prim, generator)
+    codecs = [NumpyRSCodec(nsym, nsize, fcr, prim, generator),
+              TabledRSCodec(nsym, nsize, fcr, prim, generator)]
+    messages = [rng.integers(0, 256, size=n, dtype=np.uint8).tobytes()
+                for n in (1, nsize - nsym - 1, nsize - nsym, nsize - nsym + 1, 3 * nsize + 7, 2000)]
+    expected = [bytes(ref.encode(m)) for m in messages]
+    for codec in codecs:
+        assert [bytes(codec.encode(m)) for m in messages] == expected
+        for encoded in expected:
+            assert list(codec.check(encoded)) == ref.check(encoded)
+    batch = NumpyRSCodec(nsym, nsize, fcr, prim, generator)
+    assert [bytes(e) for e in batch.encode_batch(messages)] == expected
+    corrupted = [_corrupt(rng, e, 1, 0, nsize)[0] for e in expected]
+    assert [list(mask) for mask in batch.check_batch(corrupted)] == [ref.check(c) for c in corrupted]
+
+
+@pytest.mark.parametrize("nsym,nsize,fcr,prim,generator", CODES)
+def test_decode_matches_reedsolo(nsym, nsize, fcr, prim, generator):
+    rng = np.random.default_rng(nsym * 7 + fcr)
+    ref = RSCodec(nsym, nsize, fcr, prim, generator)
+    codecs = [NumpyRSCodec(nsym, nsize, fcr, prim, generator),
+              TabledRSCodec(nsym, nsize, fcr, prim, generator)]
+    cases = []
+    for trial in range(40):
+        data = rng.integers(0, 256, size=int(rng.integers(1, 3 * nsize)), dtype=np.uint8).tobytes()
+        encoded = bytes(ref.encode(data))
+        # من ضمن القدرة حتى تجاوزها: يجب أن يتطابق سوء التصحيح والفشل أيضاً
+        errors = int(rng.integers(0, nsym // 2 + 2))
+        erasures = int(rng.integers(0, max(1, nsym - 2 * errors + 2)))
+        corrupted, erase_pos = _corrupt(rng, encoded, errors, erasures, nsize)
+        cases.append((corrupted, erase_pos or None))
+
+    for corrupted, erase_pos in cases:
+        for only_erasures in (False, True):
+            expected = _outcome(ref.decode, corrupted, erase_pos=erase_pos, only_erasures=only_erasures)
+            for codec in codecs:
+                assert _outcome(codec.decode, corrupted, erase_pos=erase_pos,
+                                only_erasures=only_erasures) == expected
+
+    batch = NumpyRSCodec(nsym, nsize, fcr, prim, generator)
+    for result, (corrupted, erase_pos) in zip(batch.decode_batch(cases), cases):
+        expected = _outcome(ref.decode, corrupted, erase_pos=erase_pos)
+        actual = type(result) if isinstance(result, Exception) else tuple(bytes(p) for p in result)
+        assert actual == expected
+
+
+@pytest.mark.parametrize("depth", [2, 4, 7])
+def test_interleave_round_trip_corrects_bursts(depth):
+    rng = np.random.default_rng(depth)
+    nsym = 10
+    numpy_codec, reference = NumpyRSCodec(nsym), TabledRSCodec(nsym)
+    for size in (1, depth - 1, 500, 3000):
+        data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+        encoded = interleave_encode(numpy_codec, data, depth)
+        assert interleave_encode(reference, data, depth) == encoded
+        assert interleave_decode(numpy_codec, encoded, depth) == (data, 0)
+        if size < depth * nsym:
+            # الصفوف القصيرة أو الفارغة لا توزع الانفجار؛ الرحلة الكاملة وحدها
+            continue
+
+        # انفجار بطول depth × nsym/2 يُوزَّع على الصفوف فيبقى ضمن قدرة كل كلمة
+        burst = min(len(encoded), depth * (nsym // 2))
+        start = int(rng.integers(0, len(encoded) - burst + 1))
+        corrupted = bytearray(encoded)
+        for p in range(start, start + burst):
+            corrupted[p] ^= 0xa5
+        for codec in (numpy_codec, reference):
+            decoded, corrected = interleave_decode(codec, bytes(corrupted), depth)
+            assert decoded == data and corrected == burst
+
+        # المحو بمواضع التدفق المشابك: ضعف الطول ممكن
+        erase_pos = list(range(start, min(len(encoded), start + depth * nsym)))
+        erased = bytearray(encoded)
+        for p in erase_pos:
+            erased[p] = 0
+        decoded, _ = interleave_decode(numpy_codec, bytes(erased), depth, erase_pos, only_erasures=True)
+        assert decoded == data
+
+
+def test_interleave_detects_uncorrectable_burst():
+    codec = NumpyRSCodec(4)
+    encoded = bytearray(interleave_encode(codec, bytes(range(200)), 2))
+    for p in range(0, 12):
+        encoded[p] ^= 0xff
+    with pytest.raises(ReedSolomonError):
+        interleave_decode(codec, bytes(encoded), 2)
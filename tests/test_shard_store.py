@@ -0,0 +1,107 @@
+"""مخزن الشظايا: التكافؤ مقابل reedsolo والاستعادة من أي k شظايا والإصلاح"""
+import itertools
+import os
+
+import numpy as np
+import pytest
+from reedsolo import RSCodec, ReedSolomonError
+
+from shard_store import ShardStore, _shard_name
+
+
+def _put(store: ShardStore, tmp_path, data: bytes, k: int, m: int) -> dict:
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+    return store.put_file(str(source), k, m)
+
+
+def _get(store: ShardStore, tmp_path, object_id: str, verify: bool = False):
+    out = tmp_path / "out.bin"
+    info = store.get_to_file(object_id, str(out), verify)
+    return out.read_bytes(), info
+
+
+def _shard_path(store: ShardStore, object_id: str, index: int) -> str:
+    return os.path.join(store.root, object_id, _shard_name(index))
+
+
+@pytest.mark.parametrize("size,k,m", [(0, 2, 1), (1, 3, 2), (1000, 4, 2), (70001, 5, 3), (4096, 1, 0)])
+def test_round_trip_and_parity_match_reedsolo(tmp_path, size, k, m):
+    store = ShardStore(str(tmp_path / "store"), stripe_bytes=1024)
+    data = np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    manifest = _put(store, tmp_path, data, k, m)
+    assert _get(store, tmp_path, manifest["object_id"])[0] == data
+
+    shards = [open(_shard_path(store, manifest["object_id"], i), "rb").read() for i in range(k + m)]
+    if m and size:
+        # كل عمود بايتات عبر الشظايا كلمة RS(k+m, k) نظامية
+        ref = RSCodec(m, nsize=k + m)
+        for column in range(0, manifest["shard_size"], 97):
+            message = bytes(shard[column] for shard in shards[:k])
+            assert bytes(ref.encode(message)) == bytes(shard[column] for shard in shards)
+
+
+def test_any_k_shards_reconstruct(tmp_path):
+    k, m = 3, 2
+    store = ShardStore(str(tmp_path / "store"), stripe_bytes=512)
+    data = np.random.default_rng(1).integers(0, 256, size=5000, dtype=np.uint8).tobytes()
+    object_id = _put(store, tmp_path, data, k, m)["object_id"]
+    originals = {i: open(_shard_path(store, object_id, i), "rb").read() for i in range(k + m)}
+
+    for lost in itertools.chain.from_iterable(itertools.combinations(range(k + m), n) for n in range(m + 1)):
+        for i in lost:
+            os.remove(_shard_path(store, object_id, i))
+        restored, info = _get(store, tmp_path, object_id)
+        assert restored == data
+        assert info["shards_missing"] == list(lost)
+        assert info["reconstructed"] == any(i < k for i in lost)
+        for i in lost:
+            with open(_shard_path(store, object_id, i), "wb") as f:
+                f.write(originals[i])
+
+
+def test_corrupt_shard_is_skipped_when_verifying(tmp_path):
+    store = ShardStore(str(tmp_path / "store"))
+    data = os.urandom(3000)
+    object_id = _put(store, tmp_path, data, 4, 2)["object_id"]
+    with open(_shard_path(store, object_id, 1), "r+b") as f:
+        f.write(b"\x00" * 10)
+
+    assert _get(store, tmp_path, object_id)[0] != data
+    restored, info = _get(store, tmp_path, object_id, verify=True)
+    assert restored == data and info["shards_missing"] == [1] and info["reconstructed"]
+
+
+def test_too_few_shards(tmp_path):
+    store = ShardStore(str(tmp_path / "store"))
+    object_id = _put(store, tmp_path, os.urandom(100), 2, 1)["object_id"]
+    os.remove(_shard_path(store, object_id, 0))
+    os.remove(_shard_path(store, object_id, 2))
+    with pytest.raises(ReedSolomonError):
+        _get(store, tmp_path, object_id)
+    with pytest.raises(ReedSolomonError):
+        store.repair(object_id)
+
+
+def test_repair_rebuilds_missing_and_corrupt_shards(tmp_path):
+    k, m = 4, 3
+    store = ShardStore(str(tmp_path / "store"), stripe_bytes=700)
+    data = os.urandom(20000)
+    manifest = _put(store, tmp_path, data, k, m)
+    object_id = manifest["object_id"]
+    originals = [open(_shard_path(store, object_id, i), "rb").read() for i in range(k + m)]
+
+    os.remove(_shard_path(store, object_id, 0))
+    os.remove(_shard_path(store, object_id, 5))
+    with open(_shard_path(store, object_id, 2), "r+b") as f:
+        f.seek(123)
+        f.write(b"corrupt")
+
+    result = store.repair(object_id)
+    assert result["repaired"] == [0, 2, 5]
+    assert [open(_shard_path(store, object_id, i), "rb").read() for i in range(k + m)] == originals
+    manifest_after, status = store.shard_status(object_id, verify=True)
+    assert status == ["present"] * (k + m)
+    assert [s["sha256"] for s in manifest_after["shards"]] == [s["sha256"] for s in manifest["shards"]]
+    assert store.repair(object_id)["repaired"] == []
+    assert _get(store, tmp_path, object_id)[0] == data
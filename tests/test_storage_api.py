@@ -0,0 +1,62 @@
+"""نقاط تخزين الكائنات: الحفظ ثم فقد شظية ثم الاستعادة والإصلاح عبر HTTP"""
+import os
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from shard_store import ShardStore, _shard_name
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    store = ShardStore(str(tmp_path / "store"), stripe_bytes=1024)
+    monkeypatch.setattr(app, "shard_store", store)
+    with TestClient(app.app) as client:
+        yield client, store
+
+
+def test_put_drop_get_repair(storage):
+    client, store = storage
+    data = random.Random(15).randbytes(10_000)
+    manifest = client.post("/api/storage/objects?k=4&m=2", content=data).json()
+    assert manifest["status"] == "success" and manifest["size"] == len(data)
+    object_id = manifest["object_id"]
+
+    os.remove(os.path.join(store.root, object_id, _shard_name(1)))
+    with open(os.path.join(store.root, object_id, _shard_name(4)), "r+b") as f:
+        f.write(b"\xff\xff")
+
+    status = client.get(f"/api/storage/objects/{object_id}/manifest?verify=true").json()
+    assert [s["status"] for s in status["shards"]] == ["present", "missing", "present", "present",
+                                                       "corrupt", "present"]
+    assert status["recoverable"] is True
+
+    fetched = client.get(f"/api/storage/objects/{object_id}?verify=true")
+    assert fetched.status_code == 200 and fetched.content == data
+    assert fetched.headers["X-RS-Reconstructed"] == "true"
+    assert "4" not in fetched.headers["X-RS-Shards-Used"].split(",")
+
+    repaired = client.post(f"/api/storage/objects/{object_id}/repair").json()
+    assert repaired["repaired"] == [1, 4]
+    status = client.get(f"/api/storage/objects/{object_id}/manifest?verify=true").json()
+    assert all(s["status"] == "present" for s in status["shards"])
+    fetched = client.get(f"/api/storage/objects/{object_id}")
+    assert fetched.content == data and fetched.headers["X-RS-Reconstructed"] == "false"
+
+
+def test_too_many_lost_shards_and_missing_objects(storage):
+    client, store = storage
+    object_id = client.post("/api/storage/objects?k=3&m=1", content=b"x" * 300).json()["object_id"]
+    for index in (0, 2):
+        os.remove(os.path.join(store.root, object_id, _shard_name(index)))
+    response = client.get(f"/api/storage/objects/{object_id}")
+    assert response.status_code == 422 and response.headers["X-RS-Status"] == "RS_UNCORRECTABLE"
+    assert response.json()["error"]["code"] == "RS_UNCORRECTABLE"
+
+    assert client.delete(f"/api/storage/objects/{object_id}").json()["deleted"] is True
+    response = client.get(f"/api/storage/objects/{object_id}/manifest")
+    assert response.status_code == 404 and response.json()["error"]["code"] == "RS_NOT_FOUND"
+    assert client.post("/api/storage/objects?k=0", content=b"x").status_code == 400
+    assert os.listdir(store.root) == []
@@ -0,0 +1,66 @@
+"""نقاط التدفق: سلوك القطع عند كلمة غير قابلة للتصحيح وإطار الحالة الختامي"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec, ReedSolomonError
+
+import app
+
+NSYM = 10
+K = 255 - NSYM
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(app, "STREAM_BLOCK_CODEWORDS", 4)
+
+
+def _message(codewords: int) -> bytes:
+    return np.random.default_rng(codewords).integers(0, 256, size=codewords * K - 17, dtype=np.uint8).tobytes()
+
+
+def _damaged(data: bytes, failing: int) -> bytes:
+    encoded = bytearray(RSCodec(NSYM).encode(data))
+    encoded[2 * 255 + 9] ^= 0x33  # خطأ قابل للتصحيح قبل الكلمة الفاشلة
+    encoded[failing * 255:failing * 255 + NSYM] = bytes(b ^ 0xFF for b in encoded[failing * 255:failing * 255 + NSYM])
+    return bytes(encoded)
+
+
+def _split_frame(body: bytes) -> tuple:
+    frame = app.STATUS_FRAME.unpack(body[-app.STATUS_FRAME.size:])
+    assert frame[0] == app.STATUS_FRAME_MAGIC
+    return body[:-app.STATUS_FRAME.size], frame[1], frame[2]
+
+
+def test_uncorrectable_codeword_aborts_the_stream():
+    # دون إطار الحالة يُقطع التدفق: الاستثناء يصل إلى العميل بدل نهاية نظيفة
+    with TestClient(app.app) as client, pytest.raises(ReedSolomonError):
+        client.post(f"/api/decode/stream?nsym={NSYM}", content=_damaged(_message(12), 6))
+
+
+@pytest.mark.parametrize("failing", [0, 3, 6, 11])
+def test_status_frame_reports_the_failing_codeword(failing):
+    data = _message(12)
+    with TestClient(app.app) as client:
+        response = client.post(f"/api/decode/stream?nsym={NSYM}&status_frame=1", content=_damaged(data, failing))
+    assert response.status_code == 200
+    assert response.headers["x-rs-status-frame"] == str(app.STATUS_FRAME.size)
+    payload, status, value = _split_frame(response.content)
+    assert status == app.STATUS_UNCORRECTABLE
+    assert value == failing
+    # بيانات كل الكلمات قبل الفاشلة سليمة ومرسلة كاملة
+    assert payload == data[:failing * K]
+
+
+def test_status_frame_on_success_counts_the_payload():
+    data = _message(9)
+    with TestClient(app.app) as client:
+        encoded = client.post(f"/api/encode/stream?nsym={NSYM}", headers={"X-RS-Status-Frame": "1"}, content=data)
+        payload, status, value = _split_frame(encoded.content)
+        assert (status, value) == (app.STATUS_OK, len(payload))
+        assert payload == bytes(RSCodec(NSYM).encode(data))
+
+        decoded = client.post(f"/api/decode/stream?nsym={NSYM}&status_frame=true", content=payload)
+    payload, status, value = _split_frame(decoded.content)
+    assert (status, value) == (app.STATUS_OK, len(data))
+    assert payload == data
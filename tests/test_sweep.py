@@ -0,0 +1,35 @@
+"""مسح مونت كارلو: التحقق من أنواع الأخطاء وحدود الثقة"""
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+client = TestClient(app.app)
+
+
+@pytest.mark.parametrize("path", ["/api/simulate/sweep", "/api/jobs/sweep"])
+def test_unknown_error_type_is_rejected(path):
+    response = client.post(path, json={"data": "abc", "error_types": ["random", "nope"], "trials": 10})
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]["message"]
+    if path == "/api/simulate/sweep":
+        assert response.json()["detail"]["code"] == "RS_BAD_REQUEST"
+
+
+def test_known_error_types_report_every_point():
+    response = client.post("/api/simulate/sweep", json={
+        "data": "sweep " * 40, "nsym_values": [8], "error_rates": [0.0, 0.2],
+        "error_types": list(app.ERROR_TYPES), "trials": 64, "seed": 3
+    })
+    assert response.status_code == 200
+    points = response.json()["sweep"]["points"]
+    assert [(p["error_type"], p["error_rate"]) for p in points] == [
+        (error_type, rate) for error_type in app.ERROR_TYPES for rate in (0.0, 0.2)
+    ]
+    for point in points:
+        fer = point["frame_error_rate"]
+        assert fer["ci"][0] <= fer["rate"] <= fer["ci"][1]
+        if point["error_rate"] == 0.0:
+            assert fer["rate"] == 0
+        else:
+            assert fer["rate"] > 0
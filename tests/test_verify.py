@@ -0,0 +1,50 @@
+"""التحقق السريع بالمتلازمات: أرقام الكلمات التالفة دون فك الترميز"""
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import RSCodec
+
+import app
+
+client = TestClient(app.app)
+
+
+def _verify(encoded: bytes, **params) -> dict:
+    response = client.post("/api/verify", json={"encoded_data": base64.b64encode(encoded).decode(), **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("corrupted", [[], [0], [3, 7], [11]])
+def test_corrupted_codeword_indices(corrupted):
+    data = np.random.default_rng(1).integers(0, 256, size=11 * 245 + 30, dtype=np.uint8).tobytes()
+    encoded = bytearray(RSCodec(10).encode(data))
+    for index in corrupted:
+        encoded[index * 255 + 17] ^= 0x01
+    body = _verify(bytes(encoded), nsym=10)
+    assert body["valid"] == (not corrupted)
+    assert body["codewords"] == {
+        "total": 12,
+        "clean": 12 - len(corrupted),
+        "corrupted": len(corrupted),
+        "corrupted_indices": corrupted
+    }
+
+
+def test_parity_damage_and_uncorrectable_damage_are_both_reported():
+    encoded = bytearray(RSCodec(8).encode(b"v" * 600))
+    encoded[254] ^= 0xFF               # تكافؤ الكلمة 0
+    encoded[255:255 + 100] = bytes(100)  # الكلمة 1 خارج قدرة التصحيح
+    assert _verify(bytes(encoded), nsym=8)["codewords"]["corrupted_indices"] == [0, 1]
+
+
+def test_interleaved_and_lean_verify():
+    encoded = bytearray(client.post("/api/encode/raw?nsym=10&interleave=4", content=b"i" * 2000).content)
+    assert _verify(bytes(encoded), nsym=10, interleave=4)["valid"]
+    encoded[50] ^= 1
+    body = client.post("/api/verify", headers={"X-RS-Profile": "lean"},
+                       json={"encoded_data": base64.b64encode(bytes(encoded)).decode(), "nsym": 10,
+                             "interleave": 4}).json()
+    assert body == {"status": "success", "valid": False, "corrupted": 1}
@@ -0,0 +1,100 @@
+"""مرمز GF(2^16): مقارنة رمزية مع reedsolo ورحلات ذهاب وإياب بالبايتات"""
+import numpy as np
+import pytest
+import reedsolo
+from reedsolo import RSCodec, ReedSolomonError
+
+from rs_engine import WIDE_PRIM, WideRSCodec, interleave_encode
+
+
+@pytest.fixture(autouse=True)
+def restore_reedsolo(monkeypatch):
+    """RSCodec بحقل GF(2^16) يستبدل _bytearray العام في reedsolo؛ يُعاد بعد كل اختبار"""
+    monkeypatch.setattr(reedsolo, "_bytearray", reedsolo._bytearray)
+
+
+def _symbols(data) -> list:
+    return np.frombuffer(bytes(data), dtype='>u2').astype(int).tolist()
+
+
+def _to_bytes(symbols) -> bytes:
+    return np.asarray(list(symbols), dtype='>u2').tobytes()
+
+
+@pytest.mark.parametrize("nsym,nsize", [(4, 300), (16, 300), (8, 1000)])
+def test_wide_matches_reedsolo_symbols(nsym, nsize):
+    rng = np.random.default_rng(nsym + nsize)
+    ref = RSCodec(nsym, nsize=nsize, prim=WIDE_PRIM, c_exp=16)
+    codec = WideRSCodec(nsym, nsize=nsize)
+    for size in (2, 2 * (nsize - nsym), 2 * (nsize - nsym) + 2, 5 * nsize):
+        data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+        encoded = codec.encode(data)
+        assert _symbols(encoded) == list(ref.encode(_symbols(data)))
+
+        corrupted = _symbols(encoded)
+        for start in range(0, len(corrupted), nsize):
+            # من صفر حتى تجاوز القدرة بخطأ واحد
+            length = min(nsize, len(corrupted) - start)
+            errors = min(int(rng.integers(0, nsym // 2 + 2)), length)
+            for p in rng.choice(length, size=errors, replace=False):
+                corrupted[start + p] ^= int(rng.integers(1, 1 << 16))
+        try:
+            expected = tuple(list(part) for part in ref.decode(corrupted))
+        except ReedSolomonError:
+            expected = ReedSolomonError
+        try:
+            dec, dec_full, errata = codec.decode(_to_bytes(corrupted))
+            actual = (_symbols(dec), _symbols(dec_full), list(errata))
+        except ReedSolomonError:
+            actual = ReedSolomonError
+        assert actual == expected
+
+
+@pytest.mark.parametrize("size", [1, 3, 257, 1999, 140001])
+def test_wide_odd_length_round_trip(size):
+    rng = np.random.default_rng(size)
+    codec = WideRSCodec(16)
+    data = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    encoded = bytes(codec.encode(data))
+    # بايت الحشو الضمني لا يُرسل
+    codewords = -(-(size + 1) // (2 * (codec.nsize - codec.nsym)))
+    assert len(encoded) == size + 2 * codec.nsym * codewords
+    assert bytes(codec.decode(encoded)[0]) == data
+    assert bytes(codec.strip_parity(encoded)) == data
+    assert all(codec.check(encoded))
+    [batch] = codec.encode_batch([data])
+    assert bytes(batch) == encoded
+
+
+def test_wide_corrects_unaligned_burst_and_byte_erasures():
+    rng = np.random.default_rng(7)
+    codec = WideRSCodec(32)
+    data = rng.integers(0, 256, size=100001, dtype=np.uint8).tobytes()
+    encoded = bytes(codec.encode(data))
+
+    # nsym - 1 بايت أينما وقعت تشغل nsym/2 رمزاً على الأكثر
+    for start in (0, 1, 12345, len(encoded) - 31):
+        corrupted = bytearray(encoded)
+        for p in range(start, start + codec.nsym - 1):
+            corrupted[p] ^= 0x3c
+        dec, _, errata = codec.decode(bytes(corrupted))
+        assert bytes(dec) == data and len(errata) <= codec.nsym // 2
+
+    # مواضع المحو بالبايتات في التدفق المرسل، بما فيها ما بعد بايت الحشو
+    erase_pos = sorted(rng.choice(len(encoded), size=20, replace=False).tolist())
+    erased = bytearray(encoded)
+    for p in erase_pos:
+        erased[p] = 0
+    [result] = codec.decode_batch([(bytes(erased), erase_pos)], only_erasures=True)
+    assert bytes(result[0]) == data
+
+
+def test_wide_rejects_invalid_input():
+    codec = WideRSCodec(8)
+    encoded = bytearray(codec.encode(b"abc"))
+    # البايت الضمني يُفك إلى قيمة غير صفرية أو الكلمة المحشوة بلا بيانات
+    with pytest.raises(ReedSolomonError):
+        codec.decode(b"\x01" * 17)
+    with pytest.raises(ValueError):
+        interleave_encode(codec, b"abc", 2)
+    assert bytes(codec.decode(bytes(encoded))[0]) == b"abc"
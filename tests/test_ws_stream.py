@@ -0,0 +1,86 @@
+"""جلسة /ws/stream: ترتيب الردود ورد الإطار غير القابل للتصحيح وإنهاء الجلسة"""
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from reedsolo import ReedSolomonError, RSCodec
+
+import app
+
+
+@pytest.fixture
+def rsc():
+    # يُبنى لكل اختبار: RSCodec بحقل GF(2^16) في اختبار آخر يستبدل _bytearray العام في reedsolo
+    return RSCodec(10)
+
+
+def _uncorrectable_frame(rsc) -> bytes:
+    frame = bytearray(rsc.encode(b"this frame is beyond repair"))
+    for pos in range(0, 16, 2):
+        frame[pos] ^= 0xff
+    with pytest.raises(ReedSolomonError):
+        rsc.decode(bytes(frame))
+    return bytes(frame)
+
+
+@pytest.fixture
+def ws():
+    with TestClient(app.app) as client:
+        yield client
+
+
+def test_encode_frames_come_back_in_order(ws, rsc):
+    frames = [random.Random(i).randbytes(20 + i * 37) for i in range(12)]
+    with ws.websocket_connect("/ws/stream") as session:
+        session.send_json({"mode": "encode", "nsym": 10})
+        ready = session.receive_json()
+        assert ready["status"] == "ready" and ready["mode"] == "encode"
+        for frame in frames:
+            session.send_bytes(frame)
+        session.send_json({"op": "close"})
+        assert [session.receive_bytes() for _ in frames] == [bytes(rsc.encode(f)) for f in frames]
+        closed = session.receive_json()
+    assert closed["status"] == "closed"
+    assert closed["frames_in"] == closed["frames_out"] == 12 and closed["failed"] == 0
+
+
+def test_decode_uncorrectable_frame_keeps_its_slot(ws, rsc):
+    good = [b"first frame", b"third frame"]
+    encoded = [bytearray(rsc.encode(g)) for g in good]
+    encoded[1][0] ^= 1
+    with ws.websocket_connect("/ws/stream") as session:
+        session.send_json({"mode": "decode", "nsym": 10})
+        assert session.receive_json()["status"] == "ready"
+        session.send_bytes(bytes(encoded[0]))
+        session.send_bytes(_uncorrectable_frame(rsc))
+        session.send_bytes(bytes(encoded[1]))
+        session.send_json({"op": "stats"})
+        session.send_json({"op": "close"})
+        assert session.receive_bytes() == good[0]
+        assert session.receive_json() == {"status": "uncorrectable", "frame": 1, "code": "RS_UNCORRECTABLE",
+                                          "max_correctable": 5}
+        assert session.receive_bytes() == good[1]
+        stats = session.receive_json()
+        assert stats["status"] == "stats" and stats["frames_out"] == 3 and stats["failed"] == 1
+        assert session.receive_json()["status"] == "closed"
+
+
+def test_oversized_frame_is_reported_in_place(ws, rsc, monkeypatch):
+    monkeypatch.setattr(app, "WS_MAX_FRAME_BYTES", 64)
+    with ws.websocket_connect("/ws/stream") as session:
+        session.send_json({"mode": "encode", "nsym": 10})
+        assert session.receive_json()["max_frame_bytes"] == 64
+        session.send_bytes(bytes(65))
+        session.send_bytes(b"ok")
+        session.send_json({"op": "close"})
+        error = session.receive_json()
+        assert error["status"] == "error" and error["frame"] == 0
+        assert session.receive_bytes() == bytes(rsc.encode(b"ok"))
+        assert session.receive_json()["failed"] == 1
+
+
+def test_invalid_negotiation_is_rejected(ws):
+    with ws.websocket_connect("/ws/stream") as session:
+        session.send_json({"mode": "transcode"})
+        assert session.receive_json()["status"] == "error"
+        assert session.receive()["code"] == 1008